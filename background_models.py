@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Pluggable background models for MotionDetector.
+
+Every model takes the blurred grayscale frame (at the motion working size)
+and writes a binary foreground mask (0 / 255) into a caller-owned buffer::
+
+    model = create_background_model("running_average")
+    ready = model.apply(gray, threshold, mask)
+
+apply() returns False while the model has no background yet (first frame).
+
+Models:
+    "frame_diff":      difference with the previous frame (the old behaviour).
+                       Only edges of moving objects, slow movement is missed.
+    "running_average": difference with an exponential running average of
+                       the scene (cv2.accumulateWeighted, rate alpha). Whole
+                       moving objects, slow movement accumulates.
+    "mog2" / "knn":    OpenCV per-pixel mixture / KNN background subtractors.
+                       Adapt to swaying trees and lighting changes; shadows
+                       are detected and left out of the mask.
+
+Background models (all but "frame_diff") produce isolated noise pixels, so
+their masks are opened (denoise) before contours are extracted.
+"""
+
+from typing import Dict, Optional, Type
+
+import cv2
+import numpy as np
+
+
+class BackgroundModel:
+    """Base class: foreground mask of a grayscale frame against a background."""
+
+    name = ''
+    denoise = True  # Open the mask before contour extraction
+
+    def apply(self, gray: np.ndarray, threshold: int, mask: np.ndarray) -> bool:
+        raise NotImplementedError
+
+    def reset(self):
+        raise NotImplementedError
+
+
+class FrameDifference(BackgroundModel):
+    """Previous frame as the background."""
+
+    name = 'frame_diff'
+    denoise = False
+
+    def __init__(self):
+        self._prev: Optional[np.ndarray] = None
+        self._delta: Optional[np.ndarray] = None
+
+    def apply(self, gray, threshold, mask):
+        if self._prev is None or self._prev.shape != gray.shape:
+            self._prev = gray.copy()
+            self._delta = np.empty_like(gray)
+            return False
+        cv2.absdiff(self._prev, gray, dst=self._delta)
+        cv2.threshold(self._delta, threshold, 255, cv2.THRESH_BINARY, dst=mask)
+        np.copyto(self._prev, gray)
+        return True
+
+    def reset(self):
+        self._prev = None
+
+
+class RunningAverage(BackgroundModel):
+    """Exponential running average of the scene (Frigate-style)."""
+
+    name = 'running_average'
+
+    def __init__(self, alpha: float = 0.05):
+        self.alpha = alpha
+        self._avg: Optional[np.ndarray] = None
+        self._background: Optional[np.ndarray] = None
+        self._delta: Optional[np.ndarray] = None
+
+    def apply(self, gray, threshold, mask):
+        if self._avg is None or self._avg.shape != gray.shape:
+            self._avg = gray.astype(np.float32)
+            self._background = np.empty_like(gray)
+            self._delta = np.empty_like(gray)
+            return False
+        cv2.convertScaleAbs(self._avg, dst=self._background)
+        cv2.absdiff(self._background, gray, dst=self._delta)
+        cv2.threshold(self._delta, threshold, 255, cv2.THRESH_BINARY, dst=mask)
+        cv2.accumulateWeighted(gray, self._avg, self.alpha)
+        return True
+
+    def reset(self):
+        self._avg = None
+
+
+class _OpenCVSubtractor(BackgroundModel):
+    """cv2.BackgroundSubtractor wrapper; shadows (127) are dropped from the mask."""
+
+    def __init__(self, history: int = 500):
+        self.history = history
+        self._subtractor = None
+        self._threshold = None
+        self._fg: Optional[np.ndarray] = None
+
+    def _create(self, threshold: int):
+        raise NotImplementedError
+
+    def _set_threshold(self, threshold: int):
+        raise NotImplementedError
+
+    def apply(self, gray, threshold, mask):
+        first = self._subtractor is None or self._fg is None or self._fg.shape != gray.shape
+        if first:
+            self._subtractor = self._create(threshold)
+            self._threshold = threshold
+            self._fg = np.empty_like(gray)
+        elif threshold != self._threshold:
+            self._set_threshold(threshold)
+            self._threshold = threshold
+        self._subtractor.apply(gray, self._fg)
+        if first:
+            return False
+        cv2.threshold(self._fg, 200, 255, cv2.THRESH_BINARY, dst=mask)
+        return True
+
+    def reset(self):
+        self._subtractor = None
+
+
+class MOG2Model(_OpenCVSubtractor):
+    """Gaussian mixture per pixel; the motion threshold is the variance threshold."""
+
+    name = 'mog2'
+
+    def _create(self, threshold):
+        return cv2.createBackgroundSubtractorMOG2(history=self.history, varThreshold=threshold,
+                                                  detectShadows=True)
+
+    def _set_threshold(self, threshold):
+        self._subtractor.setVarThreshold(threshold)
+
+
+class KNNModel(_OpenCVSubtractor):
+    """K nearest neighbours per pixel; threshold**2 is the distance threshold (20 -> 400, OpenCV's default)."""
+
+    name = 'knn'
+
+    def _create(self, threshold):
+        return cv2.createBackgroundSubtractorKNN(history=self.history, dist2Threshold=float(threshold) ** 2,
+                                                 detectShadows=True)
+
+    def _set_threshold(self, threshold):
+        self._subtractor.setDist2Threshold(float(threshold) ** 2)
+
+
+BACKGROUND_MODELS: Dict[str, Type[BackgroundModel]] = {
+    'frame_diff': FrameDifference,
+    'running_average': RunningAverage,
+    'mog2': MOG2Model,
+    'knn': KNNModel,
+}
+
+
+def create_background_model(name: str, alpha: float = 0.05, history: int = 500) -> BackgroundModel:
+    """Background model by name (see BACKGROUND_MODELS)."""
+    model_cls = BACKGROUND_MODELS.get(name)
+    if model_cls is None:
+        raise ValueError(f"Unknown motion model: {name} (choose from {', '.join(BACKGROUND_MODELS)})")
+    if model_cls is RunningAverage:
+        return RunningAverage(alpha)
+    if issubclass(model_cls, _OpenCVSubtractor):
+        return model_cls(history)
+    return model_cls()
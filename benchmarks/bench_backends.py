@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark: inference backends (PyTorch vs ONNX Runtime) on the same frames.
+
+For every backend reports load time (ONNX: export on a cold cache, then a
+cached load), per-call latency p50/p95 and throughput for a single 1280x720
+frame and for a V380 top/bottom lens batch of two, plus the CPU time per call.
+
+Usage:
+    python3 benchmarks/bench_backends.py
+    python3 benchmarks/bench_backends.py --model yolov8s.pt --imgsz 640 320 --frames 100
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference_backends import BACKENDS, OnnxBackend, YOLO_AVAILABLE, ONNXRUNTIME_AVAILABLE
+
+
+def _make_frames(count: int, width: int, height: int) -> list:
+    """Textured frames with a person-sized blob moving across."""
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur((rng.random((height, width, 3)) * 255).astype(np.uint8), (15, 15), 0)
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        x = (i * 13) % (width - width // 10)
+        cv2.rectangle(frame, (x, height // 4), (x + width // 20, height * 3 // 4), (180, 170, 160), -1)
+        frames.append(frame)
+    return frames
+
+
+def _run(backend, batches: list, imgsz: int, conf: float) -> dict:
+    latencies = []
+    cpu0 = time.process_time()
+    t0 = time.perf_counter()
+    for batch in batches:
+        start = time.perf_counter()
+        backend(batch, conf=conf, classes=[0], imgsz=imgsz)
+        latencies.append(time.perf_counter() - start)
+    wall = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    latencies = np.array(latencies) * 1000.0
+    images = sum(len(b) for b in batches)
+    return {
+        'p50': float(np.percentile(latencies, 50)),
+        'p95': float(np.percentile(latencies, 95)),
+        'fps': images / wall,
+        'cpu_ms': 1000.0 * cpu / len(batches),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Inference backend benchmark')
+    parser.add_argument('--model', type=str, default='yolov8n.pt')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--imgsz', type=int, nargs='+', default=[640])
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--conf', type=float, default=0.25)
+    args = parser.parse_args()
+
+    if not YOLO_AVAILABLE:
+        print("ultralytics is not installed - nothing to benchmark (pip install ultralytics)")
+        return 1
+    backends = [b for b in args.backends if b != 'onnx' or ONNXRUNTIME_AVAILABLE]
+    if len(backends) < len(args.backends):
+        print("onnxruntime is not installed - skipping the onnx backend (pip install onnxruntime onnx)\n")
+
+    frames = _make_frames(args.frames, args.width, args.height)
+    half = args.height // 2
+    workloads = {
+        'single': [[f] for f in frames],
+        'split x2': [[f[:half], f[half:]] for f in frames],
+    }
+
+    cache_dir = tempfile.mkdtemp(prefix='bench_backends_')
+    rows = []
+    try:
+        for name in backends:
+            for imgsz in args.imgsz:
+                t0 = time.perf_counter()
+                if name == 'onnx':
+                    backend = OnnxBackend(args.model, imgsz, cache_dir=cache_dir).load()
+                    cold = time.perf_counter() - t0
+                    t0 = time.perf_counter()
+                    backend = OnnxBackend(args.model, imgsz, cache_dir=cache_dir).load()
+                    load = f"{cold:.1f}s cold / {time.perf_counter() - t0:.2f}s cached"
+                else:
+                    backend = BACKENDS[name](args.model, imgsz).load()
+                    load = f"{time.perf_counter() - t0:.2f}s"
+
+                for workload, batches in workloads.items():
+                    _run(backend, batches[:args.warmup], imgsz, args.conf)
+                    result = _run(backend, batches, imgsz, args.conf)
+                    rows.append((name, imgsz, workload, result, load))
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+    print(f"{args.model}, {args.frames} frames of {args.width}x{args.height}, "
+          f"{len(os.sched_getaffinity(0))} CPU cores\n")
+    print(f"{'backend':<8}{'imgsz':>6}  {'workload':<10}{'p50 ms':>8}{'p95 ms':>8}{'img/s':>8}{'CPU ms':>8}  load")
+    for name, imgsz, workload, r, load in rows:
+        print(f"{name:<8}{imgsz:>6}  {workload:<10}{r['p50']:>8.1f}{r['p95']:>8.1f}{r['fps']:>8.1f}"
+              f"{r['cpu_ms']:>8.1f}  {load}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark: face gallery matching, 10 to 10k enrolled faces.
+
+Three ways to match the faces of one frame against the gallery:
+
+    legacy   per face: list(known_faces.values()), compare_faces + face_distance
+             (two distance passes over the gallery, as recognize_faces did)
+    matrix   FaceGallery: one (F,N) distance computation on a float32 matrix
+    index    FaceGallery with a KD-tree (scipy), exact nearest neighbour
+
+Encodings are synthetic 128-d vectors with the spread of real dlib
+encodings; every query is a noisy copy of an enrolled face, so all three
+must return the same identities.
+
+Usage:
+    python3 benchmarks/bench_face_gallery.py
+    python3 benchmarks/bench_face_gallery.py --sizes 10 100 1000 10000 --faces 4 --repeat 200
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from face_store import FaceGallery, SCIPY_AVAILABLE
+
+
+def legacy_match(known_faces: dict, known_names: list, encodings: np.ndarray, tolerance: float) -> list:
+    """Old recognize_faces loop (face_recognition.compare_faces / face_distance are norms over the list)."""
+    names = []
+    for enc in encodings:
+        known_encs = list(known_faces.values())
+        matches = list(np.linalg.norm(np.array(known_encs) - enc, axis=1) <= tolerance)
+        dists = np.linalg.norm(np.array(known_encs) - enc, axis=1)
+        best = int(np.argmin(dists))
+        names.append(known_names[best] if matches[best] else "Unknown")
+    return names
+
+
+def gallery_match(gallery: FaceGallery, encodings: np.ndarray, tolerance: float) -> list:
+    best, _ = gallery.match(encodings, tolerance)
+    return [gallery.names[i] if i >= 0 else "Unknown" for i in best]
+
+
+def _time(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Face gallery matching benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--faces', type=int, default=4, help='Faces per frame')
+    parser.add_argument('--repeat', type=int, default=100)
+    parser.add_argument('--tolerance', type=float, default=0.6)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    if not SCIPY_AVAILABLE:
+        print("scipy is not installed - index column skipped (pip install scipy)\n")
+
+    print(f"{args.faces} faces per frame, ms per frame\n")
+    print(f"{'gallery':>8}{'legacy':>10}{'matrix':>10}{'index':>10}{'speedup':>9}")
+    for size in args.sizes:
+        # dlib encodings: components around +-0.1, distinct people ~0.9 apart
+        enrolled = rng.normal(0, 0.08, (size, 128))
+        known_faces = {f"person_{i}": enc for i, enc in enumerate(enrolled)}
+        known_names = list(known_faces)
+        picks = rng.integers(0, size, args.faces)
+        queries = enrolled[picks] + rng.normal(0, 0.02, (args.faces, 128))
+
+        matrix = FaceGallery(known_faces)
+        reference = legacy_match(known_faces, known_names, queries, args.tolerance)
+        assert gallery_match(matrix, queries, args.tolerance) == reference, "matrix result differs"
+
+        repeat = max(1, args.repeat * 100 // max(100, size))
+        legacy_s = _time(lambda: legacy_match(known_faces, known_names, queries, args.tolerance), repeat)
+        matrix_s = _time(lambda: gallery_match(matrix, queries, args.tolerance), repeat)
+        index_col = f"{'-':>10}"
+        if SCIPY_AVAILABLE:
+            indexed = FaceGallery(known_faces, index_threshold=1)
+            assert gallery_match(indexed, queries, args.tolerance) == reference, "index result differs"
+            index_s = _time(lambda: gallery_match(indexed, queries, args.tolerance), repeat)
+            index_col = f"{1000.0 * index_s:>10.3f}"
+        print(f"{size:>8}{1000.0 * legacy_s:>10.3f}{1000.0 * matrix_s:>10.3f}{index_col}{legacy_s / matrix_s:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""Benchmark: copying FrameBuffer vs preallocated zero-copy FrameRing.
+
+Simulates CaptureThread producing frames at a fixed FPS while N consumer
+threads poll for the latest frame, and reports frame copies per second,
+memcpy bandwidth and process CPU use for each buffer.
+
+Usage:
+    python3 benchmarks/bench_frame_buffer.py
+    python3 benchmarks/bench_frame_buffer.py --fps 30 --readers 3 --duration 10
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from frame_buffer import FrameRing
+
+
+class FrameBuffer:
+    """The old copying frame buffer (copies on put and get), kept as the baseline."""
+
+    def __init__(self, max_size: int = 3):
+        self.buffer = deque(maxlen=max_size)
+        self.lock = threading.Lock()
+        self.max_size = max_size
+
+    def put(self, frame: np.ndarray):
+        """Add frame to buffer (non-blocking)."""
+        with self.lock:
+            if len(self.buffer) >= self.max_size:
+                # Remove oldest frame
+                self.buffer.popleft()
+            self.buffer.append(frame.copy())
+
+    def get(self) -> Optional[np.ndarray]:
+        """Get latest frame (non-blocking)."""
+        with self.lock:
+            if self.buffer:
+                return self.buffer[-1].copy()
+        return None
+
+    def get_all(self) -> list:
+        """Get all frames from buffer."""
+        with self.lock:
+            return [frame.copy() for frame in self.buffer]
+
+    def clear(self):
+        """Clear buffer."""
+        with self.lock:
+            self.buffer.clear()
+
+
+def _decode_into(dst: np.ndarray, value: int):
+    """Stand-in for cap.read(): fill a frame buffer with new pixel data."""
+    dst.fill(value & 0xFF)
+
+
+def run_legacy(shape, fps: float, readers: int, reader_hz: float, duration: float) -> dict:
+    buf = FrameBuffer(max_size=3)
+    stop = threading.Event()
+    copies = [0]
+    count_lock = threading.Lock()
+
+    def producer():
+        interval = 1.0 / fps
+        i = 0
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            frame = np.empty(shape, dtype=np.uint8)  # cap.read() allocates
+            _decode_into(frame, i)
+            buf.put(frame)  # copy #1
+            with count_lock:
+                copies[0] += 1
+            i += 1
+            time.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+    def consumer():
+        interval = 1.0 / reader_hz
+        while not stop.is_set():
+            frame = buf.get()  # copy #2
+            if frame is not None:
+                with count_lock:
+                    copies[0] += 1
+            time.sleep(interval)
+
+    return _measure(producer, consumer, readers, duration, stop, copies, shape)
+
+
+def run_ring(shape, fps: float, readers: int, reader_hz: float, duration: float) -> dict:
+    ring = FrameRing(slots=max(3, readers + 2), shape=shape)
+    stop = threading.Event()
+    copies = [0]
+
+    def producer():
+        interval = 1.0 / fps
+        i = 0
+        while not stop.is_set():
+            t0 = time.perf_counter()
+            slot = ring.acquire_write()
+            if slot is not None:
+                _decode_into(slot, i)  # cap.read(image=slot) decodes in place
+                ring.commit()
+            i += 1
+            time.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+    def consumer():
+        interval = 1.0 / reader_hz
+        while not stop.is_set():
+            ref = ring.borrow()
+            if ref is not None:
+                with ref:
+                    _ = ref.frame.shape  # consumer reads the view, no copy
+            time.sleep(interval)
+
+    result = _measure(producer, consumer, readers, duration, stop, copies, shape)
+    result['dropped'] = ring.frames_dropped
+    return result
+
+
+def _measure(producer, consumer, readers, duration, stop, copies, shape) -> dict:
+    threads = [threading.Thread(target=producer, daemon=True)]
+    threads += [threading.Thread(target=consumer, daemon=True) for _ in range(readers)]
+
+    cpu0 = time.process_time()
+    wall0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join(timeout=2.0)
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+
+    frame_bytes = int(np.prod(shape))
+    return {
+        'copies_per_sec': copies[0] / wall,
+        'mb_per_sec': copies[0] * frame_bytes / wall / 1e6,
+        'cpu_percent': 100.0 * cpu / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FrameBuffer vs FrameRing benchmark')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--fps', type=float, default=30.0, help='Producer (capture) FPS')
+    parser.add_argument('--readers', type=int, default=2, help='Number of consumer threads')
+    parser.add_argument('--reader-hz', type=float, default=30.0, help='Poll rate per consumer')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per run')
+    args = parser.parse_args()
+
+    shape = (args.height, args.width, 3)
+    print(f"Frame {args.width}x{args.height}, capture {args.fps:.0f} FPS, "
+          f"{args.readers} readers @ {args.reader_hz:.0f} Hz, {args.duration:.0f}s per run\n")
+
+    legacy = run_legacy(shape, args.fps, args.readers, args.reader_hz, args.duration)
+    ring = run_ring(shape, args.fps, args.readers, args.reader_hz, args.duration)
+
+    print(f"{'buffer':<14}{'copies/s':>10}{'MB/s':>10}{'CPU %':>8}")
+    print(f"{'FrameBuffer':<14}{legacy['copies_per_sec']:>10.1f}{legacy['mb_per_sec']:>10.1f}{legacy['cpu_percent']:>8.1f}")
+    print(f"{'FrameRing':<14}{ring['copies_per_sec']:>10.1f}{ring['mb_per_sec']:>10.1f}{ring['cpu_percent']:>8.1f}")
+    print(f"\nFrameRing dropped writes (all slots borrowed): {ring['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
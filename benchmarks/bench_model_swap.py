@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""Benchmark: model switch while detection keeps running.
+
+A detection loop feeds PersonDetector.detect() 1280x720 frames at camera
+rate (--fps, as fast as it can if inference is slower) while the model is
+switched. Compared:
+
+    blocking   the old change_model (load under the inference lock, with
+               download_manager set so detect() returns nothing meanwhile)
+    hot        change_model: background load + warmup, atomic swap
+    hot/back   switching back to the previous model (LRU cache hit)
+
+For each it reports switch latency (request -> new model active), the
+longest gap between two inferences, frames that got no inference during the
+switch, and how slow the first inference on the new model was.
+
+Usage:
+    python3 benchmarks/bench_model_swap.py
+    python3 benchmarks/bench_model_swap.py --models yolov8n.pt yolov8s.pt --backend onnx
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from detectors import PersonDetector, YOLO_AVAILABLE, download_manager
+from inference_backends import create_backend
+
+
+def _make_frames(count: int, width: int, height: int) -> list:
+    rng = np.random.default_rng(0)
+    base = cv2.GaussianBlur((rng.random((height, width, 3)) * 255).astype(np.uint8), (15, 15), 0)
+    frames = []
+    for i in range(count):
+        frame = base.copy()
+        x = (i * 13) % (width - width // 10)
+        cv2.rectangle(frame, (x, height // 4), (x + width // 20, height * 3 // 4), (180, 170, 160), -1)
+        frames.append(frame)
+    return frames
+
+
+def legacy_change_model(detector: PersonDetector, model_name: str):
+    """The pre-hot-swap change_model: load while holding the inference lock."""
+    def load():
+        download_manager.start_download(model_name)
+        with detector._lock:
+            try:
+                detector.model = create_backend(detector.backend_name, model_name,
+                                                cache_dir=detector.model_cache_dir)
+                detector.model_name = model_name
+            finally:
+                download_manager.end_download()
+    threading.Thread(target=load, daemon=True).start()
+
+
+def _measure(detector: PersonDetector, frames: list, switch, target: str, settle: float, fps: float) -> dict:
+    """Run detect() in a loop, call switch(target) and wait until it is active."""
+    inferences = []
+    skipped = []
+    stop = threading.Event()
+
+    def loop():
+        i = 0
+        while not stop.is_set():
+            start = time.time()
+            before = detector._last_inference
+            detector.detect(frames[i % len(frames)])
+            if detector._last_inference != before:
+                inferences.append((detector._last_inference, detector.model_name, time.time() - start))
+            else:
+                skipped.append(start)
+            i += 1
+            time.sleep(max(0.0, 1.0 / fps - (time.time() - start)))
+
+    worker = threading.Thread(target=loop, daemon=True)
+    worker.start()
+    time.sleep(settle)
+    requested = time.time()
+    switch(target)
+    while detector.model_name != target or download_manager.get_status()[0]:
+        time.sleep(0.005)
+    switched = time.time()
+    time.sleep(settle)
+    stop.set()
+    worker.join()
+
+    times = np.array([t for t, _, _ in inferences])
+    before = times[times < requested]
+    window = times[(times >= requested) & (times <= switched)]
+    edges = np.concatenate([[before[-1] if len(before) else requested], window,
+                            times[times > switched][:1]])
+    durations = [d for t, name, d in inferences if name == target and t > switched]
+    return {
+        'switch_ms': 1000.0 * (switched - requested),
+        'gap_ms': 1000.0 * float(np.diff(edges).max()) if len(edges) > 1 else 0.0,
+        'lost': sum(1 for t in skipped if requested <= t <= switched),
+        'first_ms': 1000.0 * durations[0] if durations else 0.0,
+        'steady_ms': 1000.0 * float(np.median(durations[1:])) if len(durations) > 1 else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Model switch benchmark')
+    parser.add_argument('--models', nargs=2, default=['yolov8n.pt', 'yolov8s.pt'], metavar=('FROM', 'TO'))
+    parser.add_argument('--backend', choices=['torch', 'onnx'], default=Config.INFERENCE_BACKEND)
+    parser.add_argument('--fps', type=float, default=10.0, help='Frame rate fed to detect()')
+    parser.add_argument('--settle', type=float, default=2.0, help='Seconds of detection before/after a switch')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    args = parser.parse_args()
+
+    if not YOLO_AVAILABLE:
+        print("ultralytics is not installed - nothing to benchmark (pip install ultralytics)")
+        return 1
+
+    config = Config()
+    config.INFERENCE_BACKEND = args.backend
+    config.DETECTION_REGIONS = False
+    first, second = args.models
+    frames = _make_frames(30, args.width, args.height)
+
+    rows = []
+    detector = PersonDetector(config)
+    detector.change_model(first)
+    while detector.model_name != first or detector._switch_target:
+        time.sleep(0.05)
+    rows.append(('blocking', first, second, _measure(detector, frames, lambda m: legacy_change_model(detector, m),
+                                                     second, args.settle, args.fps)))
+
+    detector = PersonDetector(config)
+    detector.change_model(first)
+    while detector.model_name != first or detector._switch_target:
+        time.sleep(0.05)
+    rows.append(('hot', first, second, _measure(detector, frames, detector.change_model, second, args.settle, args.fps)))
+    rows.append(('hot/back', second, first, _measure(detector, frames, detector.change_model, first, args.settle, args.fps)))
+
+    print(f"\n{args.backend} backend, {args.width}x{args.height} frames, "
+          f"{len(os.sched_getaffinity(0))} CPU cores\n")
+    print(f"{'switch':<10}{'from -> to':<26}{'switch ms':>10}{'max gap ms':>11}{'lost':>6}"
+          f"{'1st ms':>8}{'steady ms':>10}")
+    for name, src, dst, r in rows:
+        print(f"{name:<10}{src + ' -> ' + dst:<26}{r['switch_ms']:>10.0f}{r['gap_ms']:>11.0f}{r['lost']:>6}"
+              f"{r['first_ms']:>8.0f}{r['steady_ms']:>10.0f}")
+    print(f"\nlast switch as reported by PersonDetector.get_model_status(): {detector.get_model_status()['last_switch']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
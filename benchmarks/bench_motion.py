@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Benchmark: MotionDetector at full resolution (legacy) vs downscaled with reused buffers.
+
+The legacy detector (full-frame gray, 21x21 blur, absdiff, threshold, two
+dilations, new arrays at every step) is kept here as the reference. Each
+MOTION_WIDTH is run on the same synthetic clip (people-sized blobs walking
+over a noisy background) and compared with it:
+
+    ms/frame   detect() time
+    regions    motion regions over the clip
+    match      legacy regions covered by a region of this width at IoU >= 0.5
+    motion     frames where both agree on motion_active
+
+The width comparison uses the "frame_diff" model (same algorithm as the
+legacy detector). --models then runs each background model at
+MOTION_WIDTH with the same columns.
+
+Usage:
+    python3 benchmarks/bench_motion.py
+    python3 benchmarks/bench_motion.py --width 2304 --height 2592 --widths 0 640 320 160
+    python3 benchmarks/bench_motion.py --models frame_diff running_average mog2 knn
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from detectors import MotionDetector, box_iou
+
+
+class LegacyMotionDetector:
+    """The old MotionDetector.detect (full resolution, fresh arrays)."""
+
+    def __init__(self, threshold: int, min_area: int):
+        self.threshold = threshold
+        self.min_area = min_area
+        self.prev_frame = None
+        self.heat_map = None
+        self.motion_history = deque(maxlen=5)
+
+    def detect(self, frame: np.ndarray):
+        h, w = frame.shape[:2]
+        gray = cv2.GaussianBlur(cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY), (21, 21), 0)
+        if self.prev_frame is None:
+            self.prev_frame = gray
+            self.heat_map = np.zeros((h, w), dtype=np.float32)
+            return False, []
+        delta = cv2.absdiff(self.prev_frame, gray)
+        thresh = cv2.threshold(delta, self.threshold, 255, cv2.THRESH_BINARY)[1]
+        thresh = cv2.dilate(thresh, None, iterations=2)
+        contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        regions, has_motion = [], False
+        for cnt in contours:
+            if cv2.contourArea(cnt) > self.min_area:
+                has_motion = True
+                x, y, cw, ch = cv2.boundingRect(cnt)
+                if 0.1 < (cw / ch if ch > 0 else 0) < 10:
+                    regions.append((x, y, x + cw, y + ch))
+        if has_motion:
+            self.heat_map = self.heat_map * 0.85 + thresh.astype(np.float32) * 0.15
+        else:
+            self.heat_map = self.heat_map * 0.95
+        self.motion_history.append(has_motion)
+        self.prev_frame = gray
+        return sum(self.motion_history) >= 2, regions
+
+
+def synthetic_clip(frames: int, width: int, height: int, people: int = 3, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    background = cv2.GaussianBlur(rng.integers(40, 200, (height, width, 3), dtype=np.uint8), (31, 31), 0)
+    pw, ph = width // 25, height // 6
+    starts = rng.uniform(0, width - pw, people)
+    speeds = rng.uniform(-width / 150, width / 150, people)
+    rows = rng.uniform(0, height - ph, people)
+    clip = []
+    for i in range(frames):
+        frame = background.copy()
+        frame += rng.integers(0, 4, frame.shape, dtype=np.uint8)  # Sensor noise
+        # Someone walks in halfway through the still part
+        for p in range(people if i >= frames // 4 else 0):
+            x = int((starts[p] + speeds[p] * i) % (width - pw))
+            y = int(rows[p])
+            cv2.rectangle(frame, (x, y), (x + pw, y + ph), (30 + 60 * p, 200, 220), -1)
+        clip.append(frame)
+    return clip
+
+
+def run(detector, clip: list) -> tuple:
+    outputs = []
+    t0 = time.perf_counter()
+    for frame in clip:
+        outputs.append(detector.detect(frame))
+    return time.perf_counter() - t0, outputs
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-resolution vs downscaled motion detection')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--widths', type=int, nargs='+', default=[0, 640, 320, 160],
+                        help='MOTION_WIDTH values (0 = full resolution)')
+    parser.add_argument('--models', nargs='*', default=[], help='MOTION_MODEL values to compare at MOTION_WIDTH')
+    args = parser.parse_args()
+
+    config = Config()
+    motion_width = config.MOTION_WIDTH
+    clip = synthetic_clip(args.frames, args.width, args.height)
+    legacy_s, legacy = run(LegacyMotionDetector(config.MOTION_THRESHOLD, config.MOTION_MIN_AREA), clip)
+    legacy_regions = sum(len(r) for _, r in legacy)
+
+    print(f"{args.frames} frames of {args.width}x{args.height}\n")
+    print(f"{'run':>8}{'ms/frame':>10}{'speedup':>9}{'regions':>9}{'match':>8}{'motion':>8}")
+    print(f"{'legacy':>8}{1000.0 * legacy_s / args.frames:>10.2f}{'1.0x':>9}{legacy_regions:>9}{'-':>8}{'-':>8}")
+    runs = [(width or 'full', width, 'frame_diff') for width in args.widths]
+    runs += [(model, motion_width, model) for model in args.models]
+    for label, width, model in runs:
+        config.MOTION_WIDTH = width
+        elapsed, outputs = run(MotionDetector(config, model=model), clip)
+        matched = agree = 0
+        for (ref_motion, ref_regions), (motion, regions) in zip(legacy, outputs):
+            agree += ref_motion == motion
+            if ref_regions and regions:
+                iou = box_iou(np.array(ref_regions, dtype=np.float64), np.array(regions, dtype=np.float64))
+                matched += int((iou.max(axis=1) >= 0.5).sum())
+        print(f"{label:>8}{1000.0 * elapsed / args.frames:>10.2f}{legacy_s / elapsed:>8.1f}x"
+              f"{sum(len(r) for _, r in outputs):>9}{100.0 * matched / max(1, legacy_regions):>7.0f}%"
+              f"{100.0 * agree / args.frames:>7.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
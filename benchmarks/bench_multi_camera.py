@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Benchmark: multi-camera capture + shared InferenceScheduler, 1 to 8 synthetic cameras.
+
+Each synthetic camera publishes moving-blob frames into its own FrameRing at
+the capture FPS. All cameras share one PersonDetector / DetectionThread (one
+copy of the YOLO weights) through the InferenceScheduler. For every camera
+count the script reports the detection FPS each camera actually got against
+its budget, total inferences per second and process CPU use.
+
+Usage:
+    python3 benchmarks/bench_multi_camera.py
+    python3 benchmarks/bench_multi_camera.py --cameras 1 2 4 8 --detect-fps 5 --duration 10
+"""
+
+import argparse
+import os
+import resource
+import sys
+import threading
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from detectors import PersonDetector, MotionDetector, DetectionThread
+from frame_buffer import FrameRing
+from web_server import CameraManager, InferenceScheduler
+
+
+class SyntheticCamera:
+    """CaptureThread stand-in that renders frames instead of decoding RTSP."""
+
+    def __init__(self, source, buffer_size: int = 4):
+        self.width, self.height, self.capture_fps, self.phase = source
+        self.frame_ring = FrameRing(slots=max(2, buffer_size), shape=(self.height, self.width, 3))
+        self.fps = 0.0
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        interval = 1.0 / self.capture_fps
+        i = 0
+        while self.running:
+            t0 = time.perf_counter()
+            slot = self.frame_ring.acquire_write()
+            if slot is not None:
+                slot.fill(40)
+                x = int((i * 8 + self.phase) % self.width)
+                cv2.rectangle(slot, (x, self.height // 3), (x + 60, self.height // 3 + 160), (200, 200, 200), -1)
+                self.frame_ring.commit()
+            i += 1
+            self.fps = self.capture_fps
+            time.sleep(max(0.0, interval - (time.perf_counter() - t0)))
+
+    def get_frame(self):
+        return self.frame_ring.get()
+
+    def stop(self):
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+
+def run(num_cameras: int, args, person_detector: PersonDetector) -> dict:
+    cameras = [{
+        'id': f"cam{i + 1}",
+        'source': (args.width, args.height, args.capture_fps, i * 97),
+        'name': f"Synthetic {i + 1}",
+        'detect_fps': args.detect_fps,
+    } for i in range(num_cameras)]
+
+    manager = CameraManager(cameras, capture_factory=SyntheticCamera)
+    detection = DetectionThread(person_detector, MotionDetector(Config()), primary_camera_id='cam1')
+    scheduler = InferenceScheduler(manager, detection)
+
+    manager.start()
+    detection.start()
+    time.sleep(0.5)
+
+    processed0 = detection.get_stats()['processed']
+    pumped0 = dict(scheduler.frames_pumped)
+    cpu0 = time.process_time()
+    wall0 = time.perf_counter()
+    scheduler.start()
+    time.sleep(args.duration)
+    scheduler.stop()
+    wall = time.perf_counter() - wall0
+    cpu = time.process_time() - cpu0
+
+    per_camera = [(scheduler.frames_pumped[cid] - pumped0[cid]) / wall for cid in manager.camera_ids]
+    stats = detection.get_stats()
+
+    detection.stop()
+    manager.stop()
+
+    return {
+        'cameras': num_cameras,
+        'budget_fps': args.detect_fps,
+        'min_cam_fps': min(per_camera),
+        'mean_cam_fps': sum(per_camera) / len(per_camera),
+        'total_inf_per_sec': (stats['processed'] - processed0) / wall,
+        'queue_wait_ms': stats['queue_wait_avg_ms'],
+        'cpu_percent': 100.0 * cpu / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-camera shared-scheduler benchmark')
+    parser.add_argument('--cameras', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--capture-fps', type=float, default=15.0)
+    parser.add_argument('--detect-fps', type=float, default=5.0, help='Per-camera detection budget')
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per camera count')
+    args = parser.parse_args()
+
+    # One detector (one copy of the weights) for every camera count
+    person_detector = PersonDetector(Config())
+    if not person_detector._loaded:
+        print("WARNING: YOLO model not loaded - numbers only cover capture/scheduling/motion overhead\n")
+
+    print(f"{args.width}x{args.height} @ {args.capture_fps:.0f} FPS capture, "
+          f"{args.detect_fps:.0f} FPS detection budget per camera\n")
+    print(f"{'cams':>5}{'min cam FPS':>13}{'mean cam FPS':>14}{'inf/s':>8}{'queue ms':>10}{'CPU %':>8}")
+
+    for n in args.cameras:
+        r = run(n, args, person_detector)
+        print(f"{r['cameras']:>5}{r['min_cam_fps']:>13.2f}{r['mean_cam_fps']:>14.2f}"
+              f"{r['total_inf_per_sec']:>8.1f}{r['queue_wait_ms']:>10.2f}{r['cpu_percent']:>8.1f}")
+
+    max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\nPeak RSS: {max_rss_mb:.0f} MB (models loaded once for all cameras)")
+
+
+if __name__ == "__main__":
+    main()
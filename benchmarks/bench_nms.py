@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Benchmark: legacy Python NMS loop vs numpy non_max_suppression, 10 to 500 boxes.
+
+The legacy implementation (pairwise _calculate_iou + list.pop(0)) is kept
+here as the reference; both must keep exactly the same boxes.
+
+Usage:
+    python3 benchmarks/bench_nms.py
+    python3 benchmarks/bench_nms.py --sizes 10 50 100 250 500 --repeat 50
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from boxes import non_max_suppression
+
+
+def _legacy_iou(bbox1, bbox2) -> float:
+    inter_w = min(bbox1[2], bbox2[2]) - max(bbox1[0], bbox2[0])
+    inter_h = min(bbox1[3], bbox2[3]) - max(bbox1[1], bbox2[1])
+    inter = inter_w * inter_h if inter_w > 0 and inter_h > 0 else 0
+    union = ((bbox1[2] - bbox1[0]) * (bbox1[3] - bbox1[1]) +
+             (bbox2[2] - bbox2[0]) * (bbox2[3] - bbox2[1]) - inter)
+    return inter / union if union > 0 else 0.0
+
+
+def legacy_nms(boxes: list, scores: list, iou_threshold: float) -> list:
+    """Old PersonDetector._apply_nms on (index, bbox, score) tuples."""
+    detections = sorted(zip(range(len(boxes)), boxes, scores), key=lambda d: d[2], reverse=True)
+    keep = []
+    while detections:
+        current = detections[0]
+        keep.append(current[0])
+        detections.pop(0)
+        detections = [d for d in detections if _legacy_iou(current[1], d[1]) < iou_threshold]
+    return keep
+
+
+def _make_boxes(n: int, rng) -> tuple:
+    """Clusters of overlapping person-sized boxes, like raw detector output."""
+    centers = rng.uniform(100, 1180, (max(1, n // 5), 2))
+    picks = centers[rng.integers(0, len(centers), n)] + rng.normal(0, 15, (n, 2))
+    sizes = rng.uniform(40, 160, (n, 2)) * np.array([0.5, 1.0])
+    boxes = np.round(np.concatenate([picks - sizes, picks + sizes], axis=1))
+    return boxes, rng.uniform(0.3, 1.0, n)
+
+
+def _time(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - t0) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='NMS micro-benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 25, 50, 100, 250, 500])
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--iou', type=float, default=0.45)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'boxes':>6}{'kept':>6}{'legacy ms':>11}{'numpy ms':>10}{'speedup':>9}")
+    for n in args.sizes:
+        boxes, scores = _make_boxes(n, rng)
+        box_list = [tuple(b) for b in boxes.tolist()]
+        score_list = scores.tolist()
+
+        expected = legacy_nms(box_list, score_list, args.iou)
+        got = non_max_suppression(boxes, scores, args.iou).tolist()
+        if got != expected:
+            print(f"MISMATCH at {n} boxes: legacy kept {len(expected)}, numpy kept {len(got)}")
+            return 1
+
+        legacy = _time(lambda: legacy_nms(box_list, score_list, args.iou), args.repeat)
+        vectorized = _time(lambda: non_max_suppression(boxes, scores, args.iou), args.repeat)
+        print(f"{n:>6}{len(got):>6}{legacy * 1000:>11.3f}{vectorized * 1000:>10.3f}{legacy / vectorized:>8.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Benchmark: thread pipeline vs shared-memory multiprocess pipeline.
+
+Runs capture -> detection -> JPEG encode flat out on one video source in
+both Config.PIPELINE_MODE settings and reports frames/sec per stage and
+total CPU use (parent + child processes, read from /proc).
+
+Usage:
+    python3 benchmarks/bench_pipeline_modes.py
+    python3 benchmarks/bench_pipeline_modes.py --source recordings/clip.avi --duration 20
+    taskset -c 0-3 python3 benchmarks/bench_pipeline_modes.py   # pin to 4 cores
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from detectors import PersonDetector, MotionDetector, DetectionThread
+from process_pipeline import CaptureProcess, DetectionProcess, JpegEncoderProcess
+from web_server import CameraManager, CaptureThread, InferenceScheduler
+
+_CLK_TCK = os.sysconf('SC_CLK_TCK')
+
+
+def _make_video(path: str, width: int, height: int, frames: int):
+    """Moving-box MJPEG clip (cheap to generate, realistic to decode)."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 30, (width, height))
+    base = np.tile(np.linspace(40, 200, width, dtype=np.uint8), (height, 1))
+    base = cv2.merge([base, base[::-1], base])
+    for i in range(frames):
+        frame = base.copy()
+        x = (i * 7) % (width - 80)
+        cv2.rectangle(frame, (x, height // 3), (x + 80, height // 3 + 200), (230, 230, 230), -1)
+        writer.write(frame)
+    writer.release()
+
+
+def _cpu_seconds(pids) -> float:
+    """User + system CPU of this process and the given child pids."""
+    total = time.process_time()
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                fields = f.read().rsplit(')', 1)[1].split()
+            total += (int(fields[11]) + int(fields[12])) / _CLK_TCK
+        except (OSError, IndexError, ValueError):
+            pass
+    return total
+
+
+def _encoder_loop(detection, camera_id: str, stop: threading.Event, counter: list):
+    """Thread-mode stand-in for broadcast_task: encode every new detection frame."""
+    last_seq = -1
+    params = [cv2.IMWRITE_JPEG_QUALITY, 65]
+    while not stop.is_set():
+        if detection.get_result_seq(camera_id) == last_seq:
+            time.sleep(0.002)
+            continue
+        results = detection.get_results(camera_id)
+        if results['frame'] is not None:
+            cv2.imencode('.jpg', results['frame'], params)
+            counter[0] += 1
+        last_seq = results['frame_seq']
+
+
+def run(mode: str, source: str, duration: float, warmup: float) -> dict:
+    cameras = [{'id': 'main', 'source': source, 'name': 'Bench', 'detect_fps': 1000.0}]
+    config = Config()
+    encoder = None
+    stop = threading.Event()
+    encoded = [0]
+
+    if mode == 'process':
+        manager = CameraManager(cameras, buffer_size=4, capture_factory=CaptureProcess)
+        detection = DetectionProcess(primary_camera_id='main')
+        encoder = JpegEncoderProcess(detection.output_lock)
+        detection.add_ring_listener(encoder.add_ring)
+        encoder.set_cameras(['main'])
+        encoder.start()
+    else:
+        manager = CameraManager(cameras, buffer_size=4, capture_factory=CaptureThread)
+        detection = DetectionThread(PersonDetector(config), MotionDetector(config), primary_camera_id='main')
+        threading.Thread(target=_encoder_loop, args=(detection, 'main', stop, encoded), daemon=True).start()
+
+    scheduler = InferenceScheduler(manager, detection)
+    manager.start()
+    detection.start()
+    scheduler.start()
+
+    pids = [p.process.pid for p in (manager.primary, detection, encoder)
+            if p is not None and getattr(p, 'process', None) is not None]
+
+    # Let models load and the first frames arrive
+    deadline = time.time() + 60
+    while detection.get_result_seq('main') < 0 and time.time() < deadline:
+        time.sleep(0.1)
+    time.sleep(warmup)
+
+    ring = manager.primary.frame_ring
+    captured0 = ring.frames_written
+    processed0 = detection.get_stats()['processed']
+    encoded0 = encoder.frames_encoded if encoder else encoded[0]
+    cpu0 = _cpu_seconds(pids)
+    wall0 = time.perf_counter()
+
+    time.sleep(duration)
+
+    wall = time.perf_counter() - wall0
+    cpu = _cpu_seconds(pids) - cpu0
+    captured = manager.primary.frame_ring.frames_written - captured0
+    processed = detection.get_stats()['processed'] - processed0
+    encoded_count = (encoder.frames_encoded if encoder else encoded[0]) - encoded0
+
+    stop.set()
+    scheduler.stop()
+    manager.stop()
+    detection.stop()
+    if encoder:
+        encoder.stop()
+
+    return {
+        'mode': mode,
+        'capture_fps': captured / wall,
+        'detect_fps': processed / wall,
+        'encode_fps': encoded_count / wall,
+        'cpu_percent': 100.0 * cpu / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Thread vs process pipeline benchmark')
+    parser.add_argument('--source', type=str, default=None, help='Video file or RTSP URL (default: synthetic clip)')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=3000, help='Length of the synthetic clip')
+    parser.add_argument('--duration', type=float, default=10.0, help='Measured seconds per mode')
+    parser.add_argument('--warmup', type=float, default=1.0)
+    parser.add_argument('--modes', nargs='+', default=['thread', 'process'], choices=['thread', 'process'])
+    args = parser.parse_args()
+
+    tmpdir = None
+    source = args.source
+    if source is None:
+        tmpdir = tempfile.TemporaryDirectory()
+        source = os.path.join(tmpdir.name, 'bench.avi')
+        print(f"Writing {args.frames} synthetic {args.width}x{args.height} frames...")
+        _make_video(source, args.width, args.height, args.frames)
+
+    if not PersonDetector(Config())._loaded:
+        print("WARNING: YOLO model not loaded - detection stage only runs motion detection\n")
+
+    print(f"CPU cores available: {len(os.sched_getaffinity(0))}, {args.duration:.0f}s per mode\n")
+    results = [run(mode, source, args.duration, args.warmup) for mode in args.modes]
+
+    print(f"{'mode':<9}{'capture FPS':>13}{'detect FPS':>12}{'encode FPS':>12}{'CPU %':>8}")
+    for r in results:
+        print(f"{r['mode']:<9}{r['capture_fps']:>13.1f}{r['detect_fps']:>12.1f}"
+              f"{r['encode_fps']:>12.1f}{r['cpu_percent']:>8.1f}")
+
+    if tmpdir:
+        tmpdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
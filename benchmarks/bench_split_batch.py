@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Benchmark: V380 top/bottom lens inference - two sequential calls vs one batch of two.
+
+Both variants get the same letterboxed 640x640 lens crops that
+PersonDetector.detect_split_frame produces. Sequential takes the detector
+lock and calls YOLO once per lens (the old path); batched uses
+PersonDetector._detect_batch (one lock, one forward pass).
+
+Usage:
+    python3 benchmarks/bench_split_batch.py
+    python3 benchmarks/bench_split_batch.py --model yolov8s.pt --frames 100 --width 2304 --height 2592
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from detectors import PersonDetector, YOLO_AVAILABLE
+
+
+def _make_split_frame(width: int, height: int, i: int) -> np.ndarray:
+    """Two stacked 'lenses' with a person-sized blob in each."""
+    frame = np.full((height, width, 3), 60, dtype=np.uint8)
+    half = height // 2
+    for y0 in (0, half):
+        x = (i * 11 + y0) % (width - width // 10)
+        cv2.rectangle(frame, (x, y0 + half // 4), (x + width // 20, y0 + half * 3 // 4), (180, 170, 160), -1)
+    return frame
+
+
+def _lens_crops(detector: PersonDetector, frame: np.ndarray) -> tuple:
+    split = frame.shape[0] // 2
+    return (detector._letterbox_resize(frame[:split], 640),
+            detector._letterbox_resize(frame[split:], 640))
+
+
+def run_sequential(detector: PersonDetector, crops: list, conf: float) -> float:
+    t0 = time.perf_counter()
+    for top, bottom in crops:
+        with detector._lock:
+            detector.model(top, conf=conf, classes=[0], verbose=False)
+        with detector._lock:
+            detector.model(bottom, conf=conf, classes=[0], verbose=False)
+    return time.perf_counter() - t0
+
+
+def run_batched(detector: PersonDetector, crops: list, conf: float) -> float:
+    t0 = time.perf_counter()
+    for top, bottom in crops:
+        detector._detect_batch({'top': top, 'bottom': bottom}, conf=conf)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sequential vs batched split-lens inference benchmark')
+    parser.add_argument('--model', type=str, default='yolov8n.pt')
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--conf', type=float, default=0.4)
+    args = parser.parse_args()
+
+    if not YOLO_AVAILABLE:
+        print("ultralytics is not installed - nothing to benchmark (pip install ultralytics)")
+        return 1
+
+    config = Config()
+    detector = PersonDetector(config)
+    if detector.model_name != args.model:
+        detector.model_name = args.model
+        detector._load_model()
+    if not detector._loaded:
+        print(f"Could not load {args.model}")
+        return 1
+
+    crops = [_lens_crops(detector, _make_split_frame(args.width, args.height, i)) for i in range(args.frames)]
+
+    # Warm up both code paths (first call builds the graph / allocates)
+    run_sequential(detector, crops[:args.warmup], args.conf)
+    run_batched(detector, crops[:args.warmup], args.conf)
+
+    sequential = run_sequential(detector, crops, args.conf)
+    batched = run_batched(detector, crops, args.conf)
+
+    print(f"{args.model}, {args.frames} split frames of {args.width}x{args.height} (2 lenses each)\n")
+    print(f"{'mode':<12}{'FPS':>8}{'ms/frame':>10}")
+    for name, elapsed in (('sequential', sequential), ('batched', batched)):
+        print(f"{name:<12}{args.frames / elapsed:>8.2f}{1000.0 * elapsed / args.frames:>10.1f}")
+    print(f"\nSpeedup: {sequential / batched:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""Benchmark: V380 2K split frames - one letterbox per lens vs overlapping tiles.
+
+Both modes go through PersonDetector.detect_split_frame (same filters and
+NMS); only DETECTION_TILES differs. Reported per mode:
+
+    ms/frame   detect_split_frame time (all lenses / tiles, one batch)
+    fps        frames per second
+    persons    persons found over all frames
+    recall     reference persons matched at IoU >= 0.5
+
+The reference is a label file next to each image (<image>.txt, one
+"x1 y1 x2 y2" box per line, in pixels of the 2K frame). Images without
+labels use every person found by either mode (after NMS) as the reference,
+so recall then shows what each mode misses relative to the other.
+
+Images smaller than --width x --height are resized up (labels are scaled
+with them), which makes people smaller relative to the model input, like
+distant people on the real 2K stream.
+
+Usage:
+    python3 benchmarks/bench_tiles.py
+    python3 benchmarks/bench_tiles.py --dirs snapshots alerts --model yolov8s.pt --overlap 0.25
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from detectors import PersonDetector, box_iou, non_max_suppression, plan_lens_tiles, YOLO_AVAILABLE
+
+
+def load_frames(dirs: list, width: int, height: int, limit: int) -> list:
+    """(frame, labels or None) at width x height."""
+    paths = sorted(p for d in dirs for ext in ('*.jpg', '*.jpeg', '*.png') for p in glob.glob(os.path.join(d, ext)))
+    frames = []
+    for path in paths[:limit]:
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        sx, sy = width / image.shape[1], height / image.shape[0]
+        if (image.shape[1], image.shape[0]) != (width, height):
+            image = cv2.resize(image, (width, height), interpolation=cv2.INTER_LINEAR)
+        labels = None
+        label_path = os.path.splitext(path)[0] + '.txt'
+        if os.path.exists(label_path):
+            labels = np.loadtxt(label_path, ndmin=2).reshape(-1, 4) * (sx, sy, sx, sy)
+        frames.append((image, labels))
+    return frames
+
+
+def run(detector: PersonDetector, frames: list, tiles: bool) -> tuple:
+    detector.use_tiles = tiles
+    results = []
+    t0 = time.perf_counter()
+    for frame, _ in frames:
+        results.append(detector.detect_split_frame(frame))
+    return time.perf_counter() - t0, results
+
+
+def recall(reference: np.ndarray, found: np.ndarray, iou: float = 0.5) -> tuple:
+    """(matched, total) reference boxes with a found box at IoU >= iou."""
+    if len(reference) == 0:
+        return 0, 0
+    if len(found) == 0:
+        return 0, len(reference)
+    return int((box_iou(reference, found).max(axis=1) >= iou).sum()), len(reference)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Single letterbox vs tiled detection on 2K V380 frames')
+    parser.add_argument('--dirs', nargs='+', default=['snapshots', 'alerts'])
+    parser.add_argument('--model', type=str, default='yolov8n.pt')
+    parser.add_argument('--width', type=int, default=2304)
+    parser.add_argument('--height', type=int, default=2592)
+    parser.add_argument('--overlap', type=float, default=0.2)
+    parser.add_argument('--rows', type=int, default=2)
+    parser.add_argument('--limit', type=int, default=100)
+    parser.add_argument('--warmup', type=int, default=3)
+    args = parser.parse_args()
+
+    if not YOLO_AVAILABLE:
+        print("ultralytics is not installed - nothing to benchmark (pip install ultralytics)")
+        return 1
+
+    frames = load_frames(args.dirs, args.width, args.height, args.limit)
+    if not frames:
+        print(f"No images in {', '.join(args.dirs)}")
+        return 1
+
+    config = Config()
+    config.DETECTION_TILE_OVERLAP = args.overlap
+    config.DETECTION_TILE_ROWS = args.rows
+    detector = PersonDetector(config)
+    if detector.model_name != args.model:
+        detector.model_name = args.model
+        detector._load_model()
+    if not detector._loaded:
+        print(f"Could not load {args.model}")
+        return 1
+
+    split = args.height // 2
+    tiles = [plan_lens_tiles(b, 640, args.overlap, args.rows) for b in ((0, 0, args.width, split),
+                                                                        (0, split, args.width, args.height))]
+    if not all(tiles):
+        print(f"{args.width}x{args.height} lenses fit one letterbox - tiling would not be used")
+        return 1
+
+    # Warm up both batch shapes
+    run(detector, frames[:args.warmup], tiles=False)
+    run(detector, frames[:args.warmup], tiles=True)
+
+    single_s, single = run(detector, frames, tiles=False)
+    tiled_s, tiled = run(detector, frames, tiles=True)
+
+    matched = {'single': [0, 0], 'tiled': [0, 0]}
+    labelled = 0
+    for (_, labels), a, b in zip(frames, single, tiled):
+        if labels is not None:
+            labelled += 1
+            reference = labels
+        else:
+            boxes = np.concatenate([a.boxes, b.boxes]).astype(np.float64)
+            scores = np.concatenate([a.scores, b.scores]).astype(np.float64)
+            reference = boxes[non_max_suppression(boxes, scores, 0.5)] if len(boxes) else boxes
+        for name, found in (('single', a), ('tiled', b)):
+            m, n = recall(reference, found.boxes.astype(np.float64))
+            matched[name][0] += m
+            matched[name][1] += n
+
+    n = len(frames)
+    print(f"{args.model}, {n} frames at {args.width}x{args.height} "
+          f"({labelled} labelled), {len(tiles[0])} tiles per lens of {tiles[0][0][2] - tiles[0][0][0]} px\n")
+    print(f"{'mode':<8}{'ms/frame':>10}{'fps':>8}{'persons':>9}{'recall':>9}")
+    for name, elapsed, results in (('single', single_s, single), ('tiled', tiled_s, tiled)):
+        m, total = matched[name]
+        print(f"{name:<8}{1000.0 * elapsed / n:>10.1f}{n / elapsed:>8.2f}{sum(len(r) for r in results):>9}"
+              f"{100.0 * m / max(1, total):>8.1f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Benchmark: person tracker throughput and ID switches, with detection skipping.
+
+For DETECTION_INTERVAL 1, 2, 3, ... the tracker gets the detections of every
+Nth frame and predicts the frames in between. Reported per interval:
+
+    ms/frame   tracker time per frame (update or predict, YOLO excluded)
+    fps        end-to-end frames per second with YOLO on every Nth frame
+               (clip mode, measured YOLO time; synthetic mode: --yolo-ms)
+    id sw      ID switches: a reference person changes track id
+    coverage   reference boxes with an output box at IoU >= 0.5
+    tracks     track ids handed out (fragmentation)
+
+The reference is the ground truth of a synthetic scene (people walking and
+crossing, missed detections, box jitter), or, with --clip, YOLO on every
+frame of a recorded clip tracked at interval 1.
+
+Usage:
+    python3 benchmarks/bench_tracker.py
+    python3 benchmarks/bench_tracker.py --clip recordings/<clip>.avi --intervals 1 2 3
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from boxes import box_iou
+from tracker import PersonTracker
+
+
+def synthetic_scene(frames: int, people: int, fps: float, width: int, height: int, miss: float, seed: int = 0):
+    """Ground truth and noisy detections of people walking across the frame."""
+    rng = np.random.default_rng(seed)
+    start = rng.uniform([0, height * 0.3], [width, height * 0.7], (people, 2))
+    velocity = rng.uniform(-120, 120, (people, 2)) * np.array([1.0, 0.3])  # px/s, mostly horizontal
+    size = rng.uniform([40, 100], [80, 200], (people, 2))
+    truth, detections = [], []
+    for i in range(frames):
+        t = i / fps
+        center = start + velocity * t
+        # Bounce off the frame edges so people stay in view and cross each other
+        center = np.abs((center + [width, height]) % (2 * np.array([width, height])) - [width, height])
+        boxes = np.concatenate([center - size / 2, center + size / 2], axis=1)
+        truth.append((np.arange(people), boxes))
+        keep = rng.random(people) >= miss
+        jitter = rng.normal(0, 3, (people, 4))
+        detections.append((t, boxes[keep] + jitter[keep], rng.uniform(0.3, 0.95, people)[keep]))
+    return truth, detections
+
+
+def clip_detections(path: str, model: str, max_frames: int):
+    """YOLO on every frame of a clip: detections plus the mean YOLO time per frame."""
+    from detectors import PersonDetector
+
+    config = Config()
+    config.DETECTION_REGIONS = False
+    detector = PersonDetector(config)
+    if model != detector.model_name:
+        detector.change_model(model)
+        while detector.model_name != model or detector.get_model_status()['switching_to']:
+            time.sleep(0.05)
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 15.0
+    detections, yolo = [], []
+    while len(detections) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        t0 = time.perf_counter()
+        persons, _ = detector.detect(frame)
+        yolo.append(time.perf_counter() - t0)
+        detections.append((len(detections) / fps, persons.boxes.astype(np.float64), persons.scores.astype(np.float64)))
+    cap.release()
+    return detections, float(np.mean(yolo)) if yolo else 0.0
+
+
+def run_tracker(detections: list, interval: int, config) -> tuple:
+    """Track with YOLO results on every Nth frame only.
+
+    Returns per-frame (ids, boxes), tracker seconds, YOLO frames and tracks created.
+    """
+    tracker = PersonTracker(config.TRACKER_IOU, config.TRACKER_MAX_AGE, config.TRACKER_MIN_HITS)
+    out, elapsed, since, yolo_frames = [], 0.0, interval, 0
+    for t, boxes, scores in detections:
+        t0 = time.perf_counter()
+        if since + 1 < interval and tracker.has_tracks():
+            since += 1
+            tracks = tracker.predict(t)
+            result = (np.array([tr.track_id for tr in tracks]),
+                      np.array([tr.bbox for tr in tracks]).reshape(-1, 4))
+        else:
+            since = 0
+            yolo_frames += 1
+            result = (tracker.update(boxes, scores, t), boxes)
+        elapsed += time.perf_counter() - t0
+        out.append(result)
+    return out, elapsed, yolo_frames, tracker.tracks_created
+
+
+def evaluate(reference: list, output: list) -> tuple:
+    """(ID switches, coverage) of output against reference (ids, boxes) per frame."""
+    assigned, switches, matched, total = {}, 0, 0, 0
+    for (ref_ids, ref_boxes), (out_ids, out_boxes) in zip(reference, output):
+        total += len(ref_ids)
+        if not len(ref_ids) or not len(out_ids):
+            continue
+        iou = box_iou(np.asarray(ref_boxes), np.asarray(out_boxes))
+        while iou.size and iou.max() >= 0.5:
+            i, j = np.unravel_index(iou.argmax(), iou.shape)
+            ref_id, out_id = int(ref_ids[i]), int(out_ids[j])
+            if ref_id in assigned and assigned[ref_id] != out_id:
+                switches += 1
+            assigned[ref_id] = out_id
+            matched += 1
+            iou[i, :] = 0
+            iou[:, j] = 0
+    return switches, matched / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Person tracker benchmark')
+    parser.add_argument('--clip', type=str, default=None, help='Recorded clip (default: synthetic scene)')
+    parser.add_argument('--model', type=str, default='yolov8n.pt')
+    parser.add_argument('--intervals', type=int, nargs='+', default=[1, 2, 3, 5])
+    parser.add_argument('--frames', type=int, default=600)
+    parser.add_argument('--people', type=int, default=6)
+    parser.add_argument('--fps', type=float, default=10.0, help='Synthetic scene frame rate')
+    parser.add_argument('--miss', type=float, default=0.1, help='Synthetic missed-detection rate')
+    parser.add_argument('--yolo-ms', type=float, default=80.0, help='Assumed YOLO time (synthetic scene)')
+    args = parser.parse_args()
+
+    config = Config()
+    if args.clip:
+        detections, yolo_s = clip_detections(args.clip, args.model, args.frames)
+        if not detections:
+            print(f"No frames read from {args.clip}")
+            return 1
+        reference = run_tracker(detections, 1, config)[0]
+        source = f"{args.clip}: {len(detections)} frames, reference = YOLO every frame"
+    else:
+        reference, detections = synthetic_scene(args.frames, args.people, args.fps, 1280, 720, args.miss)
+        yolo_s = args.yolo_ms / 1000.0
+        source = (f"synthetic: {args.frames} frames at {args.fps:g} FPS, {args.people} people, "
+                  f"{args.miss:.0%} missed detections")
+
+    print(f"{source}\nYOLO {1000 * yolo_s:.1f} ms/frame\n")
+    print(f"{'interval':>8}{'ms/frame':>10}{'fps':>8}{'id sw':>7}{'coverage':>10}{'tracks':>8}")
+    for interval in args.intervals:
+        output, elapsed, yolo_frames, created = run_tracker(detections, interval, config)
+        switches, coverage = evaluate(reference, output)
+        frames = len(detections)
+        fps = frames / (elapsed + yolo_frames * yolo_s)
+        print(f"{interval:>8}{1000 * elapsed / frames:>10.3f}{fps:>8.1f}{switches:>7}"
+              f"{coverage:>9.1%}{created:>8}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Benchmark: V380 ffmpeg pipe readers - rawvideo (readinto) vs MJPEG (scan + imdecode).
+
+Synthetic frames are pushed through a real OS pipe by a writer thread, the
+same way ffmpeg feeds V380FFmpegProcessor.capture_frames, and each reader
+is timed end to end.
+
+Usage:
+    python3 benchmarks/bench_v380_pipe.py
+    python3 benchmarks/bench_v380_pipe.py --width 1280 --height 720 --frames 300
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v380_ffmpeg_pipeline import read_rawvideo_frames, read_mjpeg_frames
+
+
+def _make_frames(width: int, height: int, count: int) -> list:
+    """Noisy gradient frames so JPEG sizes look like a real camera."""
+    rng = np.random.default_rng(0)
+    base = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    frames = []
+    for i in range(count):
+        noise = rng.integers(0, 40, (height, width), dtype=np.uint8)
+        gray = cv2.add(np.roll(base, i * 4, axis=1), noise)
+        frames.append(cv2.merge([gray, np.roll(gray, 7, axis=0), gray[::-1]]))
+    return frames
+
+
+def _run(reader_factory, payloads: list) -> dict:
+    read_fd, write_fd = os.pipe()
+
+    def writer():
+        with os.fdopen(write_fd, 'wb', buffering=0) as w:
+            for payload in payloads:
+                w.write(payload)
+
+    t = threading.Thread(target=writer, daemon=True)
+    with os.fdopen(read_fd, 'rb', buffering=10**8) as stream:
+        cpu0 = time.process_time()
+        wall0 = time.perf_counter()
+        t.start()
+        count = 0
+        for frame in reader_factory(stream):
+            count += 1
+        wall = time.perf_counter() - wall0
+        cpu = time.process_time() - cpu0
+    t.join()
+
+    return {
+        'frames': count,
+        'fps': count / wall if wall > 0 else 0.0,
+        'ms_per_frame': 1000.0 * wall / max(1, count),
+        'cpu_ms_per_frame': 1000.0 * cpu / max(1, count),
+        'mb_piped': sum(len(p) for p in payloads) / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='V380 rawvideo vs MJPEG pipe reader benchmark')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=360)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--quality', type=int, default=90, help='JPEG quality (ffmpeg -q:v 2 ~ 90)')
+    args = parser.parse_args()
+
+    frames = _make_frames(args.width, args.height, args.frames)
+    raw_payloads = [f.tobytes() for f in frames]
+    jpeg_payloads = [cv2.imencode('.jpg', f, [cv2.IMWRITE_JPEG_QUALITY, args.quality])[1].tobytes() for f in frames]
+
+    print(f"{args.frames} frames of {args.width}x{args.height}\n")
+
+    raw = _run(lambda s: read_rawvideo_frames(s, args.width, args.height), raw_payloads)
+    mjpeg = _run(read_mjpeg_frames, jpeg_payloads)
+
+    print(f"{'reader':<10}{'frames':>8}{'FPS':>10}{'ms/frame':>10}{'CPU ms':>9}{'MB piped':>10}")
+    for name, r in (('rawvideo', raw), ('mjpeg', mjpeg)):
+        print(f"{name:<10}{r['frames']:>8}{r['fps']:>10.1f}{r['ms_per_frame']:>10.2f}"
+              f"{r['cpu_ms_per_frame']:>9.2f}{r['mb_piped']:>10.1f}")
+
+    if mjpeg['frames'] != args.frames:
+        print(f"\nNOTE: MJPEG reader returned {mjpeg['frames']} frames (end-marker scan split/merged JPEGs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Box geometry shared by detection, tracking and the inference backends.
+
+numpy only, so light modules (inference_backends, tracker) can use it
+without importing detectors.py and the model stack behind it.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU matrix (N,M) between (N,4) and (M,4) xyxy box arrays."""
+    a = np.asarray(boxes_a, dtype=np.float64).reshape(-1, 4)
+    b = np.asarray(boxes_b, dtype=np.float64).reshape(-1, 4)
+    inter_w = np.clip(np.minimum(a[:, None, 2], b[:, 2]) - np.maximum(a[:, None, 0], b[:, 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[:, None, 3], b[:, 3]) - np.maximum(a[:, None, 1], b[:, 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+
+
+def non_max_suppression(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.45,
+                        class_ids: Optional[np.ndarray] = None) -> np.ndarray:
+    """Greedy NMS on an (N,4) xyxy box array.
+
+    The IoU matrix is computed once; the greedy pass then only ORs one
+    suppression row per kept box.
+
+    Args:
+        boxes: (N,4) boxes as x1, y1, x2, y2
+        scores: (N,) confidences
+        iou_threshold: Boxes overlapping a kept box with IoU >= this are dropped
+        class_ids: Optional (N,) class ids; boxes only suppress boxes of their own class
+
+    Returns:
+        Indices of kept boxes, highest score first
+    """
+    boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+    scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+    if len(boxes) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    order = np.argsort(-scores, kind='stable')
+    overlaps = box_iou(boxes[order], boxes[order]) >= iou_threshold
+    if class_ids is not None:
+        classes = np.asarray(class_ids).reshape(-1)[order]
+        overlaps &= classes[:, None] == classes[None, :]
+
+    suppressed = np.zeros(len(order), dtype=bool)
+    keep = []
+    for i in range(len(order)):
+        if suppressed[i]:
+            continue
+        keep.append(i)
+        suppressed |= overlaps[i]
+    return order[keep]
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Camera capture thread - decodes frames straight into a FrameRing.
+
+Kept free of the detection stack (only cv2 and numpy) so capture child
+processes (process_pipeline.CaptureProcess) start fast and stay small.
+"""
+
+import logging
+import threading
+import time
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from frame_buffer import FrameRing, FrameRef
+
+
+class CaptureThread:
+    """Separate thread for frame capture from camera."""
+    
+    def __init__(self, camera_source, buffer_size: int = 3):
+        self.camera_source = camera_source
+        # Preallocated zero-copy ring: frames are decoded straight into a slot
+        self.frame_ring = FrameRing(slots=max(2, buffer_size))
+        self.running = False
+        self.cap = None
+        self.thread = None
+        self.fps = 0
+        self.frame_count = 0
+        self.last_time = time.time()
+    
+    def start(self):
+        """Start capture thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread.start()
+        logging.info("[Capture] Thread started")
+    
+    def _read_into_ring(self) -> str:
+        """Decode the next frame directly into a free ring slot.
+        
+        Returns:
+            "ok" if a frame was published, "full" if it was read but dropped
+            because every slot is borrowed, "failed" if the camera read failed
+        """
+        slot = self.frame_ring.acquire_write()
+        # No slot although the ring is sized: every slot is borrowed (acquire_write counted the drop)
+        ring_full = slot is None and self.frame_ring.shape is not None
+        
+        if slot is None:
+            # First frame (ring not sized yet) or every slot is borrowed: still drain the camera
+            ret, frame = self.cap.read()
+        else:
+            ret, frame = self.cap.read(image=slot)
+        
+        if not ret or frame is None or not isinstance(frame, np.ndarray):
+            if slot is not None:
+                self.frame_ring.abort_write()
+            return 'failed'
+        
+        if slot is not None and np.may_share_memory(frame, slot):
+            self.frame_ring.commit()
+            return 'ok'
+        
+        # Decoder allocated its own buffer (first frame, size/format change)
+        if slot is not None:
+            self.frame_ring.abort_write()
+        
+        # Force BGR conversion
+        if len(frame.shape) == 2 or frame.shape[2] == 1:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        
+        # Validate frame
+        if frame.shape[0] == 0 or frame.shape[1] == 0:
+            return 'failed'
+        
+        if ring_full and tuple(frame.shape) == self.frame_ring.shape:
+            return 'full'  # Same size: put() would only find the ring full again
+        
+        return 'ok' if self.frame_ring.put(frame) >= 0 else 'full'
+    
+    def _capture_loop(self):
+        """Capture loop - runs continuously."""
+        try:
+            self.cap = cv2.VideoCapture(self.camera_source)
+            
+            if not self.cap.isOpened():
+                logging.error(f"[Capture] Failed to open camera: {self.camera_source}")
+                return
+            
+            # Optimize RTSP settings
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 3)  # Buffer size
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+            self.cap.set(cv2.CAP_PROP_FPS, 30)
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            
+            logging.info(f"[Capture] Connected to camera: {self.camera_source}")
+            
+            while self.running:
+                try:
+                    status = self._read_into_ring()
+                    if status == 'ok':
+                        # Calculate FPS
+                        self.frame_count += 1
+                        elapsed = time.time() - self.last_time
+                        if elapsed >= 2.0:
+                            self.fps = self.frame_count / elapsed
+                            self.frame_count = 0
+                            self.last_time = time.time()
+                            logging.info(f"[Capture] FPS: {self.fps:.1f}, Buffer: {len(self.frame_ring)}, "
+                                         f"Seq: {self.frame_ring.latest_seq}, Dropped: {self.frame_ring.frames_dropped}")
+                    elif status == 'failed':
+                        logging.warning("[Capture] Failed to read frame")
+                        time.sleep(0.01)
+                    # 'full': readers hold every slot; the drop is in frames_dropped
+                
+                except Exception as e:
+                    logging.error(f"[Capture] Error: {e}")
+                    time.sleep(0.01)
+        
+        except Exception as e:
+            logging.error(f"[Capture] Fatal error: {e}")
+        finally:
+            if self.cap:
+                self.cap.release()
+    
+    def get_frame(self) -> Optional[np.ndarray]:
+        """Get a private copy of the latest frame (non-blocking, safe to draw on)."""
+        return self.frame_ring.get()
+    
+    def borrow_frame(self, min_seq: int = 0) -> Optional[FrameRef]:
+        """Borrow the latest frame without copying (read-only, call release())."""
+        return self.frame_ring.borrow(min_seq)
+    
+    def stop(self):
+        """Stop capture thread."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        if self.cap:
+            self.cap.release()
+        logging.info("[Capture] Thread stopped")
@@ -5,13 +5,14 @@ import cv2
 import numpy as np
 import time
 import logging
-from typing import List, Tuple, Optional
-from dataclasses import dataclass, field
-from collections import deque
+from typing import Callable, Dict, List, Tuple, Optional
+from dataclasses import dataclass
+from collections import OrderedDict, deque
 import threading
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 import shutil
 import gc
+import weakref
 
 from config import Config, Sensitivity
 
@@ -46,13 +47,6 @@ class DownloadManager:
 download_manager = DownloadManager()
 
 
-YOLO_AVAILABLE = False
-try:
-    from ultralytics import YOLO
-    YOLO_AVAILABLE = True
-except ImportError:
-    pass
-
 FACE_RECOGNITION_AVAILABLE = False
 try:
     import face_recognition
@@ -67,13 +61,66 @@ try:
 except ImportError:
     pass
 
+from inference_backends import create_backend, split_model_name, ONNXRUNTIME_AVAILABLE, YOLO_AVAILABLE
+from boxes import box_iou, non_max_suppression
+from tracker import PersonTracker
+from face_store import FaceEncodingStore, FaceGallery
+from background_models import create_background_model
+
 
 @dataclass
 class SkeletonLandmark:
     x: int
     y: int
     visibility: float
-    name: str
+
+
+class SkeletonLandmarks:
+    """Pose landmarks of one person as one (33,3) float32 array: x, y (frame pixels), visibility.
+    
+    Indexing and iteration give SkeletonLandmark views (.x / .y /
+    .visibility); the pose and drawing code use the array directly.
+    """
+    
+    __slots__ = ('data',)
+    
+    def __init__(self, data: Optional[np.ndarray] = None):
+        self.data = np.zeros((0, 3), dtype=np.float32) if data is None else data
+    
+    def __len__(self) -> int:
+        return len(self.data)
+    
+    def __bool__(self) -> bool:
+        return len(self.data) > 0
+    
+    def __getitem__(self, idx: int) -> SkeletonLandmark:
+        x, y, visibility = self.data[idx]
+        return SkeletonLandmark(x=int(x), y=int(y), visibility=float(visibility))
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self.data)))
+    
+    @property
+    def xy(self) -> np.ndarray:
+        """(N,2) int32 pixel coordinates."""
+        return self.data[:, :2].astype(np.int32)
+    
+    @property
+    def visibility(self) -> np.ndarray:
+        return self.data[:, 2]
+    
+    def follow(self, old_bbox, new_bbox) -> 'SkeletonLandmarks':
+        """The landmarks moved from the box they were found in to a new box (shift and scale)."""
+        ox1, oy1, ox2, oy2 = old_bbox
+        nx1, ny1, nx2, ny2 = new_bbox
+        data = self.data.copy()
+        data[:, 0] = nx1 + (data[:, 0] - ox1) * ((nx2 - nx1) / max(1, ox2 - ox1))
+        data[:, 1] = ny1 + (data[:, 1] - oy1) * ((ny2 - ny1) / max(1, oy2 - oy1))
+        return SkeletonLandmarks(data)
+
+
+NO_LANDMARKS = SkeletonLandmarks()
+NO_LANDMARKS.data.flags.writeable = False
 
 
 @dataclass 
@@ -82,8 +129,101 @@ class PersonDetection:
     foot_center: Tuple[int, int]
     bbox: Tuple[int, int, int, int]
     confidence: float
-    skeleton_landmarks: List[SkeletonLandmark] = field(default_factory=list)
+    skeleton_landmarks: SkeletonLandmarks = NO_LANDMARKS
     track_id: int = -1
+    bbox_raw: Optional[Tuple[int, int, int, int]] = None  # Lens-space bbox
+
+
+class DetectionBatch:
+    """The persons of one frame as arrays (struct of arrays).
+    
+    boxes (N,4) int32 xyxy, scores (N,) float32, track_ids (N,) int64 and,
+    once pose has run, landmarks (N,33,3) float32 with has_pose (N,) bool.
+    Detection, NMS, tracking, pose and drawing work on the arrays; len(),
+    indexing and iteration give PersonDetection views for the zone, alert
+    and overlay code that reads persons one by one.
+    """
+    
+    __slots__ = ('boxes', 'scores', 'track_ids', 'landmarks', 'has_pose')
+    
+    def __init__(self, boxes: Optional[np.ndarray] = None, scores: Optional[np.ndarray] = None,
+                 track_ids: Optional[np.ndarray] = None):
+        self.boxes = np.zeros((0, 4), dtype=np.int32) if boxes is None else \
+            np.asarray(boxes).astype(np.int32, copy=False).reshape(-1, 4)
+        self.scores = np.zeros(len(self.boxes), dtype=np.float32) if scores is None else \
+            np.asarray(scores).astype(np.float32, copy=False).reshape(-1)
+        self.track_ids = np.arange(len(self.boxes), dtype=np.int64) if track_ids is None else \
+            np.asarray(track_ids).astype(np.int64, copy=False).reshape(-1)
+        self.landmarks: Optional[np.ndarray] = None
+        self.has_pose: Optional[np.ndarray] = None
+    
+    @classmethod
+    def from_persons(cls, persons: List[PersonDetection]) -> 'DetectionBatch':
+        """Batch from a list of PersonDetection (landmarks included)."""
+        batch = cls(np.array([p.bbox for p in persons], dtype=np.int32).reshape(-1, 4),
+                    np.array([p.confidence for p in persons], dtype=np.float32),
+                    np.array([p.track_id for p in persons], dtype=np.int64))
+        for i, person in enumerate(persons):
+            if person.skeleton_landmarks:
+                batch.set_landmarks(i, person.skeleton_landmarks)
+        return batch
+    
+    @staticmethod
+    def concatenate(batches: List['DetectionBatch']) -> 'DetectionBatch':
+        """One batch from several (track ids renumbered by index, landmarks dropped)."""
+        if not batches:
+            return DetectionBatch()
+        return DetectionBatch(np.concatenate([b.boxes for b in batches]),
+                              np.concatenate([b.scores for b in batches]))
+    
+    def select(self, keep: np.ndarray) -> 'DetectionBatch':
+        """Sub-batch of the rows in keep (index array or boolean mask)."""
+        batch = DetectionBatch(self.boxes[keep], self.scores[keep], self.track_ids[keep])
+        if self.landmarks is not None:
+            batch.landmarks = self.landmarks[keep]
+            batch.has_pose = self.has_pose[keep]
+        return batch
+    
+    def __len__(self) -> int:
+        return len(self.boxes)
+    
+    def __bool__(self) -> bool:
+        return len(self.boxes) > 0
+    
+    @property
+    def centers(self) -> np.ndarray:
+        """(N,2) int32 box centers."""
+        return (self.boxes[:, :2] + self.boxes[:, 2:]) // 2
+    
+    @property
+    def foot_centers(self) -> np.ndarray:
+        """(N,2) int32 bottom-center points (zone checks)."""
+        return np.stack([(self.boxes[:, 0] + self.boxes[:, 2]) // 2, self.boxes[:, 3]], axis=1)
+    
+    def set_landmarks(self, i: int, landmarks: SkeletonLandmarks):
+        if self.landmarks is None:
+            self.landmarks = np.zeros((len(self), 33, 3), dtype=np.float32)
+            self.has_pose = np.zeros(len(self), dtype=bool)
+        if len(landmarks) == self.landmarks.shape[1]:
+            self.landmarks[i] = landmarks.data
+            self.has_pose[i] = True
+        else:
+            self.has_pose[i] = False
+    
+    def get_landmarks(self, i: int) -> SkeletonLandmarks:
+        if self.landmarks is None or not self.has_pose[i]:
+            return NO_LANDMARKS
+        return SkeletonLandmarks(self.landmarks[i])
+    
+    def __getitem__(self, i: int) -> PersonDetection:
+        x1, y1, x2, y2 = self.boxes[i].tolist()
+        cx = (x1 + x2) // 2
+        return PersonDetection(center=(cx, (y1 + y2) // 2), foot_center=(cx, y2), bbox=(x1, y1, x2, y2),
+                               confidence=float(self.scores[i]), skeleton_landmarks=self.get_landmarks(i),
+                               track_id=int(self.track_ids[i]))
+    
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
 
 
 @dataclass
@@ -94,6 +234,504 @@ class FaceDetection:
     bbox: Tuple[int, int, int, int]
 
 
+def calculate_region(bounds: Tuple[int, int, int, int], x1: int, y1: int, x2: int, y2: int,
+                     min_size: int, multiplier: float = 1.2) -> Tuple[int, int, int, int]:
+    """Square crop around a box: at least min_size, shifted to stay inside bounds (Frigate style)."""
+    bx1, by1, bx2, by2 = bounds
+    size = max(int(max(x2 - x1, y2 - y1) * multiplier), min_size)
+    size = min(size, bx2 - bx1, by2 - by1)
+    cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+    rx1 = int(min(max(cx - size // 2, bx1), bx2 - size))
+    ry1 = int(min(max(cy - size // 2, by1), by2 - size))
+    return rx1, ry1, rx1 + size, ry1 + size
+
+
+def plan_detection_regions(motion_boxes: List[Tuple[int, int, int, int]], bounds: List[Tuple[int, int, int, int]],
+                           model_size: int = 320, max_regions: int = 4,
+                           multiplier: float = 1.2) -> Optional[List[Tuple[int, int, int, int]]]:
+    """Merge motion boxes into a few square detection crops.
+
+    Motion boxes are clustered while the cluster still fits in one model-size
+    crop (or while boxes overlap); every cluster becomes one square region of
+    at least model_size. A region never crosses its bounds rectangle, so for
+    V380 split frames each lens is passed as separate bounds.
+
+    Args:
+        motion_boxes: (x1, y1, x2, y2) motion regions from MotionDetector.detect
+        bounds: Rectangles the crops must stay inside (whole frame, or one per lens)
+        model_size: Detector input size; smaller clusters are padded up to it
+        max_regions: More crops than this and the full frame is cheaper
+        multiplier: Context margin around each cluster
+
+    Returns:
+        List of square (x1, y1, x2, y2) regions, or None to run on the full frame
+    """
+    regions = []
+    for bx1, by1, bx2, by2 in bounds:
+        clusters = []
+        for x1, y1, x2, y2 in motion_boxes:
+            cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+            if bx1 <= cx < bx2 and by1 <= cy < by2:
+                clusters.append([max(x1, bx1), max(y1, by1), min(x2, bx2), min(y2, by2)])
+
+        # Merge pairs until no union fits in one crop (overlapping boxes always merge)
+        merged = True
+        while merged and len(clusters) > 1:
+            merged = False
+            for i in range(len(clusters)):
+                a = clusters[i]
+                for j in range(i + 1, len(clusters)):
+                    b = clusters[j]
+                    union = [min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3])]
+                    overlap = a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+                    if overlap or max(union[2] - union[0], union[3] - union[1]) * multiplier <= model_size:
+                        clusters[i] = union
+                        del clusters[j]
+                        merged = True
+                        break
+                if merged:
+                    break
+
+        regions.extend(calculate_region((bx1, by1, bx2, by2), *cluster, model_size, multiplier)
+                       for cluster in clusters)
+        if len(regions) > max_regions:
+            return None
+    return regions or None
+
+
+def plan_lens_tiles(bounds: Tuple[int, int, int, int], model_size: int = 640, overlap: float = 0.2,
+                    rows: int = 2) -> Optional[List[Tuple[int, int, int, int]]]:
+    """Overlapping square tiles covering one lens (SAHI-style sliced inference).
+
+    The tile side follows the lens resolution: about `rows` tiles (with
+    overlap) across the short side, never smaller than model_size, so each
+    tile is downscaled far less than the whole lens in one letterbox. Tiles
+    are spread evenly, adjacent ones overlap by at least `overlap` of a tile.
+
+    Args:
+        bounds: Lens rectangle (x1, y1, x2, y2) in the frame
+        model_size: Detector input size (tiles are resized to it)
+        overlap: Minimum overlap between neighbouring tiles (fraction of the tile)
+        rows: Tiles across the lens' short side
+
+    Returns:
+        List of square (x1, y1, x2, y2) tiles, or None when the lens is small
+        enough for a single letterbox (long side <= 2 * model_size)
+    """
+    bx1, by1, bx2, by2 = bounds
+    w, h = bx2 - bx1, by2 - by1
+    if max(w, h) <= 2 * model_size:
+        return None
+    rows = max(1, rows)
+    short = min(w, h)
+    tile = int(np.ceil(short / (rows - (rows - 1) * overlap)))
+    tile = min(max(tile, model_size), short)
+    stride = tile * (1.0 - overlap)
+
+    def starts(length: int) -> np.ndarray:
+        count = 1 if length <= tile else int(np.ceil((length - tile) / stride)) + 1
+        return np.round(np.linspace(0, length - tile, count)).astype(int)
+
+    return [(bx1 + int(x), by1 + int(y), bx1 + int(x) + tile, by1 + int(y) + tile)
+            for y in starts(h) for x in starts(w)]
+
+
+def deduplicate_region_boxes(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float = 0.5,
+                             containment: float = 0.7) -> np.ndarray:
+    """Indices of region-crop detections to keep after mapping back to the frame.
+
+    Overlapping crops see the same person twice: plain NMS removes the
+    duplicates, and a box cut off at a crop edge that lies mostly inside a
+    bigger detection of the same person is dropped as a fragment.
+    """
+    keep = non_max_suppression(boxes, scores, iou_threshold)
+    if len(keep) <= 1:
+        return keep
+    b = np.asarray(boxes, dtype=np.float64)[keep]
+    inter_w = np.clip(np.minimum(b[:, None, 2], b[:, 2]) - np.maximum(b[:, None, 0], b[:, 0]), 0, None)
+    inter_h = np.clip(np.minimum(b[:, None, 3], b[:, 3]) - np.maximum(b[:, None, 1], b[:, 1]), 0, None)
+    area = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    inside = np.divide(inter_w * inter_h, area[:, None], out=np.zeros((len(b), len(b))), where=area[:, None] > 0)
+    fragment = ((inside >= containment) & (area[None, :] > area[:, None])).any(axis=1)
+    return keep[~fragment]
+
+
+class PoseEstimator:
+    """MediaPipe pose on person crops, scheduled per tracked person.
+    
+    pose.process runs for a person every `interval` frames; in between the
+    landmarks of the last run follow the person's box (shift and scale), so
+    the skeleton overlay stays smooth at a fraction of the CPU. Landmarks and
+    the person's own Pose instance live in the track cache (tracker.py):
+    a Pose with static_image_mode=False carries tracking state from call to
+    call, which must not mix crops of different people. Without a track
+    cache, or beyond max_instances tracked people, a shared static-image
+    Pose runs on every call.
+    """
+    
+    def __init__(self, interval: int = 3, max_instances: int = 8, model_complexity: int = 1):
+        self.interval = max(1, interval)
+        self.max_instances = max_instances
+        self.model_complexity = model_complexity
+        self._shared = None
+        self._instances = weakref.WeakSet()
+        
+        # Statistics
+        self.runs = 0
+        self.reused = 0
+        self.process_time = 0.0
+    
+    def _new_pose(self, static: bool):
+        return mp.solutions.pose.Pose(
+            static_image_mode=static,
+            model_complexity=self.model_complexity,
+            smooth_landmarks=not static,
+            enable_segmentation=False,
+            min_detection_confidence=0.5,
+            min_tracking_confidence=0.5
+        )
+    
+    def _run(self, pose, frame: np.ndarray, bbox: Tuple[int, int, int, int], pad: float,
+             bounds: Tuple[int, int, int, int]) -> SkeletonLandmarks:
+        """pose.process on the padded box crop; landmarks in frame coordinates."""
+        x1, y1, x2, y2 = bbox
+        bx1, by1, bx2, by2 = bounds
+        pad_x = int((x2 - x1) * pad)
+        pad_y = int((y2 - y1) * pad)
+        crop_x1, crop_y1 = max(bx1, x1 - pad_x), max(by1, y1 - pad_y)
+        crop_x2, crop_y2 = min(bx2, x2 + pad_x), min(by2, y2 + pad_y)
+        
+        person_crop = frame[crop_y1:crop_y2, crop_x1:crop_x2]
+        if person_crop.size == 0:
+            return NO_LANDMARKS
+        crop_h, crop_w = person_crop.shape[:2]
+        
+        t0 = time.perf_counter()
+        try:
+            pose_results = pose.process(cv2.cvtColor(person_crop, cv2.COLOR_BGR2RGB))
+        except Exception as e:
+            print(f"[Skeleton] Error: {e}")
+            return NO_LANDMARKS
+        finally:
+            self.runs += 1
+            self.process_time += time.perf_counter() - t0
+        
+        if not pose_results.pose_landmarks:
+            return NO_LANDMARKS
+        # All 33 landmarks, mapped back to frame space
+        data = np.array([(lm.x, lm.y, lm.visibility) for lm in pose_results.pose_landmarks.landmark],
+                        dtype=np.float32)
+        data[:, 0] = data[:, 0] * crop_w + crop_x1
+        data[:, 1] = data[:, 1] * crop_h + crop_y1
+        return SkeletonLandmarks(data)
+    
+    def estimate(self, frame: np.ndarray, bbox: Tuple[int, int, int, int], cache: Optional[dict] = None,
+                 pad: float = 0.2, bounds: Optional[Tuple[int, int, int, int]] = None) -> SkeletonLandmarks:
+        """Landmarks for one person: fresh every `interval` calls, followed in between.
+        
+        Args:
+            frame: Full frame (BGR)
+            bbox: Person box in frame coordinates
+            cache: The person's track cache (None = no tracking, run every call)
+            pad: Crop padding as a fraction of the box size
+            bounds: Area the crop must stay inside (V380: the person's lens)
+        """
+        if not MEDIAPIPE_AVAILABLE:
+            return NO_LANDMARKS
+        bounds = bounds or (0, 0, frame.shape[1], frame.shape[0])
+        
+        if cache is None:
+            if self._shared is None:
+                self._shared = self._new_pose(static=True)
+            return self._run(self._shared, frame, bbox, pad, bounds)
+        
+        age = cache.get('pose_age', self.interval)
+        if age < self.interval:
+            cache['pose_age'] = age + 1
+            self.reused += 1
+            return cache['pose_landmarks'].follow(cache['pose_bbox'], bbox)
+        
+        pose = cache.get('pose')
+        if pose is None and len(self._instances) < self.max_instances:
+            pose = cache['pose'] = self._new_pose(static=False)  # Closed with the track
+            self._instances.add(pose)
+        if pose is None:
+            if self._shared is None:
+                self._shared = self._new_pose(static=True)
+            pose = self._shared
+        landmarks = self._run(pose, frame, bbox, pad, bounds)
+        cache.update(pose_landmarks=landmarks, pose_bbox=tuple(bbox), pose_age=1)
+        return landmarks
+    
+    def get_status(self) -> dict:
+        return {
+            'interval': self.interval,
+            'runs': self.runs,
+            'reused': self.reused,
+            'instances': len(self._instances),
+            'process_ms_avg': 1000.0 * self.process_time / max(1, self.runs),
+        }
+
+
+def _scale_abs_lut(alpha: float, beta: float) -> np.ndarray:
+    """256-entry table equal to cv2.convertScaleAbs(x, alpha=alpha, beta=beta)."""
+    x = np.arange(256, dtype=np.float32)
+    return np.clip(np.rint(np.abs(x * np.float32(alpha) + np.float32(beta))), 0, 255).astype(np.uint8)
+
+
+class FramePreprocessor:
+    """Detection image preprocessing with the expensive parts built once.
+
+    Steps, in order (each can be switched off and is timed on its own):
+    - 'brightness': darken overexposed / brighten underexposed images. The
+      mean comes from a strided thumbnail, the correction is a lookup table.
+    - 'clahe': CLAHE on the L channel of LAB. One CLAHE object is kept, and
+      the LAB / channel buffers are reused while the image size stays the same.
+    - 'contrast': fixed contrast boost (lookup table).
+
+    Meant for the image that is actually inferred (a motion crop or the
+    content of a letterboxed lens), not the whole camera frame.
+    """
+
+    STEPS = ('brightness', 'clahe', 'contrast')
+    OVEREXPOSED = 120   # Thumbnail mean above this -> darken
+    UNDEREXPOSED = 50   # Thumbnail mean below this -> brighten
+
+    def __init__(self, steps=STEPS, clip_limit: float = 2.0, tile_grid: Tuple[int, int] = (8, 8),
+                 thumbnail_size: int = 64):
+        self.steps = tuple(step for step in self.STEPS if step in steps)
+        self.thumbnail_size = max(1, thumbnail_size)
+        self._clahe = cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid)
+        self._luts = {
+            'dark': _scale_abs_lut(0.7, -30),     # Overexposed
+            'bright': _scale_abs_lut(1.3, 30),    # Underexposed
+            'contrast': _scale_abs_lut(1.2, 10),
+        }
+        self._buffers = {}  # (h, w) -> (lab, l, l_out)
+
+        # Statistics: step -> [seconds, calls]
+        self._timing = {step: [0.0, 0] for step in self.STEPS}
+        self.last_brightness = 0.0
+        self.last_std = 0.0
+
+    def brightness_stats(self, image: np.ndarray) -> Tuple[float, float]:
+        """(mean, std) of a strided thumbnail, about thumbnail_size pixels on the long side."""
+        h, w = image.shape[:2]
+        step = max(1, max(h, w) // self.thumbnail_size)
+        thumb = image[::step, ::step]
+        return float(thumb.mean()), float(thumb.std())
+
+    def _buffers_for(self, shape: Tuple[int, int]):
+        buffers = self._buffers.get(shape)
+        if buffers is None:
+            buffers = (np.empty(shape + (3,), dtype=np.uint8),
+                       np.empty(shape, dtype=np.uint8),
+                       np.empty(shape, dtype=np.uint8))
+            self._buffers = {shape: buffers}  # Crops / tiles keep one size, don't hoard old ones
+        return buffers
+
+    def _apply_clahe(self, image: np.ndarray, out: np.ndarray) -> np.ndarray:
+        lab, l, l_out = self._buffers_for(image.shape[:2])
+        cv2.cvtColor(image, cv2.COLOR_BGR2LAB, dst=lab)
+        cv2.extractChannel(lab, 0, dst=l)
+        self._clahe.apply(l, dst=l_out)
+        cv2.insertChannel(l_out, lab, 0)
+        return cv2.cvtColor(lab, cv2.COLOR_LAB2BGR, dst=out)
+
+    def _timed(self, step: str, t0: float):
+        timing = self._timing[step]
+        timing[0] += time.perf_counter() - t0
+        timing[1] += 1
+
+    def apply(self, image: np.ndarray, inplace: bool = False, steps=None) -> np.ndarray:
+        """Run the enabled steps (or `steps`) on a BGR uint8 image.
+
+        With inplace the image itself is overwritten (use it on buffers that
+        are about to be inferred anyway, e.g. a freshly resized crop).
+        """
+        steps = self.steps if steps is None else steps
+        if not steps or image is None or image.size == 0:
+            return image
+        out = image if inplace else np.empty_like(image)
+        src = image
+
+        if 'brightness' in steps:
+            t0 = time.perf_counter()
+            self.last_brightness, self.last_std = self.brightness_stats(src)
+            lut = None
+            if self.last_brightness > self.OVEREXPOSED:
+                lut = self._luts['dark']
+            elif self.last_brightness < self.UNDEREXPOSED:
+                lut = self._luts['bright']
+            if lut is not None:
+                src = cv2.LUT(src, lut, dst=out)
+            self._timed('brightness', t0)
+
+        if 'clahe' in steps:
+            t0 = time.perf_counter()
+            src = self._apply_clahe(src, out)
+            self._timed('clahe', t0)
+
+        if 'contrast' in steps:
+            t0 = time.perf_counter()
+            src = cv2.LUT(src, self._luts['contrast'], dst=out)
+            self._timed('contrast', t0)
+
+        if src is not out:  # Nothing was written (e.g. brightness in range only)
+            if inplace:
+                return image
+            np.copyto(out, src)
+        return out
+
+    def get_status(self) -> dict:
+        return {
+            'steps': list(self.steps),
+            'brightness': self.last_brightness,
+            'std': self.last_std,
+            'step_ms_avg': {step: 1000.0 * total / max(1, calls)
+                            for step, (total, calls) in self._timing.items() if calls},
+        }
+
+
+class CascadeVerifier:
+    """Second opinion from a larger model on doubtful or important persons.
+    
+    The fast model (yolov8n) runs on every frame; a person is re-checked by
+    the larger model (yolov8s / yolov8m) when its score is below `threshold`
+    or its box is inside an armed zone. The person's crop (square, at
+    least crop_size, inside its lens) is detected again and the person is
+    kept if the larger model finds one there (IoU >= min_iou, score >=
+    confidence). All crops of a frame go through the model as one batch.
+    
+    The verdict is stored in the track cache ('cascade'): confirmed tracks
+    are never checked again, rejected ones are dropped without a check for
+    `recheck` seconds. Without a tracker every doubtful person is checked.
+    """
+    
+    def __init__(self, model_name: Optional[str], backend_name: str = 'torch', cache_dir: str = 'model_cache',
+                 threshold: float = 0.6, confidence: float = 0.4, crop_size: int = 320,
+                 min_iou: float = 0.3, recheck: float = 2.0):
+        self.model_name = model_name
+        self.backend_name = backend_name
+        self.cache_dir = cache_dir
+        self.threshold = threshold
+        self.confidence = confidence
+        self.crop_size = crop_size
+        self.min_iou = min_iou
+        self.recheck = recheck
+        self.model = None
+        
+        # Statistics
+        self.checked = 0
+        self.confirmed = 0
+        self.rejected = 0
+        self.cached = 0  # Verdict taken from the track cache
+        self.batches = 0
+        self.verify_time = 0.0
+    
+    def load(self):
+        try:
+            print(f"[Cascade] Loading {self.model_name} ({self.backend_name})...")
+            self.model = create_backend(self.backend_name, self.model_name, cache_dir=self.cache_dir)
+            self.model.warmup([(1, self.crop_size, self.crop_size, self.crop_size)])
+            print(f"[Cascade] Loaded ({self.model.name} backend)")
+        except Exception as e:
+            self.model = None
+            print(f"[Cascade] Error: {e}")
+    
+    def _crop_bounds(self, frame_shape: tuple, box: np.ndarray) -> Tuple[int, int, int, int]:
+        """Crop around a person, never across the V380 split line."""
+        h, w = frame_shape[:2]
+        if h > w:
+            split_y = h // 2
+            return (0, 0, w, split_y) if (box[1] + box[3]) / 2 < split_y else (0, split_y, w, h)
+        return 0, 0, w, h
+    
+    def verify(self, frame: np.ndarray, persons: DetectionBatch, tracker: Optional[PersonTracker] = None,
+               zone_check: Optional[Callable] = None, now: Optional[float] = None) -> DetectionBatch:
+        """Persons the larger model agrees with (confirmed scores raised to its score).
+        
+        Args:
+            frame: Full frame the persons were detected in
+            persons: Fast-model detections (track ids assigned if tracking)
+            tracker: The camera's tracker, for per-track verdicts
+            zone_check: box -> True when the box is inside an armed zone
+            now: Frame time (recheck timing)
+        """
+        if self.model is None or not persons:
+            return persons
+        now = time.time() if now is None else now
+        keep = np.ones(len(persons), dtype=bool)
+        pending, caches = [], []
+        for i in range(len(persons)):
+            cache = tracker.cache(int(persons.track_ids[i])) if tracker is not None else None
+            verdict = cache.get('cascade') if cache is not None else None
+            if verdict is not None and (verdict['confirmed'] or now - verdict['time'] < self.recheck):
+                self.cached += 1
+                if verdict['confirmed']:
+                    persons.scores[i] = max(persons.scores[i], verdict['score'])
+                else:
+                    keep[i] = False
+                continue
+            box = persons.boxes[i]
+            if persons.scores[i] < self.threshold or (zone_check is not None and zone_check(tuple(box.tolist()))):
+                pending.append(i)
+                caches.append(cache)
+        
+        if pending:
+            t0 = time.perf_counter()
+            size = self.crop_size
+            crops, regions = [], []
+            for i in pending:
+                region = calculate_region(self._crop_bounds(frame.shape, persons.boxes[i]),
+                                          *(int(v) for v in persons.boxes[i]), size, multiplier=1.5)
+                x1, y1, x2, y2 = region
+                crop = frame[y1:y2, x1:x2]
+                if x2 - x1 != size:
+                    interpolation = cv2.INTER_AREA if x2 - x1 > size else cv2.INTER_LINEAR
+                    crop = cv2.resize(crop, (size, size), interpolation=interpolation)
+                crops.append(crop)
+                regions.append(region)
+            try:
+                results = self.model(crops, conf=self.confidence, classes=[0], verbose=False, imgsz=size)
+            except Exception as e:
+                print(f"[Cascade] Inference error: {e}")
+                return persons.select(keep)
+            
+            for i, cache, region, result in zip(pending, caches, regions, results):
+                score = 0.0
+                if result.boxes is not None and len(result.boxes) > 0:
+                    x1, y1, x2, _ = region
+                    boxes = result.boxes.xyxy.astype(np.float64) * ((x2 - x1) / size) + (x1, y1, x1, y1)
+                    match = box_iou(persons.boxes[i:i + 1].astype(np.float64), boxes)[0] >= self.min_iou
+                    if match.any():
+                        score = float(result.boxes.conf[match].max())
+                confirmed = score > 0.0
+                if confirmed:
+                    persons.scores[i] = max(persons.scores[i], score)
+                    self.confirmed += 1
+                else:
+                    keep[i] = False
+                    self.rejected += 1
+                if cache is not None:
+                    cache['cascade'] = {'confirmed': confirmed, 'score': score, 'time': now}
+            self.checked += len(pending)
+            self.batches += 1
+            self.verify_time += time.perf_counter() - t0
+        
+        return persons.select(keep)
+    
+    def get_status(self) -> dict:
+        return {
+            'model': self.model_name if self.model is not None else None,
+            'checked': self.checked,
+            'confirmed': self.confirmed,
+            'rejected': self.rejected,
+            'cached': self.cached,
+            'verify_ms_avg': 1000.0 * self.verify_time / max(1, self.batches),
+        }
+
+
 class PersonDetector:
     """Person detector with professional skeleton drawing."""
     
@@ -147,6 +785,14 @@ class PersonDetector:
         (RIGHT_KNEE, RIGHT_ANKLE, (255, 100, 255)),
     ]
     
+    # Frigate-style split-lens box filters (from objects.py FilterConfig)
+    SPLIT_MIN_AREA = 5000        # Increased minimum area (reject tiny detections)
+    SPLIT_MAX_AREA = 50000       # Much smaller maximum area (reject large bboxes)
+    SPLIT_MIN_RATIO = 0.4        # Person aspect ratio (width/height) - more strict
+    SPLIT_MAX_RATIO = 1.3        # Tighter max ratio (reject wide rectangles)
+    SPLIT_MAX_LENS_FRACTION = 0.15  # Reject bbox > 15% of the lens (near full frame)
+    SPLIT_MARGIN = 5             # Keep boxes 5px away from the split line
+    
     # Joint colors by body part
     JOINT_COLORS = {
         'head': (0, 255, 255),      # Cyan
@@ -163,60 +809,182 @@ class PersonDetector:
         self._lock = threading.Lock()
         self._loaded = False
         
-        # MediaPipe pose for skeleton
-        self.pose = None
-        self.mp_pose = None
-        if MEDIAPIPE_AVAILABLE:
-            self.mp_pose = mp.solutions.pose
-        
-        if YOLO_AVAILABLE:
+        # Inference backend ("torch" or "onnx", see inference_backends.py)
+        self.backend_name = getattr(config, 'INFERENCE_BACKEND', 'torch')
+        self.model_cache_dir = getattr(config, 'MODEL_CACHE_DIR', 'model_cache')
+        
+        # Motion region crops (plan_detection_regions) instead of the whole frame
+        self.use_regions = getattr(config, 'DETECTION_REGIONS', True)
+        self.region_size = getattr(config, 'DETECTION_REGION_SIZE', 320)
+        self.region_max = getattr(config, 'DETECTION_REGION_MAX', 4)
+        
+        # Tiled inference on high-resolution (2K) V380 lenses instead of one letterbox
+        self.use_tiles = getattr(config, 'DETECTION_TILES', False)
+        self.tile_overlap = getattr(config, 'DETECTION_TILE_OVERLAP', 0.2)
+        self.tile_rows = getattr(config, 'DETECTION_TILE_ROWS', 2)
+        
+        # Hot model swap: loaded backends by name (LRU, active one included)
+        self.model_cache_size = max(1, getattr(config, 'MODEL_CACHE_SIZE', 2))
+        self._models: 'OrderedDict[str, object]' = OrderedDict()
+        self._switch_lock = threading.Lock()  # One loader at a time
+        self._models_lock = threading.Lock()  # _models is read by status requests while a loader updates it
+        self._switch_seq = 0
+        self._switch_target = None
+        self._gap_start = None
+        self._last_inference = 0.0
+        self.switch_count = 0
+        self.last_switch = {}
+        
+        # MediaPipe pose for skeleton, every skeleton_interval frames per tracked person
+        performance = getattr(config, 'performance', None)
+        self.pose_estimator = PoseEstimator(interval=getattr(performance, 'skeleton_interval', 3),
+                                            max_instances=getattr(config, 'POSE_MAX_TRACKS', 8))
+        
+        # Contrast / brightness preprocessing of the inferred crops and lenses (empty = off)
+        self.preprocessor = FramePreprocessor(getattr(config, 'DETECTION_PREPROCESS', ()))
+        
+        # Cascade: a larger model re-checks borderline / in-zone persons (CASCADE_MODEL, None = off)
+        self.cascade = CascadeVerifier(getattr(config, 'CASCADE_MODEL', None), self.backend_name, self.model_cache_dir,
+                                       threshold=getattr(config, 'CASCADE_THRESHOLD', 0.6),
+                                       confidence=getattr(config, 'CASCADE_CONFIDENCE', 0.4),
+                                       crop_size=getattr(config, 'CASCADE_CROP_SIZE', 320),
+                                       recheck=getattr(config, 'CASCADE_RECHECK', 2.0))
+        
+        if YOLO_AVAILABLE or (self.backend_name == 'onnx' and ONNXRUNTIME_AVAILABLE):
             self._load_model()
+            if self.cascade.model_name and self.cascade.model_name != self.model_name:
+                self.cascade.load()
     
     def _load_model(self):
         try:
             download_manager.start_download(self.model_name)
-            print(f"[Detector] Loading {self.model_name}...")
-            self.model = YOLO(self.model_name)
+            print(f"[Detector] Loading {self.model_name} ({self.backend_name})...")
+            self.model = create_backend(self.backend_name, self.model_name, cache_dir=self.model_cache_dir)
+            self.model.warmup(self._warmup_shapes())
+            with self._models_lock:
+                self._models[self.model_name] = self.model
             self._loaded = True
-            print(f"[Detector] Loaded")
+            print(f"[Detector] Loaded ({self.model.name} backend)")
         except Exception as e:
             print(f"[Detector] Error: {e}")
         finally:
             download_manager.end_download()
     
-    def _init_pose(self):
-        """Lazy init MediaPipe pose."""
-        if self.pose is None and MEDIAPIPE_AVAILABLE and self.mp_pose:
-            self.pose = self.mp_pose.Pose(
-                static_image_mode=False,
-                model_complexity=1,
-                smooth_landmarks=True,
-                enable_segmentation=False,
-                min_detection_confidence=0.5,
-                min_tracking_confidence=0.5
-            )
+    def _warmup_shapes(self) -> list:
+        """(batch, height, width, imgsz) of the calls detect() makes."""
+        shapes = [(1, 720, 1280, None),  # Whole frame
+                  (2, 640, 640, None)]   # Letterboxed top/bottom lens pair
+        if self.use_regions:
+            shapes.append((1, self.region_size, self.region_size, self.region_size))
+        return shapes
     
     def change_model(self, model_name: str):
-        if not YOLO_AVAILABLE:
+        """Switch models without stopping detection.
+        
+        The new backend is loaded and warmed up on a background thread while
+        the current one keeps serving detect(); the swap itself is a single
+        assignment under the inference lock. Backends stay loaded in an LRU
+        of MODEL_CACHE_SIZE, so switching back to one of them is instant.
+        If another switch is requested meanwhile, the newest one wins.
+        """
+        onnx_model = self.backend_name == 'onnx' or split_model_name(model_name)[1] == 'int8'
+        if not YOLO_AVAILABLE and not (onnx_model and ONNXRUNTIME_AVAILABLE):
             return
         
+        requested = time.time()
+        self._switch_seq += 1
+        seq = self._switch_seq
+        self._switch_target = model_name
+        
         def load():
-            download_manager.start_download(model_name)
-            with self._lock:
+            with self._switch_lock:
+                if seq != self._switch_seq:
+                    return  # Superseded before it started
+                with self._models_lock:
+                    model = self._models.get(model_name)
+                if model is not None and model is self.model:
+                    self._switch_target = None  # Back to the active model (cancels a pending switch)
+                    return
+                cached = model is not None
+                load_s = warmup_s = 0.0
                 try:
-                    self.model = YOLO(model_name)
-                    self.model_name = model_name
-                    self._loaded = True
+                    if not cached:
+                        logging.info(f"[Detector] Loading {model_name} ({self.backend_name}) in background...")
+                        t0 = time.time()
+                        model = create_backend(self.backend_name, model_name, cache_dir=self.model_cache_dir)
+                        load_s = time.time() - t0
+                        warmup_s = model.warmup(self._warmup_shapes())
                 except MemoryError:
-                    print("[Detector] Memory error")
+                    logging.warning(f"[Detector] Out of memory loading {model_name}")
+                    self._evict_models(keep=1)
                     gc.collect()
+                    return
                 except Exception as e:
-                    print(f"[Detector] Error: {e}")
+                    logging.warning(f"[Detector] Could not load {model_name}: {e}")
+                    return
                 finally:
-                    download_manager.end_download()
+                    if seq == self._switch_seq:
+                        self._switch_target = None
+                
+                with self._models_lock:
+                    self._models[model_name] = model
+                    self._models.move_to_end(model_name)
+                if seq != self._switch_seq:
+                    self._evict_models()
+                    logging.info(f"[Detector] {model_name} loaded, but superseded by a newer switch")
+                    return
+                
+                with self._lock:
+                    previous = self.model_name
+                    self.model = model
+                    self.model_name = model_name
+                    self._loaded = True
+                    self._gap_start = self._last_inference or None
+                self._evict_models()
+                
+                self.switch_count += 1
+                self.last_switch = {
+                    'from': previous,
+                    'to': model_name,
+                    'cached': cached,
+                    'load_ms': 1000.0 * load_s,
+                    'warmup_ms': 1000.0 * warmup_s,
+                    'switch_ms': 1000.0 * (time.time() - requested),
+                    'gap_ms': None,  # Set by the first inference on the new model
+                }
+                logging.info(f"[Detector] Switched {previous} -> {model_name} in "
+                      f"{self.last_switch['switch_ms']:.0f} ms ({'cached' if cached else 'loaded'})")
         
         threading.Thread(target=load, daemon=True).start()
     
+    def _evict_models(self, keep: Optional[int] = None):
+        """Drop least recently used backends beyond the cache size (never the active one)."""
+        keep = self.model_cache_size if keep is None else keep
+        unloaded = []
+        with self._models_lock:
+            for name in list(self._models):
+                if len(self._models) <= keep:
+                    break
+                if name != self.model_name:
+                    del self._models[name]
+                    unloaded.append(name)
+        for name in unloaded:
+            logging.info(f"[Detector] Unloaded {name}")
+    
+    def get_model_status(self) -> dict:
+        """Active model, loaded backends and the last switch (latency, detection gap)."""
+        with self._models_lock:
+            loaded = list(self._models)
+        return {
+            'active': self.model_name,
+            'backend': self.model.name if self.model is not None else None,
+            'switching_to': self._switch_target,
+            'loaded': loaded,
+            'cache_size': self.model_cache_size,
+            'switches': self.switch_count,
+            'last_switch': dict(self.last_switch),
+        }
+    
     def set_sensitivity(self, sensitivity: Sensitivity):
         settings = Config.get_sensitivity_settings(sensitivity)
         self.confidence = settings.get('yolo_confidence', 0.25)
@@ -227,28 +995,16 @@ class PersonDetector:
     def _enhance_frame(self, frame: np.ndarray) -> np.ndarray:
         """Enhance frame for better detection using Frigate-style preprocessing.
         
+        CLAHE on the L channel plus a slight contrast boost, regardless of
+        DETECTION_PREPROCESS (see FramePreprocessor).
+        
         Args:
             frame: Input frame
             
         Returns:
             Enhanced frame
         """
-        # Convert to LAB color space for better lighting adjustment
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        
-        # Apply CLAHE (Contrast Limited Adaptive Histogram Equalization)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
-        
-        # Merge back and convert to BGR
-        enhanced = cv2.merge([l, a, b])
-        enhanced = cv2.cvtColor(enhanced, cv2.COLOR_LAB2BGR)
-        
-        # Slight brightness adjustment
-        enhanced = cv2.convertScaleAbs(enhanced, alpha=1.2, beta=10)
-        
-        return enhanced
+        return self.preprocessor.apply(frame, steps=('clahe', 'contrast'))
     
     def _letterbox_resize(self, frame: np.ndarray, target_size: int = 640) -> np.ndarray:
         """Resize frame with letterboxing (maintain aspect ratio).
@@ -270,6 +1026,9 @@ class PersonDetector:
         new_h = int(h * scale)
         resized = cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
         
+        # Preprocess only the lens content (not the padding)
+        self.preprocessor.apply(resized, inplace=True)
+        
         # Create letterbox (black padding)
         letterbox = np.zeros((target_size, target_size, 3), dtype=np.uint8)
         
@@ -280,6 +1039,160 @@ class PersonDetector:
         
         return letterbox
     
+    def _detect_batch(self, images: dict, conf: float, imgsz: Optional[int] = None) -> dict:
+        """Run YOLO once on several equally sized images (one forward pass, one lock).
+        
+        Args:
+            images: name -> letterboxed image (empty images are skipped)
+            conf: Confidence threshold for the whole batch
+            imgsz: Inference size (default: the model's own, 640)
+            
+        Returns:
+            name -> backend Detections for that image
+        """
+        names = [name for name, image in images.items() if image is not None and image.size > 0]
+        if not names or self.model is None:
+            return {}
+        
+        kwargs = {'imgsz': imgsz} if imgsz else {}
+        with self._lock:
+            results = self.model([images[name] for name in names], conf=conf, classes=[0], verbose=False, **kwargs)
+            self._last_inference = time.time()
+            if self._gap_start is not None:
+                # First inference on a newly swapped-in model
+                self.last_switch['gap_ms'] = 1000.0 * (self._last_inference - self._gap_start)
+                self._gap_start = None
+        
+        return dict(zip(names, results))
+    
+    def _plan_regions(self, motion_regions, bounds) -> Optional[List[Tuple[int, int, int, int]]]:
+        """Square motion crops for this frame, or None for full-frame detection."""
+        if not self.use_regions or not motion_regions:
+            return None
+        return plan_detection_regions(motion_regions, bounds, self.region_size, self.region_max)
+    
+    def _plan_tiles(self, lens_bounds, model_size: int) -> Optional[List[Tuple[int, int, int, int]]]:
+        """Overlapping tiles of every lens (DETECTION_TILES), or None for one letterbox per lens."""
+        if not self.use_tiles:
+            return None
+        tiles = []
+        for bounds in lens_bounds:
+            lens_tiles = plan_lens_tiles(bounds, model_size, self.tile_overlap, self.tile_rows)
+            if not lens_tiles:
+                return None
+            tiles.extend(lens_tiles)
+        return tiles
+    
+    def _detect_regions(self, frame: np.ndarray, regions: List[Tuple[int, int, int, int]],
+                        conf: float, size: Optional[int] = None, tag: str = "[Regions]") -> Tuple[np.ndarray, np.ndarray]:
+        """Run YOLO on square crops (one batch) and map the boxes back to the frame.
+        
+        Each crop is resized to `size` (default region_size), so small distant
+        people get more pixels than in a downscaled full frame. Duplicates
+        from overlapping crops are removed with deduplicate_region_boxes.
+        
+        Returns:
+            (N,4) float64 xyxy boxes in frame coordinates, (N,) confidences
+        """
+        size = size or self.region_size
+        crops = {}
+        for i, (x1, y1, x2, y2) in enumerate(regions):
+            crop = frame[y1:y2, x1:x2]
+            if x2 - x1 != size:
+                interpolation = cv2.INTER_AREA if x2 - x1 > size else cv2.INTER_LINEAR
+                crop = self.preprocessor.apply(cv2.resize(crop, (size, size), interpolation=interpolation),
+                                               inplace=True)
+            else:
+                crop = self.preprocessor.apply(crop)  # A view of the frame, never in place
+            crops[i] = crop
+        
+        batch_results = self._detect_batch(crops, conf=conf, imgsz=size)
+        
+        all_boxes, all_conf = [], []
+        for i, result in batch_results.items():
+            if result.boxes is None or len(result.boxes) == 0:
+                continue
+            x1, y1, x2, _ = regions[i]
+            scale = (x2 - x1) / size
+            all_boxes.append(result.boxes.xyxy.astype(np.float64) * scale + (x1, y1, x1, y1))
+            all_conf.append(result.boxes.conf.astype(np.float64))
+        if not all_boxes:
+            return np.empty((0, 4), dtype=np.float64), np.empty(0, dtype=np.float64)
+        
+        boxes = np.concatenate(all_boxes)
+        scores = np.concatenate(all_conf)
+        keep = deduplicate_region_boxes(boxes, scores)
+        logging.debug(f"{tag} {len(regions)} crops -> {len(boxes)} boxes, {len(keep)} after dedupe")
+        return boxes[keep], scores[keep]
+    
+    def _filter_lens_boxes(self, result, lens_shape: Tuple[int, int], lens_conf: float, is_top: bool,
+                           split_point: int, detection_size: int = 640) -> DetectionBatch:
+        """Turn one lens' YOLO boxes into a full-frame DetectionBatch (array ops on all boxes at once).
+        
+        Undoes the letterbox, applies the size / area / aspect-ratio filters and
+        clamps boxes to their side of the split line.
+        
+        Args:
+            result: Backend Detections for the letterboxed lens image
+            lens_shape: (height, width) of the lens crop before letterboxing
+            lens_conf: Confidence threshold for this lens
+            is_top: Top (fixed) lens, else bottom (PTZ) lens
+            split_point: Y of the split line in the full frame
+            detection_size: Letterbox size the lens was resized to
+        """
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return DetectionBatch()
+        
+        xyxy = boxes.xyxy
+        conf = boxes.conf
+        
+        # Letterbox inverse (640x640 -> lens size), integer pixels like the detector output
+        lens_h, lens_w = lens_shape
+        scale = min(detection_size / lens_w, detection_size / lens_h)
+        x_offset = (detection_size - int(lens_w * scale)) // 2
+        y_offset = (detection_size - int(lens_h * scale)) // 2
+        xyxy = np.trunc(xyxy.astype(np.float64))
+        lens_xyxy = np.trunc((xyxy - (x_offset, y_offset, x_offset, y_offset)) / scale).astype(np.int64)
+        return self._filter_lens_xyxy(lens_xyxy, conf, lens_shape, lens_conf, is_top, split_point, detection_size)
+    
+    def _filter_lens_xyxy(self, lens_xyxy: np.ndarray, conf: np.ndarray, lens_shape: Tuple[int, int],
+                          lens_conf: float, is_top: bool, split_point: int,
+                          detection_size: int = 640) -> DetectionBatch:
+        """Size / area / aspect-ratio filters on (N,4) integer lens-space boxes (see _filter_lens_boxes)."""
+        tag = "[Split-Top]" if is_top else "[Split-Bottom]"
+        total = len(conf)
+        lens_h, lens_w = lens_shape
+        x1, y1, x2, y2 = (lens_xyxy[:, k] for k in range(4))
+        
+        width = x2 - x1
+        height = y2 - y1
+        area = width * height
+        ratio = np.divide(width, height, out=np.zeros(total, dtype=np.float64), where=height > 0)
+        
+        keep_conf = conf >= lens_conf
+        keep_size = area <= lens_h * lens_w * self.SPLIT_MAX_LENS_FRACTION
+        keep_area = (area >= self.SPLIT_MIN_AREA) & (area <= self.SPLIT_MAX_AREA)
+        keep_ratio = (ratio >= self.SPLIT_MIN_RATIO) & (ratio <= self.SPLIT_MAX_RATIO)
+        
+        # Keep the bbox on its own side of the split line
+        if is_top:
+            y1 = np.maximum(0, y1)
+            y2 = np.minimum(split_point - self.SPLIT_MARGIN, y2)
+        else:
+            y1 = np.maximum(self.SPLIT_MARGIN, y1)
+            y2 = np.minimum(lens_h, y2)
+        keep_bounds = (y2 > y1) & ((x2 - x1) >= 10) & ((y2 - y1) >= 10)
+        
+        keep = keep_conf & keep_size & keep_area & keep_ratio & keep_bounds
+        logging.debug(f"{tag} Kept {int(keep.sum())}/{total} boxes (rejected: size={int((~keep_size).sum())}, "
+                      f"area={int((~keep_area).sum())}, ratio={int((~keep_ratio).sum())}, "
+                      f"bounds={int((~keep_bounds).sum())})")
+        
+        offset = 0 if is_top else split_point
+        boxes = np.stack([x1, y1 + offset, x2, y2 + offset], axis=1)
+        return DetectionBatch(boxes[keep], conf[keep])
+    
     def _preprocess_frame(self, frame: np.ndarray, target_size: tuple = (1280, 720)) -> np.ndarray:
         """Preprocess frame for better detection.
         
@@ -292,113 +1205,40 @@ class PersonDetector:
         """
         h, w = frame.shape[:2]
         
-        # Step 1: Resize to target resolution ONLY if different
+        # Resize to target resolution ONLY if different
         # But DON'T resize if frame is already 1280x360 (split frame!)
         if (w, h) != target_size and (w, h) != (1280, 360):
             frame = cv2.resize(frame, target_size, interpolation=cv2.INTER_LINEAR)
+            return self.preprocessor.apply(frame, inplace=True, steps=('brightness', 'clahe'))
         
-        # Step 2: Calculate brightness statistics
-        brightness = np.mean(frame)
-        std_dev = np.std(frame)
-        
-        # Step 3: Brightness adjustment
-        if brightness > 120:  # Overexposed
-            frame = cv2.convertScaleAbs(frame, alpha=0.7, beta=-30)
-        elif brightness < 50:  # Underexposed
-            frame = cv2.convertScaleAbs(frame, alpha=1.3, beta=30)
-        
-        # Step 4: CLAHE for better contrast
-        lab = cv2.cvtColor(frame, cv2.COLOR_BGR2LAB)
-        l, a, b = cv2.split(lab)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        l = clahe.apply(l)
-        frame = cv2.merge([l, a, b])
-        frame = cv2.cvtColor(frame, cv2.COLOR_LAB2BGR)
-        
-        return frame
+        # Brightness adjustment (thumbnail statistics) + CLAHE
+        return self.preprocessor.apply(frame, steps=('brightness', 'clahe'))
     
-    def _apply_nms(self, detections, iou_threshold=0.45, conf_threshold=0.5):
+    def _apply_nms(self, detections: DetectionBatch, iou_threshold=0.45, conf_threshold=0.5) -> DetectionBatch:
         """Apply Non-Maximum Suppression with Frigate-style parameters.
         
         Args:
-            detections: List of PersonDetection objects
+            detections: DetectionBatch of one lens
             iou_threshold: IoU threshold for suppression (Frigate: 0.45)
             conf_threshold: Confidence threshold (Frigate: 0.5)
             
         Returns:
-            Filtered detections
+            Filtered detections, highest confidence first
         """
         if len(detections) <= 1:
             return detections
         
         # Filter by confidence threshold first (Frigate min_score: 0.5)
-        detections = [d for d in detections if d.confidence >= conf_threshold]
+        detections = detections.select(detections.scores >= conf_threshold)
         
         if len(detections) <= 1:
             return detections
         
-        # Sort by confidence (highest first)
-        detections = sorted(detections, key=lambda x: x.confidence, reverse=True)
-        
-        # Initialize list to keep
-        keep = []
-        
-        while detections:
-            # Pick detection with highest confidence
-            current = detections[0]
-            keep.append(current)
-            detections.pop(0)
-            
-            # Calculate IoU with remaining detections
-            remaining = []
-            for det in detections:
-                iou = self._calculate_iou(current.bbox, det.bbox)
-                
-                # Keep only if IoU is below threshold (Frigate: 0.45)
-                if iou < iou_threshold:
-                    remaining.append(det)
-            
-            detections = remaining
-        
-        return keep
-    
-    def _calculate_iou(self, bbox1, bbox2):
-        """Calculate Intersection over Union (IoU) for two bounding boxes.
-        
-        Args:
-            bbox1: (x1, y1, x2, y2)
-            bbox2: (x1, y1, x2, y2)
-            
-        Returns:
-            IoU value (0-1)
-        """
-        x1_1, y1_1, x2_1, y2_1 = bbox1
-        x1_2, y1_2, x2_2, y2_2 = bbox2
-        
-        # Calculate intersection
-        inter_x1 = max(x1_1, x1_2)
-        inter_y1 = max(y1_1, y1_2)
-        inter_x2 = min(x2_1, x2_2)
-        inter_y2 = min(y2_1, y2_2)
-        
-        # Check if there's overlap
-        if inter_x2 > inter_x1 and inter_y2 > inter_y1:
-            inter_area = (inter_x2 - inter_x1) * (inter_y2 - inter_y1)
-        else:
-            inter_area = 0
-        
-        # Calculate union
-        area1 = (x2_1 - x1_1) * (y2_1 - y1_1)
-        area2 = (x2_2 - x1_2) * (y2_2 - y1_2)
-        union_area = area1 + area2 - inter_area
-        
-        # Calculate IoU
-        if union_area > 0:
-            return inter_area / union_area
-        else:
-            return 0.0
+        keep = non_max_suppression(detections.boxes.astype(np.float64), detections.scores.astype(np.float64),
+                                   iou_threshold)
+        return detections.select(keep)
     
-    def detect_split_frame(self, frame, top_conf=0.4, bottom_conf=0.4):
+    def detect_split_frame(self, frame, top_conf=0.4, bottom_conf=0.4, motion_regions=None):
         """Detect persons in V380 split frame with enhanced dual-lens handling for high resolution.
         
         V380 Dual-Lens Camera Anatomy (Dynamic Resolution Support):
@@ -415,9 +1255,13 @@ class PersonDetector:
             frame: Input frame (any resolution, will be dynamically split)
             top_conf: Confidence threshold for top camera (wide angle)
             bottom_conf: Confidence threshold for bottom camera (PTZ tracking)
+            motion_regions: Optional motion boxes; when given, only square crops
+                around them (never crossing the split line) are detected.
+                Without them, DETECTION_TILES cuts 2K lenses into overlapping
+                640 tiles (one batch) instead of one letterbox per lens
             
         Returns:
-            List of PersonDetection objects with adjusted coordinates
+            DetectionBatch in full-frame coordinates (top lens first)
         """
         # Step 1: Get frame dimensions
         h, w = frame.shape[:2]
@@ -445,572 +1289,292 @@ class PersonDetector:
         }
         print(f"[V380 Split] Split info: y={split_point}, top_h={split_point}, bottom_h={h-split_point}, full={w}x{h}")
         
-        # Step 5: Resize with LETTERBOXING (maintain aspect ratio, don't stretch!)
-        # This prevents distortion of human shapes due to extreme aspect ratio (3.5:1)
-        DETECTION_SIZE = 640
-        top_frame_detect = self._letterbox_resize(top_frame_raw, DETECTION_SIZE)
-        bottom_frame_detect = self._letterbox_resize(bottom_frame_raw, DETECTION_SIZE)
-        print(f"[V380 Split] Letterboxed to: {top_frame_detect.shape[1]}x{top_frame_detect.shape[0]}")
-        
-        # Step 6: Store letterbox scale factors for skeleton coordinate transformation
-        top_scale = DETECTION_SIZE / top_frame_raw.shape[1]
-        bottom_scale = DETECTION_SIZE / bottom_frame_raw.shape[1]
-        self._letterbox_info = {
-            'top_scale': top_scale,
-            'bottom_scale': bottom_scale,
-            'target_size': DETECTION_SIZE
-        }
-        print(f"[V380 Split] Letterbox scales: top={top_scale:.4f}, bottom={bottom_scale:.4f}")
-        
-        top_persons = []
-        bottom_persons = []
+        top_persons = DetectionBatch()
+        bottom_persons = DetectionBatch()
         
-        # Frigate-style filters (from objects.py FilterConfig)
-        min_area = 5000       # Increased minimum area (reject tiny detections)
-        max_area = 50000      # Much smaller maximum area (reject large bboxes)
-        min_ratio = 0.4      # Person aspect ratio (width/height) - more strict
-        max_ratio = 1.3       # Tighter max ratio (reject wide rectangles)
-        
-        # Detect in top camera (already enhanced by preprocessing)
-        if top_frame_detect.size > 0:
+        # Motion region crops per lens, or tiles of high-resolution lenses (None = whole lenses below)
+        DETECTION_SIZE = 640
+        lens_bounds = [(0, 0, w, split_point), (0, split_point, w, h)]
+        crop_plan = self._plan_regions(motion_regions, lens_bounds)
+        crop_size, crop_tag = self.region_size, "[Regions]"
+        if not crop_plan:
+            crop_plan = self._plan_tiles(lens_bounds, DETECTION_SIZE)
+            crop_size, crop_tag = DETECTION_SIZE, "[Tiles]"
+        if crop_plan:
+            # Crops are mapped straight back to lens pixels (no letterbox to undo)
+            self._letterbox_info = {'top_scale': 1.0, 'bottom_scale': 1.0, 'target_size': crop_size}
             try:
-                with self._lock:
-                    results_top = self.model(top_frame_detect, conf=top_conf, classes=[0], verbose=False)
-                
-                if results_top and results_top[0].boxes:
-                    for box in results_top[0].boxes:
-                        x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
-                        conf = float(box.conf[0])
-                        
-                        # Scale coordinates back from letterbox (640x640 -> top_frame size)
-                        top_h, top_w = top_frame_raw.shape[:2]
-                        
-                        # Calculate letterbox offsets
-                        scale = min(DETECTION_SIZE / top_w, DETECTION_SIZE / top_h)
-                        new_w = int(top_w * scale)
-                        new_h = int(top_h * scale)
-                        x_offset = (DETECTION_SIZE - new_w) // 2
-                        y_offset = (DETECTION_SIZE - new_h) // 2
-                        
-                        # Remove letterbox offset and scale back to original size
-                        x1 = int((x1 - x_offset) / scale)
-                        y1 = int((y1 - y_offset) / scale)
-                        x2 = int((x2 - x_offset) / scale)
-                        y2 = int((y2 - y_offset) / scale)
-                        
-                        # Calculate area
-                        area = (x2 - x1) * (y2 - y1)
-                        
-                        # Additional filter: Reject bounding boxes that are too large (near full frame)
-                        top_area = top_frame_raw.shape[0] * top_frame_raw.shape[1]
-                        if area > top_area * 0.15:  # Reject if bbox > 15% of frame (MUCH STRICTER)
-                            print(f"[Split-Top] REJECT: area={area} too large (>{top_area * 0.15:.0f} = {area/top_area*100:.1f}%)")
-                            continue
-                        
-                        # Frigate-style area filtering
-                        if area < min_area or area > max_area:
-                            print(f"[Split-Top] REJECT: area={area} out of range [{min_area}, {max_area}]")
-                            continue
-                        
-                        # Calculate aspect ratio (width/height)
-                        width = x2 - x1
-                        height = y2 - y1
-                        aspect_ratio = width / height if height > 0 else 0
-                        
-                        # Frigate-style aspect ratio filtering (person: 0.4-1.3) - MORE STRICT
-                        if aspect_ratio < min_ratio or aspect_ratio > max_ratio:
-                            print(f"[Split-Top] REJECT: aspect_ratio={aspect_ratio:.2f} out of range [{min_ratio}, {max_ratio}]")
-                            continue
-                        
-                        # IMPORTANT: Constraint bounding box to stay within top split (0 to 360)
-                        # Prevent bbox from crossing split boundary
-                        y1 = max(0, y1)
-                        y2 = min(split_point - 5, y2)  # Leave 5px margin from split line
-                        
-                        # Ensure bbox is valid after constraints
-                        if y2 <= y1 or (x2 - x1) < 10 or (y2 - y1) < 10:
-                            print(f"[Split-Top] REJECT: Invalid bbox after constraints")
-                            continue
-                        
-                        # Store raw coordinates for skeleton transformation
-                        x1_raw = max(0, x1)
-                        y1_raw = max(0, y1)
-                        x2_raw = min(x2, 640)  # Constrain to detection size
-                        y2_raw = min(y2, 360)  # Constrain to top split height
-                        
-                        # Constrained coordinates for detection purposes
-                        y1 = max(0, y1)
-                        y2 = min(split_point - 5, y2)
-                        
-                        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-                        
-                        person = PersonDetection(
-                            center=(cx, cy),
-                            foot_center=(cx, y2),
-                            bbox=(x1, y1, x2, y2),
-                            confidence=conf,
-                            track_id=-1,
-                            bbox_raw=(x1_raw, y1_raw, x2_raw, y2_raw)  # Store raw for skeleton
-                        )
-                        top_persons.append(person)
+                boxes, scores = self._detect_regions(frame, crop_plan, conf=min(top_conf, bottom_conf),
+                                                     size=crop_size, tag=crop_tag)
+                lens_xyxy = np.trunc(boxes).astype(np.int64)
+                in_top = (lens_xyxy[:, 1] + lens_xyxy[:, 3]) // 2 < split_point
+                lens_xyxy[~in_top] -= (0, split_point, 0, split_point)
+                top_persons = self._filter_lens_xyxy(lens_xyxy[in_top], scores[in_top], top_frame_raw.shape[:2],
+                                                     top_conf, is_top=True, split_point=split_point)
+                bottom_persons = self._filter_lens_xyxy(lens_xyxy[~in_top], scores[~in_top], bottom_frame_raw.shape[:2],
+                                                        bottom_conf, is_top=False, split_point=split_point)
             except Exception as e:
-                print(f"[Split-Top] Error: {e}")
-        
-        # Detect in bottom camera (already enhanced by preprocessing)
-        if bottom_frame_detect.size > 0:
+                print(f"[V380 Split] {crop_tag[1:-1]} inference error: {e}")
+        else:
+            # Step 5: Resize with LETTERBOXING (maintain aspect ratio, don't stretch!)
+            # This prevents distortion of human shapes due to extreme aspect ratio (3.5:1)
+            top_frame_detect = self._letterbox_resize(top_frame_raw, DETECTION_SIZE)
+            bottom_frame_detect = self._letterbox_resize(bottom_frame_raw, DETECTION_SIZE)
+            print(f"[V380 Split] Letterboxed to: {top_frame_detect.shape[1]}x{top_frame_detect.shape[0]}")
+            
+            # Step 6: Store letterbox scale factors for skeleton coordinate transformation
+            top_scale = DETECTION_SIZE / top_frame_raw.shape[1]
+            bottom_scale = DETECTION_SIZE / bottom_frame_raw.shape[1]
+            self._letterbox_info = {
+                'top_scale': top_scale,
+                'bottom_scale': bottom_scale,
+                'target_size': DETECTION_SIZE
+            }
+            print(f"[V380 Split] Letterbox scales: top={top_scale:.4f}, bottom={bottom_scale:.4f}")
+            
+            # Step 7: Both lenses in ONE forward pass (batch of 2) at the lower threshold;
+            # each lens' own threshold is applied while unpacking below
             try:
-                with self._lock:
-                    results_bottom = self.model(bottom_frame_detect, conf=bottom_conf, classes=[0], verbose=False)
-                
-                if results_bottom and results_bottom[0].boxes:
-                    for box in results_bottom[0].boxes:
-                        x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
-                        conf = float(box.conf[0])
-                        
-                        # Scale coordinates back from letterbox (640x640 -> bottom_frame size)
-                        bottom_h, bottom_w = bottom_frame_raw.shape[:2]
-                        
-                        # Calculate letterbox offsets
-                        scale = min(DETECTION_SIZE / bottom_w, DETECTION_SIZE / bottom_h)
-                        new_w = int(bottom_w * scale)
-                        new_h = int(bottom_h * scale)
-                        x_offset = (DETECTION_SIZE - new_w) // 2
-                        y_offset = (DETECTION_SIZE - new_h) // 2
-                        
-                        # Remove letterbox offset and scale back to original size
-                        x1 = int((x1 - x_offset) / scale)
-                        y1 = int((y1 - y_offset) / scale)
-                        x2 = int((x2 - x_offset) / scale)
-                        y2 = int((y2 - y_offset) / scale)
-                        
-                        # Calculate area
-                        area = (x2 - x1) * (y2 - y1)
-                        
-                        # Additional filter: Reject bounding boxes that are too large (near full frame)
-                        bottom_area = bottom_frame_raw.shape[0] * bottom_frame_raw.shape[1]
-                        if area > bottom_area * 0.15:  # Reject if bbox > 15% of frame (MUCH STRICTER)
-                            print(f"[Split-Bottom] REJECT: area={area} too large (>{bottom_area * 0.15:.0f} = {area/bottom_area*100:.1f}%)")
-                            continue
-                        
-                        # Frigate-style area filtering
-                        if area < min_area or area > max_area:
-                            print(f"[Split-Bottom] REJECT: area={area} out of range [{min_area}, {max_area}]")
-                            continue
-                        
-                        # Calculate aspect ratio (width/height)
-                        width = x2 - x1
-                        height = y2 - y1
-                        aspect_ratio = width / height if height > 0 else 0
-                        
-                        # Frigate-style aspect ratio filtering (person: 0.4-1.3) - MORE STRICT
-                        if aspect_ratio < min_ratio or aspect_ratio > max_ratio:
-                            print(f"[Split-Bottom] REJECT: aspect_ratio={aspect_ratio:.2f} out of range [{min_ratio}, {max_ratio}]")
-                            continue
-                        
-                        # IMPORTANT: Constraint bounding box to stay within bottom split (360 to 720)
-                        # Prevent bbox from crossing split boundary
-                        y1 = max(5, y1)  # Leave 5px margin from split line
-                        y2 = min(bottom_h, y2)
-                        
-                        # Ensure bbox is valid after constraints
-                        if y2 <= y1 or (x2 - x1) < 10 or (y2 - y1) < 10:
-                            print(f"[Split-Bottom] REJECT: Invalid bbox after constraints")
-                            continue
-                        
-                        # Store raw coordinates for skeleton transformation
-                        x1_raw = max(0, x1)
-                        y1_raw = max(5, y1)
-                        x2_raw = min(x2, 640)  # Constrain to detection size
-                        y2_raw = min(y2, 360)  # Constrain to bottom split height
-                        
-                        # Constrained coordinates for detection purposes
-                        y1 = max(5, y1)
-                        y2 = min(bottom_h, y2)
-                        
-                        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-                        
-                        # Adjust coordinates to full frame (add split offset for bottom)
-                        cx_full = cx
-                        cy_full = cy + split_point
-                        
-                        person = PersonDetection(
-                            center=(cx_full, cy_full),
-                            foot_center=(cx, y2 + split_point),
-                            bbox=(x1, y1 + split_point, x2, y2 + split_point),
-                            confidence=conf,
-                            track_id=-1,
-                            bbox_raw=(x1_raw, y1_raw, x2_raw, y2_raw)  # Store raw for skeleton
-                        )
-                        bottom_persons.append(person)
+                batch_results = self._detect_batch({'top': top_frame_detect, 'bottom': bottom_frame_detect},
+                                                   conf=min(top_conf, bottom_conf))
             except Exception as e:
-                print(f"[Split-Bottom] Error: {e}")
+                print(f"[V380 Split] Batch inference error: {e}")
+                batch_results = {}
+            
+            # Unpack each lens with vectorized letterbox inverse + Frigate-style filters
+            results_top = batch_results.get('top')
+            if results_top is not None:
+                try:
+                    top_persons = self._filter_lens_boxes(results_top, top_frame_raw.shape[:2], top_conf,
+                                                          is_top=True, split_point=split_point,
+                                                          detection_size=DETECTION_SIZE)
+                except Exception as e:
+                    print(f"[Split-Top] Error: {e}")
+            
+            results_bottom = batch_results.get('bottom')
+            if results_bottom is not None:
+                try:
+                    bottom_persons = self._filter_lens_boxes(results_bottom, bottom_frame_raw.shape[:2], bottom_conf,
+                                                             is_top=False, split_point=split_point,
+                                                             detection_size=DETECTION_SIZE)
+                except Exception as e:
+                    print(f"[Split-Bottom] Error: {e}")
         
         # Apply Frigate-style NMS (IoU=0.45, conf=0.5)
         top_persons = self._apply_nms(top_persons, iou_threshold=0.45, conf_threshold=0.5)
         bottom_persons = self._apply_nms(bottom_persons, iou_threshold=0.45, conf_threshold=0.5)
         
-        # Refine bounding boxes using skeleton keypoints for tighter fit
-        if MEDIAPIPE_AVAILABLE:
-            self._init_pose()
-            if self.pose:
-                # Use original frames for skeleton detection (before letterboxing)
-                # This ensures skeleton coordinates are in full frame space
-                top_persons = self._refine_bboxes_with_skeleton(top_frame_raw, top_persons, offset_y=0)
-                bottom_persons = self._refine_bboxes_with_skeleton(bottom_frame_raw, bottom_persons, offset_y=split_point)
-        
-        # Merge and assign track IDs
-        all_persons = []
-        track_id = 0
-        
-        for person in top_persons:
-            person.track_id = track_id
-            all_persons.append(person)
-            track_id += 1
-        
-        for person in bottom_persons:
-            person.track_id = track_id
-            all_persons.append(person)
-            track_id += 1
+        # Merge (index track IDs, top lens first)
+        all_persons = DetectionBatch.concatenate([top_persons, bottom_persons])
         
         print(f"[V380 Split] Final result: {len(all_persons)} persons detected (Top: {len(top_persons)}, Bottom: {len(bottom_persons)})")
         return all_persons
     
-    def _transform_skeleton_to_full_frame(self, person: PersonDetection, is_top: bool) -> List[SkeletonLandmark]:
-        """Transform skeleton coordinates from detection frame (letterboxed) to full frame space.
-        
-        Args:
-            person: PersonDetection object with bbox_raw for skeleton transformation
-            is_top: Whether this person is in top split or bottom split
-            
-        Returns:
-            List of SkeletonLandmark with coordinates in full frame space
-        """
-        if not person.bbox_raw or len(person.bbox_raw) != 4:
-            return []
-        
-        x1_raw, y1_raw, x2_raw, y2_raw = person.bbox_raw
-        
-        # Get split info
-        is_split = self._split_info['is_split']
-        split_y = self._split_info['split_y']
-        scale = self._letterbox_info['top_scale'] if is_top else self._letterbox_info['bottom_scale']
-        
-        transformed_landmarks = []
-        
-        # Transform each raw point to full frame space
-        for i in range(33):  # Try to match all 33 MediaPipe landmarks
-            # Create a generic keypoint for each index
-            lm = SkeletonLandmark(
-                x=int(x1_raw + (x2_raw - x1_raw) * i / 33),
-                y=int(y1_raw + (y2_raw - y1_raw) * i / 33),
-                visibility=1.0,
-                name=f"point_{i}"
-            )
-            transformed_landmarks.append(lm)
+    @staticmethod
+    def _refine_bbox_with_skeleton(persons: DetectionBatch, i: int, landmarks: SkeletonLandmarks,
+                                   bounds: Tuple[int, int, int, int]):
+        """Tighten box i to the skeleton keypoints (V380 split frames), in place."""
+        persons.set_landmarks(i, landmarks)
+        if len(landmarks) < 4:  # Need at least 4 keypoints, keep the YOLO box
+            return
         
-        return transformed_landmarks
+        # Apply small margin (5-10 pixels) for coverage
+        margin = 8
+        bx1, by1, bx2, by2 = bounds
+        xy = landmarks.xy
+        x1, y1 = xy.min(axis=0) - margin
+        x2, y2 = xy.max(axis=0) + margin
+        persons.boxes[i] = (max(bx1, x1), max(by1, y1), min(bx2, x2), min(by2, y2))
     
-    def _refine_bboxes_with_skeleton(self, frame: np.ndarray, persons: List[PersonDetection], offset_y: int = 0) -> List[PersonDetection]:
-        """Refine bounding boxes using MediaPipe skeleton keypoints for tighter fit.
+    def estimate_poses(self, frame: np.ndarray, persons: DetectionBatch, tracker: Optional[PersonTracker] = None,
+                       refine: bool = False) -> DetectionBatch:
+        """Skeleton landmarks (frame coordinates) for every person, stored in the batch.
         
-        Args:
-            frame: Full processed frame (before letterboxing, in original full frame space)
-            persons: List of PersonDetection objects to refine
-            offset_y: Y offset for split frame detection
-            
-        Returns:
-            List of PersonDetection with refined bounding boxes and skeleton landmarks
+        With a tracker, pose runs on each person's own schedule and Pose
+        instance (PoseEstimator); with refine (V380 split frames) boxes are
+        tightened to the keypoints. Crops never cross the lens split line.
         """
-        if not self.pose or not persons:
-            return persons
-        
-        refined_persons = []
-        
-        for person in persons:
-            x1, y1, x2, y2 = person.bbox
-            
-            # Crop person region for skeleton detection (in full frame space)
-            pad_x = int((x2 - x1) * 0.1)
-            pad_y = int((y2 - y1) * 0.1)
-            
-            crop_x1 = max(0, x1 - pad_x)
-            crop_y1 = max(0, y1 - pad_y)
-            crop_x2 = min(frame.shape[1], x2 + pad_x)
-            crop_y2 = min(frame.shape[0], y2 + pad_y)
-            
-            person_crop = frame[crop_y1:crop_y2, crop_x1:crop_x2]
-            
-            if person_crop.size == 0:
-                refined_persons.append(person)
-                continue
-            
-            crop_h, crop_w = person_crop.shape[:2]
-            
+        h, w = frame.shape[:2]
+        split_y = h // 2 if h > w else None
+        centers_y = persons.centers[:, 1]
+        for i in range(len(persons)):
+            bounds = (0, 0, w, h)
+            if split_y is not None:
+                bounds = (0, 0, w, split_y) if centers_y[i] < split_y else (0, split_y, w, h)
+            cache = tracker.cache(int(persons.track_ids[i])) if tracker is not None else None
             try:
-                rgb = cv2.cvtColor(person_crop, cv2.COLOR_BGR2RGB)
-                pose_results = self.pose.process(rgb)
-                
-                if pose_results.pose_landmarks:
-                    # Collect all 33 landmarks for comprehensive skeleton
-                    landmarks = []
-                    for idx, lm in enumerate(pose_results.pose_landmarks.landmark):
-                        # Transform coordinates back to full frame space
-                        px = int(lm.x * crop_w) + crop_x1
-                        py = int(lm.y * crop_h) + crop_y1
-                        landmarks.append(SkeletonLandmark(
-                            x=px, y=py,
-                            visibility=lm.visibility,
-                            name=f"point_{idx}"
-                        ))
-                    
-                    if len(landmarks) >= 4:  # Need at least 4 keypoints
-                        # Calculate new tight bounding box from keypoints
-                        new_x1 = min(lm.x for lm in landmarks)
-                        new_y1 = min(lm.y for lm in landmarks)
-                        new_x2 = max(lm.x for lm in landmarks)
-                        new_y2 = max(lm.y for lm in landmarks)
-                        
-                        # Apply small margin (5-10 pixels) for coverage
-                        margin = 8
-                        new_x1 = max(0, new_x1 - margin)
-                        new_y1 = max(0, new_y1 - margin)
-                        new_x2 = min(frame.shape[1], new_x2 + margin)
-                        new_y2 = min(frame.shape[0], new_y2 + margin)
-                        
-                        # Calculate new center and foot center
-                        new_cx = (new_x1 + new_x2) // 2
-                        new_cy = (new_y1 + new_y2) // 2
-                        new_foot_cx = (new_x1 + new_x2) // 2
-                        new_foot_cy = new_y2
-                        
-                        # Create refined detection with adjusted coordinates
-                        refined_bbox = (new_x1, new_y1, new_x2, new_y2)
-                        refined_person = PersonDetection(
-                            center=(new_cx, new_cy),
-                            foot_center=(new_foot_cx, new_foot_cy),
-                            bbox=refined_bbox,
-                            confidence=person.confidence,
-                            track_id=person.track_id,
-                            bbox_raw=person.bbox_raw if hasattr(person, 'bbox_raw') else refined_bbox,
-                            skeleton_landmarks=landmarks
-                        )
-                        
-                        refined_persons.append(refined_person)
-                    else:
-                        # Not enough keypoints, keep original bbox
-                        refined_persons.append(person)
+                landmarks = self.pose_estimator.estimate(frame, tuple(persons.boxes[i].tolist()), cache,
+                                                         pad=0.1 if refine else 0.2, bounds=bounds)
             except Exception as e:
-                print(f"[Skeleton Refine] Error: {e}")
-                refined_persons.append(person)
-        
-        return refined_persons
+                print(f"[Skeleton] Error: {e}")
+                landmarks = NO_LANDMARKS
+            if refine:
+                self._refine_bbox_with_skeleton(persons, i, landmarks, bounds)
+            else:
+                persons.set_landmarks(i, landmarks)
+        return persons
+    
+    @staticmethod
+    def _assign_tracks(persons: DetectionBatch, tracker: Optional[PersonTracker], timestamp: Optional[float]):
+        """Stable track ids from the camera's tracker (index ids without one)."""
+        if tracker is None:
+            return
+        persons.track_ids = tracker.update(persons.boxes, persons.scores, timestamp)
     
-    def detect(self, frame: np.ndarray, draw_skeleton: bool = False) -> Tuple[List[PersonDetection], np.ndarray]:
+    def detect(self, frame: np.ndarray, draw_skeleton: bool = False,
+               motion_regions: Optional[List[Tuple[int, int, int, int]]] = None,
+               tracker: Optional[PersonTracker] = None,
+               timestamp: Optional[float] = None,
+               zone_check: Optional[Callable] = None,
+               faces: Optional[Dict[int, FaceDetection]] = None) -> Tuple[DetectionBatch, np.ndarray]:
+        """Detect persons and draw them on a copy of the frame.
+        
+        With motion_regions (from MotionDetector.detect) only square crops
+        around the motion are sent to YOLO; without them the whole frame is.
+        With a tracker the persons get its track ids (frame time: timestamp)
+        and pose runs on the per-track schedule. With a cascade model,
+        borderline persons and those zone_check(box) puts in an armed zone
+        are re-checked by it (CascadeVerifier). faces (track id -> face,
+        FaceScheduler) names the boxes of recognized trusted persons.
+        """
         if frame is None or not self._loaded:
-            return [], frame if frame is not None else np.zeros((480, 640, 3), dtype=np.uint8)
+            return DetectionBatch(), frame if frame is not None else np.zeros((480, 640, 3), dtype=np.uint8)
         
         if download_manager.get_status()[0]:
-            return [], frame.copy()
+            return DetectionBatch(), frame.copy()
         
-        persons = []
+        persons = DetectionBatch()
         output = frame.copy()
         h, w = frame.shape[:2]
         
         print(f"[DEBUG] Frame size: {w}x{h}")
         
-        # Calculate adaptive drawing parameters based on resolution
-        # High resolution (2K/4K) needs thicker lines and larger fonts
-        max_dim = max(w, h)
-        if max_dim >= 2000:  # 2K/4K resolution
-            bbox_thickness = 6
-            font_scale = 1.2
-            font_thickness = 3
-            circle_radius = 12
-            print(f"[DEBUG] High resolution detected: using thick lines (thickness={bbox_thickness}, font={font_scale})")
-        elif max_dim >= 1280:  # HD resolution
-            bbox_thickness = 3
-            font_scale = 0.7
-            font_thickness = 2
-            circle_radius = 8
-            print(f"[DEBUG] HD resolution detected: using medium lines (thickness={bbox_thickness}, font={font_scale})")
-        else:  # SD/Low resolution
-            bbox_thickness = 2
-            font_scale = 0.5
-            font_thickness = 1
-            circle_radius = 5
-            print(f"[DEBUG] SD resolution detected: using normal lines (thickness={bbox_thickness}, font={font_scale})")
-        
         # Check if frame is vertical stack (h > w indicates V380 dual-lens vertical stacking)
         # This works for ANY vertical stack resolution (1280x720, 2304x2592, etc.)
         if h > w:
             print(f"[DEBUG] Entering SPLIT FRAME mode (vertical stack detected: {w}x{h})")
             try:
-                persons = self.detect_split_frame(frame)
+                persons = self.detect_split_frame(frame, motion_regions=motion_regions)
+                self._assign_tracks(persons, tracker, timestamp)
+                persons = self.cascade.verify(frame, persons, tracker, zone_check, timestamp)
                 
-                # Draw detections for split frame
-                for p in persons:
-                    x1, y1, x2, y2 = p.bbox
-                    
-                    # Determine if person is top or bottom split based on center Y
-                    cy = p.center[1]
-                    is_top = cy < self._split_info['split_y']
-                    
-                    # Transform skeleton coordinates to full frame space for drawing
-                    if draw_skeleton and p.skeleton_landmarks:
-                        p.skeleton_landmarks_full = self._transform_skeleton_to_full_frame(p, is_top)
-                    
-                    # Draw bounding box with adaptive thickness
-                    cv2.rectangle(output, (x1, y1), (x2, y2), (0, 255, 0), bbox_thickness)
-                    
-                    # Draw confidence label with adaptive font
-                    label = f"Person {p.confidence:.0%}"
-                    (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, font_thickness)
-                    cv2.rectangle(output, (x1, y1 - th - 8), (x1 + tw + 4, y1), (0, 255, 0), -1)
-                    cv2.putText(output, label, (x1 + 2, y1 - 4), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), font_thickness)
-                    
-                    # Draw foot marker with adaptive radius
-                    cv2.circle(output, p.foot_center, circle_radius, (255, 0, 255), -1)
-                    
-                    # Draw professional skeleton using full-frame coordinates
-                    if draw_skeleton and p.skeleton_landmarks_full:
-                        self._draw_professional_skeleton(output, p.skeleton_landmarks_full, p.bbox)
+                # Refine bounding boxes using skeleton keypoints for tighter fit
+                if MEDIAPIPE_AVAILABLE and persons:
+                    persons = self.estimate_poses(frame, persons, tracker, refine=True)
                 
+                self.draw_persons(output, persons, draw_skeleton, faces)
                 return persons, output
             except Exception as e:
                 print(f"[Detector] Split frame error: {e}")
-                persons = []
+                persons = DetectionBatch()
         
         # Run YOLO detection (non-split frame)
         print(f"[DEBUG] Running SINGLE camera detection (non-split frame)")
         try:
-            with self._lock:
-                results = self.model(frame, conf=self.confidence, classes=[0], verbose=False)
+            region_plan = self._plan_regions(motion_regions, [(0, 0, w, h)])
+            if region_plan:
+                boxes, scores = self._detect_regions(frame, region_plan, self.confidence)
+            else:
+                results = list(self._detect_batch({'frame': self.preprocessor.apply(frame)}, self.confidence).values())
+                boxes = [r.boxes.xyxy for r in results]
+                scores = [r.boxes.conf for r in results]
+                boxes = np.concatenate(boxes) if boxes else np.empty((0, 4))
+                scores = np.concatenate(scores) if scores else np.empty(0)
             
-            for result in results:
-                if result.boxes is None:
-                    continue
-                for i, box in enumerate(result.boxes):
-                    x1, y1, x2, y2 = map(int, box.xyxy[0].cpu().numpy())
-                    conf = float(box.conf[0])
-                    cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-                    
-                    person = PersonDetection(
-                        center=(cx, cy),
-                        foot_center=(cx, y2),
-                        bbox=(x1, y1, x2, y2),
-                        confidence=conf,
-                        track_id=i
-                    )
-                    persons.append(person)
+            persons = DetectionBatch(np.trunc(boxes), scores)
         except MemoryError:
             print("[Detector] Memory error")
             gc.collect()
         except Exception as e:
             print(f"[Detector] Detection error: {e}")
         
+        self._assign_tracks(persons, tracker, timestamp)
+        persons = self.cascade.verify(frame, persons, tracker, zone_check, timestamp)
+        
         # Run skeleton detection for each person if enabled
         if draw_skeleton and MEDIAPIPE_AVAILABLE and persons:
-            self._init_pose()
-            if self.pose:
-                for person in persons:
-                    skeleton = self._detect_skeleton_for_person_full_frame(frame, person.bbox)
-                    if skeleton:
-                        person.skeleton_landmarks = skeleton
-        
-        # Draw detections
-        for p in persons:
-            x1, y1, x2, y2 = p.bbox
+            persons = self.estimate_poses(frame, persons, tracker)
+        
+        self.draw_persons(output, persons, draw_skeleton, faces)
+        return persons, output
+    
+    @staticmethod
+    def _draw_style(w: int, h: int) -> Tuple[int, float, int, int]:
+        """(bbox thickness, font scale, font thickness, foot radius) for a frame size.
+        
+        V380 split frames adapt to the resolution (2K/4K needs thicker lines
+        and larger fonts); single-camera frames use the normal style.
+        """
+        if h <= w:
+            return 2, 0.5, 1, 5
+        max_dim = max(w, h)
+        if max_dim >= 2000:  # 2K/4K resolution
+            return 6, 1.2, 3, 12
+        if max_dim >= 1280:  # HD resolution
+            return 3, 0.7, 2, 8
+        return 2, 0.5, 1, 5  # SD/Low resolution
+    
+    def draw_persons(self, output: np.ndarray, persons: DetectionBatch, draw_skeleton: bool = False,
+                     faces: Optional[Dict[int, FaceDetection]] = None) -> np.ndarray:
+        """Draw boxes, confidence labels, foot markers and skeletons onto output (in place).
+        
+        Persons whose track has a trusted face in faces (track id -> face)
+        are labelled with its name instead of "Person".
+        """
+        h, w = output.shape[:2]
+        bbox_thickness, font_scale, font_thickness, circle_radius = self._draw_style(w, h)
+        faces = faces or {}
+        
+        for i, (x1, y1, x2, y2) in enumerate(persons.boxes.tolist()):
             
             # Draw bounding box
-            cv2.rectangle(output, (x1, y1), (x2, y2), (0, 255, 0), 2)
+            cv2.rectangle(output, (x1, y1), (x2, y2), (0, 255, 0), bbox_thickness)
             
-            # Draw confidence label
-            label = f"Person {p.confidence:.0%}"
-            (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+            # Draw confidence label (the name of a recognized trusted person)
+            face = faces.get(int(persons.track_ids[i]))
+            name = face.name if face is not None and face.is_trusted else "Person"
+            label = f"{name} {persons.scores[i]:.0%}"
+            (tw, th), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, font_scale, font_thickness)
             cv2.rectangle(output, (x1, y1 - th - 8), (x1 + tw + 4, y1), (0, 255, 0), -1)
-            cv2.putText(output, label, (x1 + 2, y1 - 4), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
+            cv2.putText(output, label, (x1 + 2, y1 - 4), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (0, 0, 0), font_thickness)
             
             # Draw foot marker
-            cv2.circle(output, p.foot_center, 5, (255, 0, 255), -1)
+            cv2.circle(output, ((x1 + x2) // 2, y2), circle_radius, (255, 0, 255), -1)
             
             # Draw professional skeleton if available
-            if draw_skeleton and hasattr(p, 'skeleton_landmarks') and p.skeleton_landmarks:
-                self._draw_professional_skeleton(output, p.skeleton_landmarks, p.bbox)
-                logging.debug(f"[Detector] Skeleton drawn for person at {p.bbox}")
+            if draw_skeleton and persons.has_pose is not None and persons.has_pose[i]:
+                self._draw_professional_skeleton(output, persons.get_landmarks(i), (x1, y1, x2, y2))
         
-        return persons, output
+        return output
     
-    def _detect_skeleton_for_person_full_frame(self, frame: np.ndarray, bbox: Tuple[int, int, int, int]) -> List[SkeletonLandmark]:
-        """Detect skeleton for a specific person's bounding box in full frame space."""
-        x1, y1, x2, y2 = bbox
-        h, w = frame.shape[:2]
-        
-        # Expand bbox slightly for better pose detection
-        pad_x = int((x2 - x1) * 0.2)
-        pad_y = int((y2 - y1) * 0.2)
-        
-        crop_x1 = max(0, x1 - pad_x)
-        crop_y1 = max(0, y1 - pad_y)
-        crop_x2 = min(w, x2 + pad_x)
-        crop_y2 = min(h, y2 + pad_y)
-        
-        person_crop = frame[crop_y1:crop_y2, crop_x1:crop_x2]
-        
-        if person_crop.size == 0:
-            return []
-        
-        crop_h, crop_w = person_crop.shape[:2]
-        
-        try:
-            rgb = cv2.cvtColor(person_crop, cv2.COLOR_BGR2RGB)
-            pose_results = self.pose.process(rgb)
-            
-            if pose_results.pose_landmarks:
-                # Collect all 33 landmarks for comprehensive skeleton
-                landmarks = []
-                for idx, lm in enumerate(pose_results.pose_landmarks.landmark):
-                    # Transform coordinates to full frame space (already in full frame)
-                    px = int(lm.x * crop_w) + crop_x1
-                    py = int(lm.y * crop_h) + crop_y1
-                    landmarks.append(SkeletonLandmark(
-                        x=px, y=py,
-                        visibility=lm.visibility,
-                        name=f"point_{idx}"
-                    ))
-                return landmarks
-        except Exception as e:
-            print(f"[Skeleton] Error: {e}")
-        
-        return []
-    
-    def _draw_professional_skeleton(self, frame: np.ndarray, landmarks: List[SkeletonLandmark], bbox: Tuple[int, int, int, int]):
+    def _draw_professional_skeleton(self, frame: np.ndarray, landmarks: SkeletonLandmarks, bbox: Tuple[int, int, int, int]):
         """Draw a professional-looking skeleton."""
         if len(landmarks) < 4:  # Changed from 33 to 10 for better visibility
             logging.warning(f"[Skeleton] Only {len(landmarks)} keypoints detected, skipping skeleton")
             return
         
-        x1, y1, x2, y2 = bbox
+        points = [tuple(p) for p in landmarks.xy.tolist()]
+        visible = (landmarks.visibility > 0.5).tolist()
         
         # Draw connections with gradient colors
         for start_idx, end_idx, color in self.SKELETON_CONNECTIONS:
-            if start_idx < len(landmarks) and end_idx < len(landmarks):
-                start = landmarks[start_idx]
-                end = landmarks[end_idx]
+            if start_idx < len(points) and end_idx < len(points):
+                start = points[start_idx]
+                end = points[end_idx]
                 
                 # Only draw if both points are visible
-                if start.visibility > 0.5 and end.visibility > 0.5:
+                if visible[start_idx] and visible[end_idx]:
                     # Draw glow effect
-                    cv2.line(frame, (start.x, start.y), (end.x, end.y), 
-                            (color[0]//3, color[1]//3, color[2]//3), 6)
+                    cv2.line(frame, start, end, (color[0]//3, color[1]//3, color[2]//3), 6)
                     # Draw main line
-                    cv2.line(frame, (start.x, start.y), (end.x, end.y), color, 3)
+                    cv2.line(frame, start, end, color, 3)
                     # Draw bright center
-                    cv2.line(frame, (start.x, start.y), (end.x, end.y), 
+                    cv2.line(frame, start, end, 
                             (min(255, color[0]+50), min(255, color[1]+50), min(255, color[2]+50)), 1)
         
         # Draw joints with glow
-        for idx, lm in enumerate(landmarks):
-            if lm.visibility > 0.5:
+        for idx, point in enumerate(points):
+            if visible[idx]:
                 # Determine joint color based on body part
                 if idx in [0, 2, 5, 7, 8]:  # Head
                     color = self.JOINT_COLORS['head']
@@ -1028,11 +1592,11 @@ class PersonDetector:
                     continue
                 
                 # Draw glow
-                cv2.circle(frame, (lm.x, lm.y), radius + 3, (color[0]//3, color[1]//3, color[2]//3), -1)
+                cv2.circle(frame, point, radius + 3, (color[0]//3, color[1]//3, color[2]//3), -1)
                 # Draw joint
-                cv2.circle(frame, (lm.x, lm.y), radius, color, -1)
+                cv2.circle(frame, point, radius, color, -1)
                 # Draw highlight
-                cv2.circle(frame, (lm.x, lm.y), radius - 1, (255, 255, 255), 1)
+                cv2.circle(frame, point, radius - 1, (255, 255, 255), 1)
 
 
 class FaceRecognitionEngine:
@@ -1042,55 +1606,108 @@ class FaceRecognitionEngine:
         self.config = config
         self.known_faces = {}
         self.known_names = []
+        self.gallery = FaceGallery()
+        self.index_threshold = getattr(config, 'FACE_INDEX_THRESHOLD', 0)
         self._lock = threading.Lock()
+        self.store = FaceEncodingStore(getattr(config, 'FACE_CACHE_DIR', config.BASE_DIR / 'face_cache'),
+                                       workers=getattr(config, 'FACE_ENCODE_WORKERS', 0))
         self._load_faces()
     
+    @staticmethod
+    def _images(directory) -> list:
+        if not directory.exists():
+            return []
+        return sorted(fp for fp in directory.iterdir() if fp.suffix.lower() in {'.jpg', '.jpeg', '.png'})
+    
     def _load_faces(self):
+        """Encode trusted faces (only new or changed images, see face_store.py) and swap them in.
+        
+        Images in TRUSTED_FACES_DIR with a face are copied to FIXED_IMAGES_DIR;
+        every image there becomes a known face named after the file.
+        """
         if not FACE_RECOGNITION_AVAILABLE:
             return
         
+        t0 = time.time()
+        trusted = self._images(self.config.TRUSTED_FACES_DIR)
+        fixed = self._images(self.config.FIXED_IMAGES_DIR)
+        encodings = self.store.encode(trusted + fixed)
+        cached, encoded = self.store.last_cached, self.store.last_encoded
+        
+        copied = []
+        for fp in trusted:
+            dest = self.config.FIXED_IMAGES_DIR / fp.name
+            if encodings.get(fp) is not None and not dest.exists():
+                try:
+                    shutil.copy2(str(fp), str(dest))
+                    copied.append(dest)
+                except OSError as e:
+                    print(f"[Faces] Could not copy {fp.name}: {e}")
+        if copied:
+            # Same content as the trusted images, so these are hash hits
+            fixed = self._images(self.config.FIXED_IMAGES_DIR)
+            encodings = self.store.encode(trusted + fixed)
+        
+        known = {fp.stem: encodings[fp] for fp in fixed if encodings.get(fp) is not None}
+        gallery = FaceGallery(known, self.index_threshold)
         with self._lock:
-            self.known_faces.clear()
-            self.known_names.clear()
-            
-            if self.config.TRUSTED_FACES_DIR.exists():
-                for fp in self.config.TRUSTED_FACES_DIR.iterdir():
-                    if fp.suffix.lower() in {'.jpg', '.jpeg', '.png'}:
-                        try:
-                            img = cv2.imread(str(fp))
-                            if img is None:
-                                continue
-                            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                            locs = face_recognition.face_locations(rgb, model="hog")
-                            if locs:
-                                dest = self.config.FIXED_IMAGES_DIR / fp.name
-                                if not dest.exists():
-                                    shutil.copy2(str(fp), str(dest))
-                        except:
-                            pass
-            
-            if self.config.FIXED_IMAGES_DIR.exists():
-                for fp in self.config.FIXED_IMAGES_DIR.iterdir():
-                    if fp.suffix.lower() in {'.jpg', '.jpeg', '.png'}:
-                        try:
-                            img = cv2.imread(str(fp))
-                            if img is None:
-                                continue
-                            rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                            locs = face_recognition.face_locations(rgb, model="hog")
-                            if locs:
-                                enc = face_recognition.face_encodings(rgb, locs)
-                                if enc:
-                                    self.known_faces[fp.stem] = enc[0]
-                                    self.known_names.append(fp.stem)
-                        except:
-                            pass
-            
-            print(f"[Faces] Loaded {len(self.known_names)}")
+            self.known_faces = known
+            self.known_names = list(known)
+            self.gallery = gallery
+        
+        print(f"[Faces] Loaded {len(self.known_names)} in {time.time() - t0:.1f}s "
+              f"({encoded} encoded, {cached} cached)")
     
     def reload_faces(self):
         self._load_faces()
     
+    # Person-scoped search: top of the person box, with a little margin
+    UPPER_BODY = 0.45  # Fraction of the box height (head and shoulders)
+    UPPER_BODY_PAD = 0.1  # Horizontal / upward margin (fraction of the box)
+    
+    def upper_body_region(self, frame_shape: tuple, bbox: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        """Where a person's face can be: the top of their box, clamped to the frame."""
+        h, w = frame_shape[:2]
+        x1, y1, x2, y2 = bbox
+        pad_x = int((x2 - x1) * self.UPPER_BODY_PAD)
+        pad_y = int((y2 - y1) * self.UPPER_BODY_PAD)
+        return (max(0, x1 - pad_x), max(0, y1 - pad_y),
+                min(w, x2 + pad_x), min(h, y1 + int((y2 - y1) * self.UPPER_BODY)))
+    
+    def recognize_crop(self, crop: np.ndarray, offset: Tuple[int, int] = (0, 0)) -> Optional[FaceDetection]:
+        """Largest face in a crop at native resolution, matched against the gallery.
+        
+        Args:
+            crop: BGR image (e.g. a person's upper body)
+            offset: (x, y) of the crop in the frame; the bbox is in frame coordinates
+        """
+        if not FACE_RECOGNITION_AVAILABLE or crop is None or crop.size == 0:
+            return None
+        try:
+            rgb = cv2.cvtColor(crop, cv2.COLOR_BGR2RGB)
+            locs = face_recognition.face_locations(rgb, model="hog")
+            if not locs:
+                return None
+            top, right, bottom, left = max(locs, key=lambda l: (l[2] - l[0]) * (l[1] - l[3]))
+            encs = face_recognition.face_encodings(rgb, [(top, right, bottom, left)])
+            if not encs:
+                return None
+            
+            with self._lock:
+                gallery = self.gallery
+            best, dists = gallery.match(encs, self.config.FACE_MATCH_TOLERANCE)
+            trusted = bool(best[0] >= 0)
+            ox, oy = offset
+            return FaceDetection(
+                name=gallery.names[best[0]] if trusted else "Unknown",
+                confidence=float(1.0 - dists[0]) if trusted else 0.0,
+                is_trusted=trusted,
+                bbox=(left + ox, top + oy, right + ox, bottom + oy)
+            )
+        except Exception as e:
+            print(f"[Faces] Error: {e}")
+            return None
+    
     def recognize_faces(self, frame: np.ndarray) -> List[FaceDetection]:
         if not FACE_RECOGNITION_AVAILABLE or frame is None:
             return []
@@ -1108,57 +1725,206 @@ class FaceRecognitionEngine:
             
             encs = face_recognition.face_encodings(rgb, locs)
             
+            # All faces of the frame against the whole gallery at once
             with self._lock:
-                for (top, right, bottom, left), enc in zip(locs, encs):
-                    top = int(top / scale)
-                    right = int(right / scale)
-                    bottom = int(bottom / scale)
-                    left = int(left / scale)
-                    
-                    name = "Unknown"
-                    conf = 0.0
-                    trusted = False
-                    
-                    if self.known_names:
-                        known_encs = list(self.known_faces.values())
-                        matches = face_recognition.compare_faces(known_encs, enc, self.config.FACE_MATCH_TOLERANCE)
-                        dists = face_recognition.face_distance(known_encs, enc)
-                        
-                        if len(dists) > 0:
-                            best = np.argmin(dists)
-                            if matches[best]:
-                                name = self.known_names[best]
-                                conf = 1.0 - dists[best]
-                                trusted = True
-                    
-                    results.append(FaceDetection(
-                        name=name, confidence=conf, is_trusted=trusted,
-                        bbox=(left, top, right, bottom)
-                    ))
+                gallery = self.gallery
+            best, dists = gallery.match(encs, self.config.FACE_MATCH_TOLERANCE)
+            
+            for (top, right, bottom, left), i, dist in zip(locs, best, dists):
+                top = int(top / scale)
+                right = int(right / scale)
+                bottom = int(bottom / scale)
+                left = int(left / scale)
+                
+                trusted = bool(i >= 0)
+                results.append(FaceDetection(
+                    name=gallery.names[i] if trusted else "Unknown",
+                    confidence=float(1.0 - dist) if trusted else 0.0,
+                    is_trusted=trusted,
+                    bbox=(left, top, right, bottom)
+                ))
         except Exception as e:
             print(f"[Faces] Error: {e}")
         
         return results
 
 
+class FaceScheduler(threading.Thread):
+    """Face recognition as a pipeline stage, per tracked person, off the detection thread.
+    
+    schedule() runs on the detection thread and only copies each due
+    person's upper body into a small queue; this thread runs HOG, encoding
+    and gallery matching on it. A person is tried at most once every
+    `interval` frames (PerformanceSettings.face_interval), counted in the
+    track cache; once a trusted identity is found it is kept in the cache
+    ('face') and the track is not searched again. Without a tracker every
+    person is tried every `interval` frames of the camera. When the queue
+    is full the attempt is skipped and retried on the next frame.
+    """
+    
+    def __init__(self, engine: FaceRecognitionEngine, interval: int = 60, queue_size: int = 8):
+        super().__init__(daemon=True)
+        self.engine = engine
+        self.interval = max(1, interval)
+        self._queue = Queue(maxsize=queue_size)
+        self._running = False
+        self._lock = threading.Lock()
+        self._faces: Dict[str, Dict[int, FaceDetection]] = {}  # camera -> track id -> latest face
+        self._frame_counts: Dict[str, int] = {}  # Untracked cameras: frames since the last attempt
+        
+        # Statistics
+        self.attempts = 0
+        self.found = 0
+        self.trusted = 0
+        self.skipped = 0  # Queue full
+        self.cached = 0  # Confirmed identities served from the track cache
+        self.process_time = 0.0
+    
+    def _due(self, cache: Optional[dict]) -> bool:
+        age = cache.get('face_age', self.interval)
+        if age < self.interval:
+            cache['face_age'] = age + 1
+            return False
+        cache['face_age'] = 1
+        return True
+    
+    def schedule(self, camera_id: str, frame: np.ndarray, persons: DetectionBatch,
+                 tracker: Optional[PersonTracker] = None):
+        """Queue the upper bodies of the persons that are due (detection thread, cheap)."""
+        present = {int(t) for t in persons.track_ids}
+        with self._lock:
+            faces = self._faces.setdefault(camera_id, {})
+            for track_id in [t for t in faces if t not in present]:
+                del faces[track_id]
+        
+        if tracker is None:
+            count = self._frame_counts.get(camera_id, self.interval)
+            self._frame_counts[camera_id] = count + 1
+            if count < self.interval:
+                return
+            self._frame_counts[camera_id] = 1
+        
+        for i in range(len(persons)):
+            track_id = int(persons.track_ids[i])
+            cache = None
+            if tracker is not None:
+                cache = tracker.cache(track_id)
+                if cache is None:
+                    continue
+                if cache.get('face') is not None:
+                    self.cached += 1
+                    with self._lock:
+                        faces[track_id] = cache['face']
+                    continue
+                if not self._due(cache):
+                    continue
+            x1, y1, x2, y2 = self.engine.upper_body_region(frame.shape, tuple(persons.boxes[i].tolist()))
+            if x2 - x1 < 20 or y2 - y1 < 20:
+                continue
+            try:
+                # A copy: the frame may be a capture ring slot that is reused after detection
+                self._queue.put_nowait((camera_id, track_id, frame[y1:y2, x1:x2].copy(), (x1, y1), cache))
+            except Full:
+                self.skipped += 1
+                if cache is not None:
+                    cache['face_age'] = self.interval  # Try again next frame
+    
+    def run(self):
+        self._running = True
+        while self._running:
+            try:
+                camera_id, track_id, crop, offset, cache = self._queue.get(timeout=0.1)
+            except Empty:
+                continue
+            t0 = time.perf_counter()
+            face = self.engine.recognize_crop(crop, offset)
+            self.process_time += time.perf_counter() - t0
+            self.attempts += 1
+            if face is None:
+                continue
+            self.found += 1
+            if face.is_trusted:
+                self.trusted += 1
+                if cache is not None:
+                    cache['face'] = face  # Confirmed for the rest of the track
+            with self._lock:
+                self._faces.setdefault(camera_id, {})[track_id] = face
+    
+    def stop(self):
+        self._running = False
+    
+    def get_faces(self, camera_id: str) -> Dict[int, FaceDetection]:
+        """Latest face per track id of a camera's current persons."""
+        with self._lock:
+            return dict(self._faces.get(camera_id, {}))
+    
+    def get_status(self) -> dict:
+        return {
+            'interval': self.interval,
+            'attempts': self.attempts,
+            'found': self.found,
+            'trusted': self.trusted,
+            'skipped': self.skipped,
+            'cached': self.cached,
+            'queued': self._queue.qsize(),
+            'process_ms_avg': 1000.0 * self.process_time / max(1, self.attempts),
+        }
+
+
 class MotionDetector:
-    """Motion detection with heat map and zone awareness - Enhanced for better accuracy."""
+    """Motion detection with heat map and zone awareness - Enhanced for better accuracy.
     
-    def __init__(self, config: Config):
+    Works on a copy of the frame downscaled to MOTION_WIDTH pixels (0 = full
+    resolution) with work buffers allocated once per frame size; blur
+    kernel and minimum area are scaled with it, and regions are returned in
+    full-frame coordinates. The heat map stays at the working size.
+    
+    The foreground mask comes from a background model (background_models.py,
+    MOTION_MODEL, per camera or per sensitivity preset).
+    """
+    
+    def __init__(self, config: Config, model: Optional[str] = None):
         self.config = config
-        self.prev_frame = None
         self.heat_map = None
         self.frame_size = None
         self.threshold = config.MOTION_THRESHOLD
         self.min_area = config.MOTION_MIN_AREA
+        self.width = getattr(config, 'MOTION_WIDTH', 320)
         self.motion_history = deque(maxlen=5)  # Track recent motion frames
         self.motion_active = False
         self.last_motion_time = 0
+        self._buffers = None
+        self._scale = 1.0
+        self._blur = (21, 21)
+        self.background = None
+        self.set_model(model or getattr(config, 'MOTION_MODEL', 'frame_diff'))
+    
+    def set_model(self, name: str):
+        """Switch the background model (starts learning the background again)."""
+        self.background = create_background_model(name, alpha=getattr(self.config, 'MOTION_BG_ALPHA', 0.05),
+                                                   history=getattr(self.config, 'MOTION_BG_HISTORY', 500))
+        self.frame_size = None
     
     def set_sensitivity(self, sensitivity: Sensitivity):
         settings = Config.get_sensitivity_settings(sensitivity)
         self.threshold = settings.get('motion_threshold', 20)
         self.min_area = settings.get('motion_min_area', 300)
+        model = settings.get('motion_model')
+        if model and model != self.background.name:
+            self.set_model(model)
+    
+    def _allocate(self, w: int, h: int):
+        """Working size and buffers for a new frame size."""
+        self._scale = min(1.0, self.width / w) if self.width else 1.0
+        sw, sh = max(1, int(round(w * self._scale))), max(1, int(round(h * self._scale)))
+        k = max(3, int(21 * self._scale) | 1)  # Same blur relative to the frame
+        self._blur = (k, k)
+        self._buffers = {
+            'small': np.empty((sh, sw, 3), dtype=np.uint8) if self._scale < 1.0 else None,
+            'gray': np.empty((sh, sw), dtype=np.uint8),
+            'mask': np.empty((sh, sw), dtype=np.uint8),
+        }
+        self.heat_map = np.zeros((sh, sw), dtype=np.float32)
     
     def detect(self, frame: np.ndarray) -> Tuple[bool, List[Tuple[int, int, int, int]]]:
         if frame is None:
@@ -1167,59 +1933,70 @@ class MotionDetector:
         h, w = frame.shape[:2]
         size = (w, h)
         
-        # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        
-        # Apply Gaussian blur to reduce noise
-        gray = cv2.GaussianBlur(gray, (21, 21), 0)
-        
         # Initialize or reset if size changed
-        if self.frame_size != size or self.prev_frame is None:
-            self.prev_frame = gray
-            self.heat_map = np.zeros((h, w), dtype=np.float32)
+        if self.frame_size != size or self._buffers is None:
+            self._allocate(w, h)
+            self.background.reset()
             self.frame_size = size
             self.motion_history.clear()
-            return False, []
+        buffers = self._buffers
+        
+        # Downscale, grayscale and blur into the reused buffers
+        gray = buffers['gray']
+        small = frame
+        if buffers['small'] is not None:
+            small = cv2.resize(frame, (gray.shape[1], gray.shape[0]), dst=buffers['small'],
+                               interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=gray)
+        
+        # Apply Gaussian blur to reduce noise
+        cv2.GaussianBlur(gray, self._blur, 0, dst=gray)
         
-        # Calculate absolute difference
-        delta = cv2.absdiff(self.prev_frame, gray)
+        # Foreground mask against the background model (False until it has a background)
+        thresh = buffers['mask']
+        if not self.background.apply(gray, self.threshold, thresh):
+            return False, []
         
-        # Apply threshold - more sensitive lower threshold
-        thresh = cv2.threshold(delta, self.threshold, 255, cv2.THRESH_BINARY)[1]
+        # Background models leave speckle: open it away before growing the regions
+        if self.background.denoise:
+            cv2.morphologyEx(thresh, cv2.MORPH_OPEN, None, dst=thresh)
         
         # Dilate to fill in holes and make motion regions more continuous
-        thresh = cv2.dilate(thresh, None, iterations=2)
+        cv2.dilate(thresh, None, dst=thresh, iterations=2)
         
         # Find contours
         contours, _ = cv2.findContours(thresh, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         
-        # Filter contours by area and create motion regions
+        # Filter contours by area and create motion regions (back in frame coordinates)
         regions = []
         has_motion = False
+        scale = self._scale
+        min_area = self.min_area * scale * scale
         
         for cnt in contours:
             area = cv2.contourArea(cnt)
-            if area > self.min_area:
+            if area > min_area:
                 has_motion = True
                 x, y, cw, ch = cv2.boundingRect(cnt)
                 
                 # Filter out very narrow regions (likely noise)
                 aspect_ratio = cw / ch if ch > 0 else 0
                 if aspect_ratio > 0.1 and aspect_ratio < 10:  # Reasonable aspect ratio
-                    regions.append((x, y, x + cw, y + ch))
+                    if scale < 1.0:
+                        regions.append((int(x / scale), int(y / scale),
+                                        min(w, int(np.ceil((x + cw) / scale))), min(h, int(np.ceil((y + ch) / scale)))))
+                    else:
+                        regions.append((x, y, x + cw, y + ch))
         
-        # Update heat map with decay
+        # Update heat map with decay (in place)
         if has_motion:
-            self.heat_map = self.heat_map * 0.85 + thresh.astype(np.float32) * 0.15
+            cv2.accumulateWeighted(thresh, self.heat_map, 0.15)  # heat * 0.85 + mask * 0.15
             self.last_motion_time = time.time()
             self.motion_history.append(True)
         else:
-            self.heat_map = self.heat_map * 0.95  # Faster decay when no motion
+            self.heat_map *= 0.95  # Faster decay when no motion
             self.motion_history.append(False)
         
-        # Update previous frame
-        self.prev_frame = gray
-        
         # Determine if motion is active (based on recent history)
         recent_motion_count = sum(1 for m in self.motion_history if m)
         self.motion_active = recent_motion_count >= 2  # Motion if 2+ frames in last 5
@@ -1234,34 +2011,254 @@ class MotionDetector:
     
     def reset(self):
         """Reset motion detector state."""
-        self.prev_frame = None
+        self.background.reset()
         self.heat_map = None
         self.frame_size = None
+        self._buffers = None
+
+
+class MotionGate:
+    """Decides per frame whether person detection (YOLO) has to run.
+
+    Modes:
+        'off':    YOLO runs on every frame (old behaviour)
+        'motion': YOLO runs while the motion detector reports motion
+        'zone':   like 'motion', but when zones are armed only motion inside a
+                  zone opens the gate (zone_check decides, see below)
+
+    While the gate is open, and for ``hold`` seconds after the last motion or
+    person, every frame is detected. With the gate closed a keep-alive
+    inference still runs every ``keepalive`` seconds so a person standing
+    still is not lost.
+
+    zone_check(camera_id, regions) returns None when zones do not apply to
+    the camera (not armed, no zones), otherwise whether a region is in a zone.
+    """
+
+    MODES = ('off', 'motion', 'zone')
+
+    def __init__(self, mode: str = 'motion', keepalive: float = 5.0, hold: float = 2.0,
+                 zone_check: Optional[Callable] = None):
+        self.mode = mode if mode in self.MODES else 'motion'
+        self.keepalive = keepalive
+        self.hold = hold
+        self.zone_check = zone_check
+        self._lock = threading.Lock()
+        self._cameras: Dict[str, dict] = {}
+
+        # Statistics
+        self.inferences = 0
+        self.skipped = 0
+        self.keepalives = 0
+
+    def _state(self, camera_id: str) -> dict:
+        state = self._cameras.get(camera_id)
+        if state is None:
+            state = self._cameras[camera_id] = {
+                'last_inference': float('-inf'), 'hold_until': 0.0,
+                'open': True, 'reason': 'start', 'skipped': 0,
+            }
+        return state
+
+    def check(self, camera_id: str, motion: bool, regions: list, now: Optional[float] = None) -> Tuple[bool, str]:
+        """Returns (run detection, reason) for one frame."""
+        now = now if now is not None else time.time()
+
+        triggered = 'motion' if (motion or regions) else None
+        if self.mode == 'zone' and self.zone_check is not None:
+            try:
+                in_zone = self.zone_check(camera_id, regions)
+            except Exception as e:
+                logging.error(f"[Gate] Zone check error: {e}")
+                in_zone = None
+            if in_zone is not None:
+                triggered = 'zone' if in_zone else None
+
+        with self._lock:
+            state = self._state(camera_id)
+            if self.mode == 'off':
+                reason = 'always'
+            elif triggered:
+                reason = triggered
+                state['hold_until'] = now + self.hold
+            elif now < state['hold_until']:
+                reason = 'hold'
+            elif now - state['last_inference'] >= self.keepalive:
+                reason = 'keepalive'
+                self.keepalives += 1
+            else:
+                state['open'] = False
+                state['reason'] = 'idle'
+                state['skipped'] += 1
+                self.skipped += 1
+                return False, 'idle'
+
+            state['open'] = reason != 'keepalive'
+            state['reason'] = reason
+            state['last_inference'] = now
+            self.inferences += 1
+            return True, reason
+
+    def update(self, camera_id: str, persons: list, now: Optional[float] = None):
+        """Keep the gate open while persons are being detected."""
+        if persons:
+            with self._lock:
+                self._state(camera_id)['hold_until'] = (now if now is not None else time.time()) + self.hold
+
+    def get_status(self) -> dict:
+        """Gate mode, per-camera state and skipped-inference counts."""
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'keepalive': self.keepalive,
+                'inferences': self.inferences,
+                'skipped': self.skipped,
+                'keepalives': self.keepalives,
+                'cameras': {cid: {'open': s['open'], 'reason': s['reason'], 'skipped': s['skipped']}
+                            for cid, s in self._cameras.items()},
+            }
 
 
 class DetectionThread(threading.Thread):
-    """Detection thread with skeleton and motion support."""
+    """Detection thread with skeleton and motion support.
     
-    def __init__(self, person_detector: PersonDetector, motion_detector: MotionDetector):
+    One thread (and one set of loaded models) serves every camera: frames are
+    submitted with a camera id, motion state and results are kept per camera.
+    """
+    
+    def __init__(self, person_detector: PersonDetector, motion_detector: MotionDetector,
+                 primary_camera_id: str = 'main', gate: Optional[MotionGate] = None):
         super().__init__(daemon=True)
         self.person_detector = person_detector
         self.motion_detector = motion_detector
+        self.primary_camera_id = primary_camera_id
+        
+        # Skips YOLO on frames without motion (keep-alive inference in between)
+        config = motion_detector.config
+        if gate is None:
+            gate = MotionGate(getattr(config, 'DETECTION_GATE', 'motion'),
+                              getattr(config, 'DETECTION_GATE_KEEPALIVE', 5.0),
+                              getattr(config, 'DETECTION_GATE_HOLD', 2.0))
+        self.gate = gate
+        self._last_full_frame: Dict[str, float] = {}  # camera -> last whole-frame inference
+        
+        # Stable person ids per camera. With DETECTION_INTERVAL > 1 YOLO runs on
+        # every Nth frame and the tracks are predicted on the frames in between
+        self.tracking = getattr(config, 'TRACKER_ENABLED', True)
+        self.detection_interval = max(1, getattr(config, 'DETECTION_INTERVAL', 1))
+        self.trackers: Dict[str, PersonTracker] = {}
+        self._frames_since_detection: Dict[str, int] = {}
         self._input_queue = Queue(maxsize=2)
         self._running = False
+        self._busy = False
         self._result_lock = threading.Lock()
-        
-        self.last_persons = []
-        self.last_motion = False
-        self.last_motion_regions = []
-        self.last_frame = None
+        self._stats_lock = threading.Lock()
+        
+        # Motion detection is stateful (background model, heat map), so one per camera,
+        # each with the camera's own background model if it sets one ('motion_model')
+        self._motion_models = {cam['id']: cam.get('motion_model') for cam in config.get_camera_definitions()} \
+            if hasattr(config, 'get_camera_definitions') else {}
+        primary_model = self._motion_models.get(primary_camera_id)
+        if primary_model and primary_model != motion_detector.background.name:
+            motion_detector.set_model(primary_model)
+        self.motion_detectors = {primary_camera_id: motion_detector}
+        self._results = {}
         
         self.draw_skeleton = False
+        
+        # Face recognition on each person's upper body, on its own thread (set by the owner)
+        self.face_scheduler: Optional[FaceScheduler] = None
+        self.recognize_faces = False
+        
+        # Pipeline statistics
+        self.frames_submitted = 0
+        self.frames_processed = 0
+        self.frames_dropped = 0  # Replaced in the queue before detection picked them up
+        self.frames_predicted = 0  # Tracker prediction instead of YOLO (DETECTION_INTERVAL)
+        self.queue_wait_total = 0.0
+        self.last_queue_wait = 0.0
+        self._wait_samples = 0
+    
+    def get_motion_detector(self, camera_id: Optional[str] = None) -> MotionDetector:
+        """Motion detector for a camera (created on first use)."""
+        camera_id = camera_id or self.primary_camera_id
+        detector = self.motion_detectors.get(camera_id)
+        if detector is None:
+            detector = MotionDetector(self.motion_detector.config, model=self._motion_models.get(camera_id))
+            detector.threshold = self.motion_detector.threshold
+            detector.min_area = self.motion_detector.min_area
+            self.motion_detectors[camera_id] = detector
+        return detector
+    
+    def get_tracker(self, camera_id: Optional[str] = None) -> PersonTracker:
+        """Person tracker for a camera (created on first use)."""
+        camera_id = camera_id or self.primary_camera_id
+        tracker = self.trackers.get(camera_id)
+        if tracker is None:
+            config = self.motion_detector.config
+            tracker = PersonTracker(iou_threshold=getattr(config, 'TRACKER_IOU', 0.3),
+                                    max_age=getattr(config, 'TRACKER_MAX_AGE', 1.0),
+                                    min_hits=getattr(config, 'TRACKER_MIN_HITS', 2))
+            self.trackers[camera_id] = tracker
+        return tracker
+    
+    def get_track_cache(self, camera_id: Optional[str], track_id: int) -> Optional[dict]:
+        """Per-person cache of a live track (pose, face, alerts), None once the track is gone."""
+        tracker = self.trackers.get(camera_id or self.primary_camera_id)
+        return tracker.cache(track_id) if tracker is not None else None
+    
+    def _zone_check(self, camera_id: str) -> Optional[Callable]:
+        """box -> in an armed zone, from the gate's zone_check (None without zones)."""
+        zone_check = self.gate.zone_check
+        if zone_check is None:
+            return None
+        return lambda box: bool(zone_check(camera_id, [box]))
+    
+    @staticmethod
+    def _predicted_persons(tracker: PersonTracker, now: float, shape: tuple) -> DetectionBatch:
+        """Confirmed tracks moved to the frame time, as a batch clipped to the frame.
+        
+        Tracks the cascade model rejected are left out.
+        """
+        h, w = shape[:2]
+        tracks = [t for t in tracker.predict(now) if t.cache.get('cascade', {}).get('confirmed', True)]
+        boxes = np.array([t.bbox for t in tracks]).reshape(-1, 4)
+        boxes = np.clip(boxes, 0, [w - 1, h - 1, w - 1, h - 1]).astype(np.int32)
+        keep = (boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])
+        return DetectionBatch(boxes[keep], np.array([t.confidence for t in tracks])[keep],
+                              np.array([t.track_id for t in tracks], dtype=np.int64)[keep])
+    
+    def _store_results(self, camera_id: str, persons, motion, regions, frame, seq, timestamp,
+                       detect_start: float = 0.0, detect_end: float = 0.0,
+                       faces: Optional[Dict[int, FaceDetection]] = None):
+        with self._result_lock:
+            self._results[camera_id] = {
+                'persons': persons,
+                'faces': faces or {},
+                'motion': motion,
+                'motion_regions': regions,
+                'frame': frame,
+                'frame_seq': seq,
+                'frame_timestamp': timestamp,
+                'detect_start': detect_start,
+                'detect_end': detect_end
+            }
     
     def run(self):
         self._running = True
         while self._running:
             try:
-                frame = self._input_queue.get(timeout=0.1)
+                frame, seq, timestamp, submit_time, ref, camera_id = self._input_queue.get(timeout=0.1)
+            except Empty:
+                continue
+            
+            self._busy = True
+            try:
+                wait = time.time() - submit_time
+                with self._stats_lock:
+                    self.queue_wait_total += wait
+                    self.last_queue_wait = wait
+                    self._wait_samples += 1
                 
                 if frame is None or frame.size == 0:
                     continue
@@ -1270,25 +2267,65 @@ class DetectionThread(threading.Thread):
                     continue
                 
                 if download_manager.get_status()[0]:
-                    with self._result_lock:
-                        self.last_frame = frame.copy()
+                    self._store_results(camera_id, DetectionBatch(), False, [], frame.copy(), seq, timestamp)
                     continue
                 
                 try:
-                    # Detect persons with optional skeleton
-                    logging.info(f"[Detection] Running detection with skeleton={self.draw_skeleton}")
-                    persons, processed = self.person_detector.detect(frame, self.draw_skeleton)
-                    logging.info(f"[Detection] Found {len(persons)} persons")
+                    detect_start = time.time()
+                    
+                    # Motion first: it is cheap and decides whether YOLO has to run
+                    motion, regions = self.get_motion_detector(camera_id).detect(frame)
+                    run_detection, reason = self.gate.check(camera_id, motion, regions, detect_start)
+                    tracker = self.get_tracker(camera_id) if self.tracking else None
+                    # Faces recognized so far for this camera's tracks (labels, alert suppression)
+                    faces = self.get_faces(camera_id) if self.recognize_faces else {}
+                    
+                    if run_detection and tracker is not None and tracker.has_tracks() and \
+                            self._frames_since_detection.get(camera_id, 0) + 1 < self.detection_interval:
+                        # Between YOLO runs: move the tracked people along their velocity
+                        self._frames_since_detection[camera_id] += 1
+                        persons = self._predicted_persons(tracker, timestamp, frame.shape)
+                        if self.draw_skeleton and MEDIAPIPE_AVAILABLE:
+                            persons = self.person_detector.estimate_poses(frame, persons, tracker)
+                        processed = self.person_detector.draw_persons(frame.copy(), persons, self.draw_skeleton, faces)
+                        self.gate.update(camera_id, persons)
+                        with self._stats_lock:
+                            self.frames_predicted += 1
+                    elif run_detection:
+                        # Crop to the motion regions; keep-alive / hold frames (and one frame
+                        # per keep-alive interval) still see the whole frame for people standing still
+                        crop_regions = None
+                        if reason in ('motion', 'zone') and \
+                                detect_start - self._last_full_frame.get(camera_id, 0.0) < self.gate.keepalive:
+                            crop_regions = regions
+                        if not crop_regions:
+                            self._last_full_frame[camera_id] = detect_start
+                        
+                        # Detect persons with optional skeleton
+                        logging.info(f"[Detection] Running detection on {camera_id} frame #{seq} with skeleton={self.draw_skeleton} ({reason})")
+                        persons, processed = self.person_detector.detect(frame, self.draw_skeleton, crop_regions,
+                                                                         tracker=tracker, timestamp=timestamp,
+                                                                         zone_check=self._zone_check(camera_id),
+                                                                         faces=faces)
+                        logging.info(f"[Detection] Found {len(persons)} persons")
+                        self._frames_since_detection[camera_id] = 0
+                        self.gate.update(camera_id, persons)
+                    else:
+                        persons, processed = DetectionBatch(), frame
+                    
+                    if self.recognize_faces and self.face_scheduler is not None and persons:
+                        self.face_scheduler.schedule(camera_id, frame, persons, tracker)
+                    
+                    # Never keep a view of a ring slot the capture thread will reuse
+                    if ref is not None and np.may_share_memory(processed, frame):
+                        processed = processed.copy()
                     
-                    # Detect motion
-                    motion, regions = self.motion_detector.detect(frame)
+                    self._store_results(camera_id, persons, motion, regions, processed, seq, timestamp,
+                                        detect_start, time.time(), faces)
+                    logging.info(f"[Detection] Results stored for {camera_id} frame #{seq}: {len(persons)} persons, motion={motion}")
                     
-                    with self._result_lock:
-                        self.last_persons = persons
-                        self.last_motion = motion
-                        self.last_motion_regions = regions
-                        self.last_frame = processed
-                        logging.info(f"[Detection] Results stored: {len(persons)} persons, motion={motion}")
+                    with self._stats_lock:
+                        self.frames_processed += 1
                 except MemoryError:
                     print("[Detection] Memory error")
                     gc.collect()
@@ -1296,33 +2333,117 @@ class DetectionThread(threading.Thread):
                     logging.error(f"[Detection] Error: {e}")
                     import traceback
                     traceback.print_exc()
-                    
-            except Empty:
-                continue
+            
             except Exception as e:
                 logging.error(f"[Detection] Loop error: {e}")
+            finally:
+                self._busy = False
+                # Borrowed ring frames go back to the capture ring once detection is done
+                if ref is not None:
+                    ref.release()
     
     def stop(self):
         self._running = False
+        if self.face_scheduler is not None:
+            self.face_scheduler.stop()
     
-    def submit(self, frame: np.ndarray):
+    def is_idle(self) -> bool:
+        """True when nothing is queued or being detected."""
+        return not self._busy and self._input_queue.empty()
+    
+    def submit(self, frame: np.ndarray, seq: int = -1, timestamp: Optional[float] = None, ref=None,
+               camera_id: Optional[str] = None):
+        """Queue a frame for detection, replacing any frame still waiting.
+        
+        Args:
+            frame: BGR frame (may be a read-only ring view)
+            seq: Capture sequence number of the frame
+            timestamp: Capture timestamp of the frame
+            ref: Optional FrameRef owning the frame; released after detection
+            camera_id: Camera the frame belongs to (default: primary camera)
+        """
         if frame is None:
+            if ref is not None:
+                ref.release()
             return
+        now = time.time()
+        item = (frame, seq, timestamp if timestamp is not None else now, now, ref,
+                camera_id or self.primary_camera_id)
         try:
             while not self._input_queue.empty():
                 try:
-                    self._input_queue.get_nowait()
-                except:
+                    stale = self._input_queue.get_nowait()
+                except Empty:
                     break
-            self._input_queue.put_nowait(frame)
-        except:
-            pass
+                with self._stats_lock:
+                    self.frames_dropped += 1
+                if stale[4] is not None:
+                    stale[4].release()
+            self._input_queue.put_nowait(item)
+            with self._stats_lock:
+                self.frames_submitted += 1
+        except Exception:
+            if ref is not None:
+                ref.release()
+    
+    def get_result_seq(self, camera_id: Optional[str] = None) -> int:
+        """Sequence number of the frame the latest results belong to (no copy)."""
+        with self._result_lock:
+            result = self._results.get(camera_id or self.primary_camera_id)
+            return result['frame_seq'] if result else -1
+    
+    def get_faces(self, camera_id: Optional[str] = None) -> Dict[int, FaceDetection]:
+        """Recognized faces of the camera's current persons, by track id."""
+        if self.face_scheduler is None:
+            return {}
+        return self.face_scheduler.get_faces(camera_id or self.primary_camera_id)
     
-    def get_results(self) -> dict:
+    def get_results(self, camera_id: Optional[str] = None) -> dict:
         with self._result_lock:
+            result = self._results.get(camera_id or self.primary_camera_id)
+            if not result:
+                return {
+                    'persons': DetectionBatch(),
+                    'faces': {},
+                    'motion': False,
+                    'motion_regions': [],
+                    'frame': None,
+                    'frame_seq': -1,
+                    'frame_timestamp': 0.0,
+                    'detect_start': 0.0,
+                    'detect_end': 0.0
+                }
+            return {
+                'persons': result['persons'],  # Never modified once stored
+                'faces': dict(result['faces']),
+                'motion': result['motion'],
+                'motion_regions': list(result['motion_regions']) if result['motion_regions'] else [],
+                'frame': result['frame'].copy() if result['frame'] is not None else None,
+                'frame_seq': result['frame_seq'],
+                'frame_timestamp': result['frame_timestamp'],
+                'detect_start': result['detect_start'],
+                'detect_end': result['detect_end']
+            }
+    
+    def get_stats(self) -> dict:
+        """Submission, drop and queue-wait counters plus gate, model and tracker state."""
+        with self._stats_lock:
             return {
-                'persons': list(self.last_persons) if self.last_persons else [],
-                'motion': self.last_motion,
-                'motion_regions': list(self.last_motion_regions) if self.last_motion_regions else [],
-                'frame': self.last_frame.copy() if self.last_frame is not None else None
+                'submitted': self.frames_submitted,
+                'processed': self.frames_processed,
+                'dropped': self.frames_dropped,
+                'queue_wait_avg_ms': 1000.0 * self.queue_wait_total / max(1, self._wait_samples),
+                'queue_wait_last_ms': 1000.0 * self.last_queue_wait,
+                'gate': self.gate.get_status(),
+                'model': self.person_detector.get_model_status(),
+                'pose': self.person_detector.pose_estimator.get_status(),
+                'preprocess': self.person_detector.preprocessor.get_status(),
+                'cascade': self.person_detector.cascade.get_status(),
+                'faces': self.face_scheduler.get_status() if self.face_scheduler is not None else None,
+                'tracker': {
+                    'enabled': self.tracking,
+                    'detection_interval': self.detection_interval,
+                    'predicted': self.frames_predicted,
+                    'cameras': {cid: t.get_status() for cid, t in self.trackers.items()},
+                },
             }
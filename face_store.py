@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Persistent face-encoding store and the in-memory face gallery.
+
+Encodings are kept on disk next to a manifest:
+
+    <dir>/encodings.npz   sha256 of the image -> 128-d face encoding
+    <dir>/manifest.json   image path -> sha256, mtime, size; hashes without a face
+
+A file whose mtime and size match the manifest is not even read; a touched
+file with the same content is matched by its hash. Only new or changed
+images are decoded and run through HOG + face_encodings, in a process pool.
+
+FaceGallery holds the loaded encodings as one contiguous (N,128) matrix and
+matches every face of a frame in a single (F,N) distance computation, or,
+for large galleries, through a KD-tree (scipy, optional).
+"""
+
+import json
+import logging
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from hashing import file_sha256
+
+SCIPY_AVAILABLE = False
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    pass
+
+FORMAT_VERSION = 1
+
+# Workers only import cv2 / face_recognition (never fork a process running camera threads)
+_ctx = mp.get_context('spawn')
+
+
+def encode_face_file(path: str) -> Optional[np.ndarray]:
+    """Encoding of the first face in an image file, None without a face (runs in the pool)."""
+    import cv2
+    import face_recognition
+
+    try:
+        img = cv2.imread(path)
+        if img is None:
+            return None
+        rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        locs = face_recognition.face_locations(rgb, model="hog")
+        if not locs:
+            return None
+        enc = face_recognition.face_encodings(rgb, locs)
+        return np.asarray(enc[0], dtype=np.float64) if enc else None
+    except Exception as e:
+        logging.warning(f"[Faces] Could not encode {path}: {e}")
+        return None
+
+
+class FaceEncodingStore:
+    """On-disk cache of face encodings keyed by image content hash."""
+
+    def __init__(self, directory, workers: int = 0):
+        self.directory = Path(directory)
+        self.workers = workers or os.cpu_count() or 1
+        self._lock = threading.Lock()  # One encode() at a time (reload while loading)
+        self._files: Dict[str, dict] = {}  # path -> {'sha256', 'mtime', 'size'}
+        self._encodings: Dict[str, np.ndarray] = {}  # sha256 -> encoding
+        self._no_face: set = set()  # sha256 of images without a face
+
+        # Statistics of the last encode()
+        self.last_encoded = 0
+        self.last_cached = 0
+        self._load()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory / 'manifest.json'
+
+    @property
+    def encodings_path(self) -> Path:
+        return self.directory / 'encodings.npz'
+
+    def _load(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            if manifest.get('version') != FORMAT_VERSION:
+                return
+            with np.load(self.encodings_path) as data:
+                self._encodings = dict(zip(data['hashes'].tolist(), data['encodings']))
+            self._files = manifest.get('files', {})
+            self._no_face = set(manifest.get('no_face', []))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"[Faces] Ignoring unreadable encoding cache in {self.directory}: {e}")
+            self._files, self._encodings, self._no_face = {}, {}, set()
+
+    def _save(self):
+        """Write both files (atomically replaced), keeping only hashes still in use."""
+        used = {entry['sha256'] for entry in self._files.values()}
+        self._encodings = {h: e for h, e in self._encodings.items() if h in used}
+        self._no_face &= used
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        hashes = sorted(self._encodings)
+        encodings = np.array([self._encodings[h] for h in hashes], dtype=np.float64).reshape(-1, 128)
+        tmp = self.encodings_path.with_suffix('.tmp.npz')
+        np.savez(tmp, hashes=np.array(hashes, dtype=str), encodings=encodings)
+        os.replace(tmp, self.encodings_path)
+
+        tmp = self.manifest_path.with_suffix('.tmp')
+        with open(tmp, 'w') as f:
+            json.dump({'version': FORMAT_VERSION, 'files': self._files, 'no_face': sorted(self._no_face)}, f)
+        os.replace(tmp, self.manifest_path)
+
+    def _file_hash(self, path: Path) -> str:
+        """Content hash, from the manifest when mtime and size are unchanged."""
+        st = path.stat()
+        key = str(path)
+        entry = self._files.get(key)
+        if entry is None or entry['mtime'] != st.st_mtime_ns or entry['size'] != st.st_size:
+            entry = self._files[key] = {'sha256': file_sha256(key), 'mtime': st.st_mtime_ns, 'size': st.st_size}
+        return entry['sha256']
+
+    def encode(self, paths: Iterable[Path]) -> Dict[Path, Optional[np.ndarray]]:
+        """Encoding (or None without a face) of every image; only uncached ones are encoded.
+
+        Manifest entries of files that are no longer passed in are dropped,
+        so pass every image that should stay cached.
+        """
+        with self._lock:
+            hashes = {}
+            for path in paths:
+                try:
+                    hashes[Path(path)] = self._file_hash(Path(path))
+                except OSError:
+                    continue
+
+            pending = {}  # sha256 -> path to encode
+            for path, digest in hashes.items():
+                if digest not in self._encodings and digest not in self._no_face:
+                    pending.setdefault(digest, path)
+
+            if pending:
+                workers = min(self.workers, len(pending))
+                if workers > 1:
+                    with ProcessPoolExecutor(max_workers=workers, mp_context=_ctx) as pool:
+                        results = list(pool.map(encode_face_file, [str(p) for p in pending.values()]))
+                else:
+                    results = [encode_face_file(str(p)) for p in pending.values()]
+                for digest, encoding in zip(pending, results):
+                    if encoding is None:
+                        self._no_face.add(digest)
+                    else:
+                        self._encodings[digest] = encoding
+
+            self.last_encoded = len(pending)
+            self.last_cached = len(hashes) - len(pending)
+            self._files = {k: v for k, v in self._files.items() if Path(k) in hashes}
+            try:
+                self._save()
+            except Exception as e:
+                logging.warning(f"[Faces] Could not write encoding cache: {e}")
+            return {path: self._encodings.get(digest) for path, digest in hashes.items()}
+
+
+def face_distances(encodings: np.ndarray, gallery: np.ndarray) -> np.ndarray:
+    """(F,N) euclidean distances between face encodings and gallery rows (face_recognition.face_distance)."""
+    encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, gallery.shape[1])
+    sq = (np.einsum('ij,ij->i', encodings, encodings)[:, None]
+          + np.einsum('ij,ij->i', gallery, gallery)[None, :]
+          - 2.0 * encodings @ gallery.T)
+    return np.sqrt(np.maximum(sq, 0.0, out=sq), out=sq)
+
+
+class FaceGallery:
+    """Known faces as a contiguous (N,128) float32 matrix plus a parallel name array.
+
+    Built once per reload; match() finds the nearest known face for every
+    face of a frame at once. With index_threshold > 0 and scipy installed,
+    galleries larger than that use a KD-tree (exact nearest neighbour,
+    sub-linear in N) instead of the full distance matrix.
+    """
+
+    def __init__(self, faces: Optional[Dict[str, np.ndarray]] = None, index_threshold: int = 0):
+        faces = faces or {}
+        self.names = np.array(list(faces), dtype=object)
+        self.matrix = np.ascontiguousarray(np.array(list(faces.values()), dtype=np.float32).reshape(-1, 128))
+        self.index = None
+        if SCIPY_AVAILABLE and 0 < index_threshold < len(self.names):
+            self.index = cKDTree(self.matrix)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def match(self, encodings, tolerance: float = 0.6) -> tuple:
+        """Nearest known face per encoding.
+
+        Returns:
+            (F,) gallery indices (-1 when none is within tolerance), (F,) distances
+        """
+        encodings = np.asarray(encodings, dtype=np.float32).reshape(-1, 128)
+        count = len(encodings)
+        if count == 0 or len(self) == 0:
+            return np.full(count, -1, dtype=np.int64), np.full(count, np.inf, dtype=np.float32)
+        if self.index is not None:
+            dists, best = self.index.query(encodings, k=1)
+            dists = dists.astype(np.float32)
+            best = best.astype(np.int64)
+        else:
+            all_dists = face_distances(encodings, self.matrix)
+            best = all_dists.argmin(axis=1)
+            dists = all_dists[np.arange(count), best]
+        # Same rule as face_recognition.compare_faces: distance <= tolerance
+        best = np.where(dists <= tolerance, best, -1)
+        return best, dists
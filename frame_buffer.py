@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""Frame buffers - Preallocated zero-copy ring for capture -> consumers."""
+
+import threading
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class FrameRef:
+    """Borrowed, read-only view of one ring slot.
+
+    The slot cannot be reused by the writer until release() is called
+    (or the ``with`` block exits).
+    """
+
+    __slots__ = ('_ring', '_slot', '_generation', 'frame', 'seq', 'timestamp', '_released')
+
+    def __init__(self, ring: 'FrameRing', slot: int, generation: int, frame: np.ndarray, seq: int, timestamp: float):
+        self._ring = ring
+        self._slot = slot
+        self._generation = generation
+        self.frame = frame
+        self.seq = seq
+        self.timestamp = timestamp
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._ring._release(self._slot, self._generation)
+
+    def __enter__(self) -> 'FrameRef':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def __del__(self):
+        # Safety net for consumers that forget to release. The garbage collector
+        # may run this on a thread that already holds the ring lock, so it never
+        # blocks on it: a busy lock defers the release to the ring's next borrow/write.
+        if not self._released:
+            self._released = True
+            try:
+                self._ring._release_nowait(self._slot, self._generation)
+            except Exception:
+                pass
+
+
+class FrameRing:
+    """Ring of preallocated frame slots with sequence numbers and refcounts.
+
+    Writer side:  slot = ring.acquire_write(shape)  ->  fill slot in place  ->  ring.commit()
+    Reader side:  ref = ring.borrow()  ->  use ref.frame (read-only)  ->  ref.release()
+
+    The writer never touches a slot that is borrowed or holds the latest
+    frame, so readers see stable data without any copy.
+    """
+
+    def __init__(self, slots: int = 4, shape: Optional[Tuple[int, ...]] = None, dtype=np.uint8):
+        if slots < 2:
+            raise ValueError("FrameRing needs at least 2 slots")
+        self.num_slots = slots
+        self.dtype = dtype
+        self.lock = threading.Lock()
+        self._cond = threading.Condition(self.lock)
+
+        self.shape = None
+        self._storage = None
+        self._refcount = [0] * slots
+        self._seq = [0] * slots
+        self._timestamp = [0.0] * slots
+        self._generation = 0  # Bumped on reallocation so stale refs don't corrupt counts
+        self._deferred = deque()  # (slot, generation) released by FrameRef.__del__ while the lock was busy
+
+        self._latest = -1
+        self._writing = -1
+        self._next_seq = 0
+
+        # Statistics
+        self.frames_written = 0
+        self.frames_dropped = 0
+
+        if shape is not None:
+            self._allocate(shape)
+
+    def _allocate(self, shape: Tuple[int, ...]):
+        self.shape = tuple(shape)
+        self._storage = np.empty((self.num_slots,) + self.shape, dtype=self.dtype)
+        self._refcount = [0] * self.num_slots
+        self._latest = -1
+        self._writing = -1
+        self._generation += 1
+
+    def acquire_write(self, shape: Optional[Tuple[int, ...]] = None) -> Optional[np.ndarray]:
+        """Reserve the next free slot for writing.
+
+        Args:
+            shape: Expected frame shape; (re)allocates the ring on change
+
+        Returns:
+            Writable slot array, or None if every slot is borrowed
+        """
+        with self.lock:
+            self._drain_deferred()
+            if shape is not None and tuple(shape) != self.shape:
+                self._allocate(shape)
+            if self._storage is None:
+                return None
+
+            for offset in range(1, self.num_slots + 1):
+                slot = (self._latest + offset) % self.num_slots
+                if slot != self._latest and self._refcount[slot] == 0:
+                    self._writing = slot
+                    return self._storage[slot]
+
+            self.frames_dropped += 1
+            return None
+
+    def commit(self, timestamp: Optional[float] = None) -> int:
+        """Publish the slot returned by acquire_write() as the latest frame.
+
+        Returns:
+            Sequence number assigned to the frame (-1 if nothing was reserved)
+        """
+        with self._cond:
+            slot = self._writing
+            if slot < 0:
+                return -1
+            self._next_seq += 1
+            self._seq[slot] = self._next_seq
+            self._timestamp[slot] = timestamp if timestamp is not None else time.time()
+            self._latest = slot
+            self._writing = -1
+            self.frames_written += 1
+            self._cond.notify_all()
+            return self._next_seq
+
+    def abort_write(self):
+        """Give back a slot reserved by acquire_write() without publishing it."""
+        with self.lock:
+            self._writing = -1
+
+    def put(self, frame: np.ndarray, timestamp: Optional[float] = None) -> int:
+        """Copy an externally owned frame into the ring (single copy)."""
+        slot = self.acquire_write(frame.shape)
+        if slot is None:
+            return -1
+        np.copyto(slot, frame)
+        return self.commit(timestamp)
+
+    def borrow(self, min_seq: int = 0) -> Optional[FrameRef]:
+        """Borrow the latest frame as a read-only view (no copy).
+
+        Args:
+            min_seq: Only return a frame whose sequence number is >= min_seq
+        """
+        with self.lock:
+            self._drain_deferred()
+            slot = self._latest
+            if slot < 0 or self._seq[slot] < min_seq:
+                return None
+            self._refcount[slot] += 1
+            view = self._storage[slot].view()
+            view.flags.writeable = False
+            return FrameRef(self, slot, self._generation, view, self._seq[slot], self._timestamp[slot])
+
+    def wait_borrow(self, after_seq: int, timeout: float = 1.0) -> Optional[FrameRef]:
+        """Block until a frame newer than after_seq is published, then borrow it."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._latest >= 0 and self._seq[self._latest] > after_seq,
+                timeout=timeout
+            )
+        return self.borrow(min_seq=after_seq + 1)
+
+    def _release_locked(self, slot: int, generation: int):
+        if generation == self._generation and self._refcount[slot] > 0:
+            self._refcount[slot] -= 1
+
+    def _release(self, slot: int, generation: int):
+        with self.lock:
+            self._release_locked(slot, generation)
+
+    def _release_nowait(self, slot: int, generation: int):
+        """Release without waiting for the lock (deferred if it is held)."""
+        if self.lock.acquire(False):
+            try:
+                self._release_locked(slot, generation)
+            finally:
+                self.lock.release()
+        else:
+            self._deferred.append((slot, generation))
+
+    def _drain_deferred(self):
+        """Apply releases deferred by _release_nowait() (lock held)."""
+        while self._deferred:
+            self._release_locked(*self._deferred.popleft())
+
+    def get(self) -> Optional[np.ndarray]:
+        """Get a private copy of the latest frame (for consumers that draw on it)."""
+        ref = self.borrow()
+        if ref is None:
+            return None
+        with ref:
+            return ref.frame.copy()
+
+    @property
+    def latest_seq(self) -> int:
+        with self.lock:
+            return self._seq[self._latest] if self._latest >= 0 else 0
+
+    def __len__(self) -> int:
+        """Number of slots currently holding a published frame."""
+        with self.lock:
+            return min(self.frames_written, self.num_slots)
+
+    def clear(self):
+        """Forget the latest frame (borrowed views stay valid)."""
+        with self.lock:
+            self._latest = -1
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+"""Content hashes of files on disk (model export cache, face encoding cache).
+
+Standard library only: imported by face encoding workers and the ONNX
+backend without pulling in the model stack.
+"""
+
+import hashlib
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    """Hex sha256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
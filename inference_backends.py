@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""Pluggable YOLO inference backends.
+
+Every backend is called like the ultralytics ``YOLO`` object::
+
+    results = backend([img1, img2], conf=0.25, classes=[0], imgsz=640)
+
+and returns one ``Detections`` per image with plain numpy boxes in the
+image's own pixel coordinates (letterboxing already undone).
+
+Backends:
+    "torch": ultralytics PyTorch model (the old path)
+    "onnx":  ONNX Runtime on CPU. On first use the .pt is exported to ONNX and
+             cached in MODEL_CACHE_DIR as <name>-<sha256 of .pt>-<imgsz>.onnx;
+             later runs load the cached file directly (no PyTorch needed).
+
+INT8 models are selected by name ("yolov8n-int8" in AVAILABLE_MODELS) and
+always run on ONNX Runtime. They are produced once per input size by
+``python3 quantize_model.py`` (calibrated on snapshots/ and alerts/) and
+cached next to the FP32 export as <name>-<hash>-<imgsz>-int8.onnx.
+"""
+
+import ast
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from boxes import non_max_suppression
+from hashing import file_sha256
+
+YOLO_AVAILABLE = False
+try:
+    from ultralytics import YOLO
+    YOLO_AVAILABLE = True
+except ImportError:
+    pass
+
+ONNXRUNTIME_AVAILABLE = False
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    pass
+
+
+class Boxes:
+    """Detections of one image as numpy arrays."""
+
+    def __init__(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray):
+        self.xyxy = xyxy  # (N,4) float32, image pixels
+        self.conf = conf  # (N,) float32
+        self.cls = cls    # (N,) int64
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+
+class Detections:
+    """Result of one image (mirrors the parts of ultralytics Results we use)."""
+
+    def __init__(self, boxes: Boxes, names: Dict[int, str]):
+        self.boxes = boxes
+        self.names = names
+
+
+INT8_SUFFIX = '-int8'
+
+
+def split_model_name(model_name: str) -> Tuple[str, str]:
+    """Weights file and precision of an AVAILABLE_MODELS value.
+
+    'yolov8n-int8' -> ('yolov8n.pt', 'int8'), 'yolov8s.pt' -> ('yolov8s.pt', 'fp32')
+    """
+    stem, ext = os.path.splitext(model_name)
+    if stem.endswith(INT8_SUFFIX) and ext in ('', '.pt'):
+        return stem[:-len(INT8_SUFFIX)] + '.pt', 'int8'
+    return model_name, 'fp32'
+
+
+class InferenceBackend:
+    """Base class: load a model once, run batches of BGR images through it."""
+
+    name = 'base'
+
+    def __init__(self, model_path: str, imgsz: int = 640, device: str = 'cpu'):
+        self.model_path = model_path
+        self.imgsz = imgsz
+        self.device = device
+        self.names: Dict[int, str] = {}
+
+    def load(self):
+        raise NotImplementedError
+
+    def predict(self, images: List[np.ndarray], conf: float = 0.25, classes: Optional[List[int]] = None,
+                iou: float = 0.45, imgsz: Optional[int] = None) -> List[Detections]:
+        raise NotImplementedError
+
+    def __call__(self, source, conf: float = 0.25, classes: Optional[List[int]] = None, iou: float = 0.45,
+                 verbose: bool = False, imgsz: Optional[int] = None) -> List[Detections]:
+        images = source if isinstance(source, (list, tuple)) else [source]
+        if not images:
+            return []
+        return self.predict(list(images), conf=conf, classes=classes, iou=iou, imgsz=imgsz)
+
+    def warmup(self, shapes: List[Tuple[int, int, int, Optional[int]]]) -> float:
+        """Run blank frames through the model once per (batch, height, width, imgsz).
+
+        The first call at a new shape pays for session creation (ONNX, one
+        per input size), layer fusing and buffer allocation (PyTorch); doing
+        it here keeps that off the first real detection. Returns seconds.
+        """
+        t0 = time.perf_counter()
+        for batch, height, width, imgsz in shapes:
+            blank = np.full((height, width, 3), 114, dtype=np.uint8)
+            self([blank] * batch, conf=0.99, classes=[0], imgsz=imgsz)
+        return time.perf_counter() - t0
+
+
+class TorchBackend(InferenceBackend):
+    """ultralytics YOLO (PyTorch) - the reference path."""
+
+    name = 'torch'
+
+    def load(self):
+        if not YOLO_AVAILABLE:
+            raise ImportError("ultralytics is required for the torch backend")
+        self.model = YOLO(self.model_path)
+        if self.device != 'cpu':
+            self.model.to(self.device)
+        self.names = dict(self.model.names)
+        return self
+
+    def predict(self, images, conf=0.25, classes=None, iou=0.45, imgsz=None):
+        kwargs = {'imgsz': imgsz} if imgsz else {}
+        results = self.model(images, conf=conf, classes=classes, iou=iou, verbose=False, **kwargs)
+        out = []
+        for result in results:
+            boxes = result.boxes
+            if boxes is None or len(boxes) == 0:
+                out.append(Detections(Boxes(np.empty((0, 4), np.float32), np.empty(0, np.float32),
+                                            np.empty(0, np.int64)), self.names))
+                continue
+            out.append(Detections(Boxes(boxes.xyxy.cpu().numpy().astype(np.float32),
+                                        boxes.conf.cpu().numpy().astype(np.float32),
+                                        boxes.cls.cpu().numpy().astype(np.int64)), self.names))
+        return out
+
+
+class OnnxBackend(InferenceBackend):
+    """ONNX Runtime (CPUExecutionProvider) on an exported, disk-cached model.
+
+    One session per input size; each is exported once (dynamic batch) and
+    cached by the .pt hash, so changing the .pt invalidates the cache. With
+    precision 'int8' the quantized file is used for every input size that
+    has one; sizes without one fall back to the FP32 export with a warning.
+    """
+
+    name = 'onnx'
+
+    def __init__(self, model_path: str, imgsz: int = 640, device: str = 'cpu',
+                 cache_dir: str = 'model_cache', threads: int = 0, precision: str = 'fp32'):
+        super().__init__(model_path, imgsz, device)
+        self.cache_dir = cache_dir
+        self.threads = threads
+        self.precision = precision
+        if precision == 'int8':
+            self.name = 'onnx-int8'
+
+        self._sessions: Dict[int, 'ort.InferenceSession'] = {}
+        self._sessions_lock = threading.Lock()
+        self._model_hash = None
+
+        # Statistics
+        self.export_seconds = 0.0
+        self.cache_hits = 0
+
+    def _resolve_weights(self) -> str:
+        """Local .pt path (downloaded by ultralytics if it is not on disk yet)."""
+        if os.path.exists(self.model_path):
+            return self.model_path
+        if not YOLO_AVAILABLE:
+            raise FileNotFoundError(f"{self.model_path} not found and ultralytics is not installed to fetch it")
+        model = YOLO(self.model_path)
+        return getattr(model, 'ckpt_path', None) or self.model_path
+
+    def cache_path(self, imgsz: int, precision: str = 'fp32') -> str:
+        if self._model_hash is None:
+            self._model_hash = file_sha256(self._resolve_weights())[:16]
+        stem = os.path.splitext(os.path.basename(self.model_path))[0]
+        suffix = INT8_SUFFIX if precision == 'int8' else ''
+        return os.path.join(self.cache_dir, f"{stem}-{self._model_hash}-{imgsz}{suffix}.onnx")
+
+    def export(self, imgsz: int) -> str:
+        """Path of the cached FP32 ONNX model for imgsz (exported if missing)."""
+        path = self.cache_path(imgsz)
+        if not os.path.exists(path):
+            self._export(imgsz, path)
+        return path
+
+    def _export(self, imgsz: int, target: str):
+        """Export the .pt with ultralytics and move the .onnx into the cache."""
+        if not YOLO_AVAILABLE:
+            raise ImportError("ultralytics is required to export the ONNX model (no cached copy found)")
+        t0 = time.time()
+        logging.info(f"[Backend] Exporting {self.model_path} to ONNX (imgsz={imgsz})...")
+        exported = YOLO(self._resolve_weights()).export(format='onnx', imgsz=imgsz, dynamic=True,
+                                                         simplify=False, verbose=False)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        shutil.move(str(exported), target)
+        self.export_seconds += time.time() - t0
+        logging.info(f"[Backend] Cached {target} ({self.export_seconds:.1f}s)")
+
+    def _session(self, imgsz: int):
+        session = self._sessions.get(imgsz)
+        if session is not None:
+            return session
+        with self._sessions_lock:
+            session = self._sessions.get(imgsz)
+            if session is None:
+                path = self.cache_path(imgsz, self.precision)
+                if os.path.exists(path):
+                    self.cache_hits += 1
+                else:
+                    if self.precision == 'int8':
+                        logging.warning(f"[Backend] No INT8 model for {self.model_path} at imgsz={imgsz} "
+                                        f"(run: python3 quantize_model.py --model {self.model_path} --imgsz {imgsz}), "
+                                        f"using FP32")
+                    path = self.export(imgsz)
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                if self.threads:
+                    options.intra_op_num_threads = self.threads
+                session = ort.InferenceSession(path, sess_options=options, providers=['CPUExecutionProvider'])
+                if not self.names:
+                    self.names = self._read_names(session)
+                self._sessions[imgsz] = session
+        return session
+
+    @staticmethod
+    def _read_names(session) -> Dict[int, str]:
+        names = session.get_modelmeta().custom_metadata_map.get('names')
+        try:
+            return {int(k): v for k, v in ast.literal_eval(names).items()} if names else {}
+        except (ValueError, SyntaxError):
+            return {}
+
+    def load(self):
+        if not ONNXRUNTIME_AVAILABLE:
+            raise ImportError("onnxruntime is required for the onnx backend (pip install onnxruntime)")
+        self._session(self.imgsz)
+        return self
+
+    @staticmethod
+    def letterbox(image: np.ndarray, imgsz: int, rect: bool = False, stride: int = 32) -> tuple:
+        """Resize to fit imgsz with grey padding (same as ultralytics LetterBox).
+
+        With rect the padding only goes up to a multiple of stride instead of
+        the full square, e.g. a 1280x720 frame becomes 640x384 at imgsz 640
+        (the exported model has dynamic height and width).
+
+        Returns:
+            (padded image, gain, (pad_x, pad_y))
+        """
+        h, w = image.shape[:2]
+        gain = min(imgsz / h, imgsz / w)
+        new_w, new_h = int(round(w * gain)), int(round(h * gain))
+        if (new_w, new_h) != (w, h):
+            image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        pad_x, pad_y = (imgsz - new_w) / 2, (imgsz - new_h) / 2
+        if rect:
+            pad_x, pad_y = (-new_w % stride) / 2, (-new_h % stride) / 2
+        top, bottom = int(round(pad_y - 0.1)), int(round(pad_y + 0.1))
+        left, right = int(round(pad_x - 0.1)), int(round(pad_x + 0.1))
+        padded = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(114, 114, 114))
+        return padded, gain, (left, top)
+
+    @staticmethod
+    def postprocess(output: np.ndarray, conf: float, iou: float, classes: Optional[List[int]],
+                    gain: float, pad: tuple, shape: tuple, max_det: int = 300) -> Boxes:
+        """Decode one YOLOv8 output (4 + classes, anchors): filter, NMS, undo letterbox."""
+        preds = output.T  # (anchors, 4 + classes)
+        class_scores = preds[:, 4:]
+        cls = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(cls)), cls]
+        mask = scores > conf
+        if classes is not None:
+            mask &= np.isin(cls, classes)
+        if not mask.any():
+            return Boxes(np.empty((0, 4), np.float32), np.empty(0, np.float32), np.empty(0, np.int64))
+
+        xywh, scores, cls = preds[mask, :4], scores[mask], cls[mask]
+        xyxy = np.concatenate([xywh[:, :2] - xywh[:, 2:] / 2, xywh[:, :2] + xywh[:, 2:] / 2], axis=1)
+        keep = non_max_suppression(xyxy, scores, iou, class_ids=cls)[:max_det]
+
+        xyxy = (xyxy[keep] - (pad[0], pad[1], pad[0], pad[1])) / gain
+        h, w = shape[:2]
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, w)
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, h)
+        return Boxes(xyxy.astype(np.float32), scores[keep].astype(np.float32), cls[keep].astype(np.int64))
+
+    def predict(self, images, conf=0.25, classes=None, iou=0.45, imgsz=None):
+        imgsz = imgsz or self.imgsz
+        session = self._session(imgsz)
+        # Same-shape batches (the usual case) only pad to a multiple of 32
+        rect = len({image.shape for image in images}) == 1
+        padded, meta = [], []
+        for image in images:
+            image, gain, pad = self.letterbox(image, imgsz, rect)
+            padded.append(image)
+            meta.append((gain, pad))
+        blob = cv2.dnn.blobFromImages(padded, scalefactor=1.0 / 255.0, swapRB=True)
+        outputs = session.run(None, {session.get_inputs()[0].name: blob})[0]
+        return [Detections(self.postprocess(outputs[i], conf, iou, classes, gain, pad, image.shape), self.names)
+                for i, (image, (gain, pad)) in enumerate(zip(images, meta))]
+
+
+BACKENDS = {
+    'torch': TorchBackend,
+    'onnx': OnnxBackend,
+}
+
+
+def create_backend(name: str, model_path: str, imgsz: int = 640, device: str = 'cpu',
+                   cache_dir: str = 'model_cache') -> InferenceBackend:
+    """Load a backend by name; falls back to PyTorch if the ONNX path is unavailable.
+
+    INT8 model names ("yolov8n-int8") always use the ONNX backend.
+    """
+    backend_cls = BACKENDS.get(name)
+    if backend_cls is None:
+        raise ValueError(f"Unknown inference backend: {name} (choose from {', '.join(BACKENDS)})")
+    model_path, precision = split_model_name(model_path)
+    if precision == 'int8':
+        backend_cls = OnnxBackend
+    if backend_cls is OnnxBackend:
+        try:
+            return OnnxBackend(model_path, imgsz, device, cache_dir=cache_dir, precision=precision).load()
+        except Exception as e:
+            if not YOLO_AVAILABLE:
+                raise
+            logging.warning(f"[Backend] ONNX backend unavailable ({e}), using PyTorch")
+    return TorchBackend(model_path, imgsz, device).load()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Per-frame latency tracing - capture decode to WebSocket send.
+
+Every frame is identified by (camera id, capture sequence number), which
+all stages already carry. Stages mark timestamps on the frame's trace; when
+the frame is sent the trace is closed and the time between consecutive
+marks goes into rolling per-stage windows (p50/p95/p99).
+
+Exposed through the WebSocket ``get_metrics`` command and a Prometheus
+text endpoint (``start_metrics_server``).
+"""
+
+import http.server
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional
+
+import numpy as np
+
+# Trace marks in pipeline order
+MARKS = ('decode', 'detect_start', 'detect_end', 'overlay', 'encode', 'send')
+
+# Stage name -> (from mark, to mark)
+STAGES = OrderedDict([
+    ('capture_to_detect', ('decode', 'detect_start')),  # Waiting for the scheduler / detection
+    ('detect', ('detect_start', 'detect_end')),          # YOLO + motion + drawing
+    ('overlay', ('detect_end', 'overlay')),              # Handed to the processing thread
+    ('encode', ('overlay', 'encode')),                   # Waiting for broadcast tick + JPEG encode
+    ('send', ('encode', 'send')),                        # base64 + WebSocket send
+    ('glass_to_glass', ('decode', 'send')),
+])
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class LatencyTracker:
+    """Open frame traces plus rolling per-camera, per-stage latency windows."""
+
+    def __init__(self, window: int = 1000, max_open: int = 256):
+        self.window = window
+        self.max_open = max_open
+        self.lock = threading.Lock()
+        self._open: "OrderedDict[tuple, Dict[str, float]]" = OrderedDict()
+        self._samples: Dict[tuple, deque] = {}  # (camera, stage) -> seconds
+        self._sum: Dict[tuple, float] = {}
+        self._count: Dict[tuple, int] = {}
+
+        # Statistics
+        self.traces_completed = 0
+        self.traces_evicted = 0  # Never sent (superseded before broadcast)
+
+    def mark(self, camera_id: str, seq: int, mark: str, timestamp: Optional[float] = None, **marks: float):
+        """Record one mark (and optionally more as keyword arguments) on a frame's trace."""
+        if seq is None or seq < 0:
+            return
+        marks[mark] = timestamp if timestamp is not None else time.time()
+        key = (camera_id, seq)
+        with self.lock:
+            trace = self._open.get(key)
+            if trace is None:
+                trace = self._open[key] = {}
+                while len(self._open) > self.max_open:
+                    self._open.popitem(last=False)
+                    self.traces_evicted += 1
+            for name, value in marks.items():
+                # First mark wins: a frame re-sent on a later tick keeps its first timings
+                if value and name not in trace:
+                    trace[name] = value
+            if 'send' in trace:
+                del self._open[key]
+                self._complete(camera_id, trace)
+
+    def _complete(self, camera_id: str, trace: Dict[str, float]):
+        for stage, (start, end) in STAGES.items():
+            if start in trace and end in trace:
+                key = (camera_id, stage)
+                value = max(0.0, trace[end] - trace[start])
+                samples = self._samples.get(key)
+                if samples is None:
+                    samples = self._samples[key] = deque(maxlen=self.window)
+                samples.append(value)
+                self._sum[key] = self._sum.get(key, 0.0) + value
+                self._count[key] = self._count.get(key, 0) + 1
+        self.traces_completed += 1
+
+    def _quantiles(self, key: tuple) -> list:
+        values = np.fromiter(self._samples[key], dtype=np.float64)
+        return [float(v) for v in np.quantile(values, QUANTILES)]
+
+    def snapshot(self) -> dict:
+        """Per-camera stage percentiles in milliseconds (for get_metrics)."""
+        with self.lock:
+            cameras: Dict[str, dict] = {}
+            for (camera_id, stage), samples in self._samples.items():
+                if not samples:
+                    continue
+                p50, p95, p99 = self._quantiles((camera_id, stage))
+                cameras.setdefault(camera_id, {})[stage] = {
+                    'p50_ms': round(1000.0 * p50, 2),
+                    'p95_ms': round(1000.0 * p95, 2),
+                    'p99_ms': round(1000.0 * p99, 2),
+                    'samples': len(samples),
+                    'count': self._count[(camera_id, stage)],
+                }
+            return {
+                'stages': list(STAGES.keys()),
+                'cameras': cameras,
+                'traces_completed': self.traces_completed,
+                'traces_evicted': self.traces_evicted,
+                'traces_open': len(self._open),
+            }
+
+    def prometheus(self) -> str:
+        """Prometheus text exposition (summary per camera and stage)."""
+        lines = [
+            "# HELP riftech_stage_latency_seconds Frame latency per pipeline stage (rolling window quantiles)",
+            "# TYPE riftech_stage_latency_seconds summary",
+        ]
+        with self.lock:
+            for (camera_id, stage), samples in sorted(self._samples.items()):
+                if not samples:
+                    continue
+                labels = f'camera="{camera_id}",stage="{stage}"'
+                for q, value in zip(QUANTILES, self._quantiles((camera_id, stage))):
+                    lines.append(f'riftech_stage_latency_seconds{{{labels},quantile="{q}"}} {value:.6f}')
+                lines.append(f'riftech_stage_latency_seconds_sum{{{labels}}} {self._sum[(camera_id, stage)]:.6f}')
+                lines.append(f'riftech_stage_latency_seconds_count{{{labels}}} {self._count[(camera_id, stage)]}')
+            lines += [
+                "# HELP riftech_traces_completed_total Frames traced from decode to send",
+                "# TYPE riftech_traces_completed_total counter",
+                f"riftech_traces_completed_total {self.traces_completed}",
+                "# HELP riftech_traces_evicted_total Frame traces dropped before the frame was sent",
+                "# TYPE riftech_traces_evicted_total counter",
+                f"riftech_traces_evicted_total {self.traces_evicted}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self.lock:
+            self._open.clear()
+            self._samples.clear()
+            self._sum.clear()
+            self._count.clear()
+            self.traces_completed = 0
+            self.traces_evicted = 0
+
+
+# Global tracker shared by all pipeline stages
+latency_tracker = LatencyTracker()
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    """Serves GET /metrics in Prometheus text format."""
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404, "Not Found")
+            return
+        body = latency_tracker.prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scraped every few seconds, keep the log clean
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> Optional[http.server.ThreadingHTTPServer]:
+    """Serve /metrics on a daemon thread (port 0 disables it)."""
+    if not port:
+        return None
+    try:
+        server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logging.error(f"[Metrics] Could not bind port {port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logging.info(f"[Metrics] Prometheus endpoint at http://{host}:{port}/metrics")
+    return server
@@ -0,0 +1,844 @@
+#!/usr/bin/env python3
+"""Multiprocess pipeline - capture, detection and JPEG encoding in separate processes.
+
+Frames live in ``multiprocessing.shared_memory`` ring slots; only small
+descriptors (ring name, slot, sequence number) and detection results cross
+process queues. Every parent-side class mimics the thread it replaces
+(CaptureThread, DetectionThread), so CameraManager, InferenceScheduler,
+ProcessingThread and the broadcast task run unchanged on top of it.
+
+Enabled with ``Config.PIPELINE_MODE = "process"``.
+"""
+
+import logging
+import multiprocessing as mp
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from multiprocessing import shared_memory
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from frame_buffer import FrameRing, FrameRef
+
+# spawn, not fork: the parent already runs capture/torch threads
+_ctx = mp.get_context('spawn')
+
+# Header fields in the shared metadata block
+_LATEST, _NEXT_SEQ, _WRITTEN, _DROPPED = range(4)
+_HEADER = 4
+
+
+class SharedFrameRing:
+    """FrameRing whose slots and bookkeeping live in shared memory.
+
+    Same interface as FrameRing (acquire_write/commit, borrow/release, get,
+    latest_seq), usable from several processes. The writing process owns the
+    block (creates and unlinks it); other processes attach() by name.
+    Reallocating (frame size change) creates a new block and reports its
+    spec through on_allocate so readers can re-attach.
+    """
+
+    def __init__(self, slots: int = 4, shape: Optional[Tuple[int, ...]] = None, dtype=np.uint8,
+                 lock=None, on_allocate: Optional[Callable[[dict], None]] = None):
+        if slots < 2:
+            raise ValueError("SharedFrameRing needs at least 2 slots")
+        self.num_slots = slots
+        self.dtype = np.dtype(dtype)
+        self.lock = lock if lock is not None else threading.Lock()
+        self.on_allocate = on_allocate
+        self.owner = True
+
+        self.shape = None
+        self.shm = None
+        self._meta = None
+        self._timestamp = None
+        self._storage = None
+        self._generation = 0
+        self._writing = -1
+        self._retired = []  # Old blocks whose views may still be alive
+        self._deferred = deque()  # (slot, generation) released by FrameRef.__del__ while the lock was busy
+
+        if shape is not None:
+            self._allocate(shape)
+
+    @classmethod
+    def attach(cls, spec: dict, lock=None) -> 'SharedFrameRing':
+        """Attach to a ring created by another process."""
+        ring = cls(slots=spec['slots'], dtype=spec['dtype'], lock=lock)
+        ring.owner = False
+        ring._map(shared_memory.SharedMemory(name=spec['name']), tuple(spec['shape']))
+        return ring
+
+    @property
+    def spec(self) -> Optional[dict]:
+        """Everything another process needs to attach()."""
+        if self.shm is None:
+            return None
+        return {'name': self.shm.name, 'slots': self.num_slots, 'shape': self.shape, 'dtype': self.dtype.str}
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.shm.name if self.shm is not None else None
+
+    def _map(self, shm: shared_memory.SharedMemory, shape: Tuple[int, ...]):
+        meta_count = _HEADER + 2 * self.num_slots  # header + seq[] + refcount[]
+        meta_bytes = 8 * meta_count
+        ts_bytes = 8 * self.num_slots
+        data_offset = (meta_bytes + ts_bytes + 63) // 64 * 64
+
+        self.shm = shm
+        self.shape = tuple(shape)
+        self._meta = np.ndarray((meta_count,), dtype=np.int64, buffer=shm.buf)
+        self._timestamp = np.ndarray((self.num_slots,), dtype=np.float64, buffer=shm.buf, offset=meta_bytes)
+        self._storage = np.ndarray((self.num_slots,) + self.shape, dtype=self.dtype,
+                                   buffer=shm.buf, offset=data_offset)
+        self._generation += 1
+
+    @staticmethod
+    def _block_size(slots: int, shape: Tuple[int, ...], dtype: np.dtype) -> int:
+        meta_bytes = 8 * (_HEADER + 2 * slots) + 8 * slots
+        return (meta_bytes + 63) // 64 * 64 + slots * int(np.prod(shape)) * dtype.itemsize
+
+    def _allocate(self, shape: Tuple[int, ...]):
+        if not self.owner:
+            raise RuntimeError("Only the owning process can (re)allocate a SharedFrameRing")
+        if self.shm is not None:
+            self._retire()
+        size = self._block_size(self.num_slots, tuple(shape), self.dtype)
+        shm = shared_memory.SharedMemory(name=f"rtcam_{uuid.uuid4().hex[:12]}", create=True, size=size)
+        self._map(shm, shape)
+        self._meta[:] = 0
+        self._meta[_LATEST] = -1
+        self._writing = -1
+        if self.on_allocate:
+            self.on_allocate(self.spec)
+
+    def _retire(self):
+        """Drop the current block (readers keep their own mapping until they re-attach)."""
+        self._retired.append(self.shm)
+        self._meta = self._timestamp = self._storage = None
+        self.shm = None
+        self._close_retired()
+
+    def _close_retired(self):
+        still_mapped = []
+        for shm in self._retired:
+            try:
+                shm.close()
+                if self.owner:
+                    shm.unlink()
+            except BufferError:
+                still_mapped.append(shm)  # A FrameRef view is still alive
+            except FileNotFoundError:
+                pass
+        self._retired = still_mapped
+
+    def _seq_index(self, slot: int) -> int:
+        return _HEADER + slot
+
+    def _ref_index(self, slot: int) -> int:
+        return _HEADER + self.num_slots + slot
+
+    def acquire_write(self, shape: Optional[Tuple[int, ...]] = None) -> Optional[np.ndarray]:
+        """Reserve the next free slot for writing (owner only)."""
+        with self.lock:
+            self._drain_deferred()
+            if shape is not None and tuple(shape) != self.shape:
+                self._allocate(shape)
+            if self._storage is None:
+                return None
+
+            meta = self._meta
+            latest = int(meta[_LATEST])
+            for offset in range(1, self.num_slots + 1):
+                slot = (latest + offset) % self.num_slots
+                if slot != latest and meta[self._ref_index(slot)] == 0:
+                    self._writing = slot
+                    return self._storage[slot]
+
+            meta[_DROPPED] += 1
+            return None
+
+    def commit(self, timestamp: Optional[float] = None, seq: Optional[int] = None) -> int:
+        """Publish the reserved slot as the latest frame.
+
+        Args:
+            timestamp: Frame timestamp (default: now)
+            seq: Explicit sequence number (e.g. the capture sequence of a
+                 detection frame); must increase. Default: next counter value
+        """
+        with self.lock:
+            slot = self._writing
+            if slot < 0 or self._meta is None:
+                return -1
+            meta = self._meta
+            meta[_NEXT_SEQ] = seq if seq is not None else meta[_NEXT_SEQ] + 1
+            meta[self._seq_index(slot)] = meta[_NEXT_SEQ]
+            self._timestamp[slot] = timestamp if timestamp is not None else time.time()
+            meta[_LATEST] = slot
+            meta[_WRITTEN] += 1
+            self._writing = -1
+            return int(meta[_NEXT_SEQ])
+
+    def abort_write(self):
+        """Give back a slot reserved by acquire_write() without publishing it."""
+        with self.lock:
+            self._writing = -1
+
+    def put(self, frame: np.ndarray, timestamp: Optional[float] = None, seq: Optional[int] = None) -> int:
+        """Copy an externally owned frame into the ring (single copy)."""
+        slot = self.acquire_write(frame.shape)
+        if slot is None:
+            return -1
+        np.copyto(slot, frame)
+        return self.commit(timestamp, seq)
+
+    def borrow(self, min_seq: int = 0) -> Optional[FrameRef]:
+        """Borrow the latest frame as a read-only view (no copy)."""
+        with self.lock:
+            self._drain_deferred()
+            if self._meta is None:
+                return None
+            meta = self._meta
+            slot = int(meta[_LATEST])
+            if slot < 0 or meta[self._seq_index(slot)] < min_seq:
+                return None
+            meta[self._ref_index(slot)] += 1
+            view = self._storage[slot].view()
+            view.flags.writeable = False
+            return FrameRef(self, slot, self._generation, view,
+                            int(meta[self._seq_index(slot)]), float(self._timestamp[slot]))
+
+    def wait_borrow(self, after_seq: int, timeout: float = 1.0) -> Optional[FrameRef]:
+        """Poll until a frame newer than after_seq is published, then borrow it."""
+        deadline = time.time() + timeout
+        while True:
+            ref = self.borrow(min_seq=after_seq + 1)
+            if ref is not None or time.time() >= deadline:
+                return ref
+            time.sleep(0.002)
+
+    def slot_view(self, slot: int) -> np.ndarray:
+        """Read-only view of one slot for a reader that already holds it via a descriptor."""
+        view = self._storage[slot].view()
+        view.flags.writeable = False
+        return view
+
+    def _release_locked(self, slot: int, generation: int):
+        if generation == self._generation and self._meta is not None:
+            index = self._ref_index(slot)
+            if self._meta[index] > 0:
+                self._meta[index] -= 1
+
+    def _release(self, slot: int, generation: int):
+        with self.lock:
+            self._release_locked(slot, generation)
+
+    # Same non-blocking release as FrameRing (FrameRef.__del__ may run with the lock held)
+    _release_nowait = FrameRing._release_nowait
+    _drain_deferred = FrameRing._drain_deferred
+
+    def get(self) -> Optional[np.ndarray]:
+        """Get a private copy of the latest frame."""
+        ref = self.borrow()
+        if ref is None:
+            return None
+        with ref:
+            return ref.frame.copy()
+
+    @property
+    def latest_seq(self) -> int:
+        with self.lock:
+            if self._meta is None or self._meta[_LATEST] < 0:
+                return 0
+            return int(self._meta[self._seq_index(int(self._meta[_LATEST]))])
+
+    @property
+    def frames_written(self) -> int:
+        return int(self._meta[_WRITTEN]) if self._meta is not None else 0
+
+    @property
+    def frames_dropped(self) -> int:
+        return int(self._meta[_DROPPED]) if self._meta is not None else 0
+
+    def __len__(self) -> int:
+        return min(self.frames_written, self.num_slots)
+
+    def clear(self):
+        with self.lock:
+            if self._meta is not None:
+                self._meta[_LATEST] = -1
+
+    def close(self):
+        """Unmap the ring (and unlink it when this process owns it)."""
+        if self.shm is not None:
+            self._retire()
+
+
+# ---------------------------------------------------------------------------
+# Capture process
+# ---------------------------------------------------------------------------
+
+def _capture_main(camera_source, slots: int, lock, spec_queue, fps_value, stop_event):
+    """Child: run a regular CaptureThread whose ring lives in shared memory."""
+    from capture import CaptureThread
+
+    capture = CaptureThread(camera_source, buffer_size=slots)
+    capture.frame_ring = SharedFrameRing(slots=slots, lock=lock, on_allocate=spec_queue.put)
+    capture.start()
+    try:
+        while not stop_event.wait(0.5):
+            fps_value.value = capture.fps
+    finally:
+        capture.stop()
+        capture.frame_ring.close()
+
+
+class CaptureProcess:
+    """CaptureThread API backed by a capture child process.
+
+    Drop-in capture_factory for CameraManager: frame_ring is a SharedFrameRing
+    attached to the child's ring (an empty FrameRing until the first frame).
+    """
+
+    def __init__(self, camera_source, buffer_size: int = 3):
+        self.camera_source = camera_source
+        self.slots = max(2, buffer_size)
+        self.running = False
+        self.process = None
+        self._lock = _ctx.Lock()
+        self._spec_queue = _ctx.Queue()
+        self._fps = _ctx.Value('d', 0.0, lock=False)
+        self._stop_event = _ctx.Event()
+        self._ring = FrameRing(slots=self.slots)  # Placeholder until the child reports its ring
+        self._old_rings = []
+
+    @property
+    def frame_ring(self):
+        """Ring with the latest frames (re-attached when the child reallocates)."""
+        spec = None
+        try:
+            while True:
+                spec = self._spec_queue.get_nowait()
+        except queue.Empty:
+            pass
+        if spec is not None:
+            if isinstance(self._ring, SharedFrameRing):
+                self._old_rings.append(self._ring)
+            self._ring = SharedFrameRing.attach(spec, lock=self._lock)
+            logging.info(f"[CaptureProcess] Attached {self.camera_source}: {spec['name']} {spec['shape']}")
+        return self._ring
+
+    @property
+    def fps(self) -> float:
+        return self._fps.value
+
+    def start(self):
+        """Start capture process."""
+        self.running = True
+        self.process = _ctx.Process(
+            target=_capture_main,
+            args=(self.camera_source, self.slots, self._lock, self._spec_queue, self._fps, self._stop_event),
+            daemon=True
+        )
+        self.process.start()
+        logging.info(f"[CaptureProcess] Started pid {self.process.pid}")
+
+    def get_frame(self) -> Optional[np.ndarray]:
+        return self.frame_ring.get()
+
+    def borrow_frame(self, min_seq: int = 0) -> Optional[FrameRef]:
+        return self.frame_ring.borrow(min_seq)
+
+    def stop(self):
+        """Stop capture process."""
+        self.running = False
+        self._stop_event.set()
+        if self.process:
+            self.process.join(timeout=3.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        for ring in self._old_rings + [self._ring]:
+            if isinstance(ring, SharedFrameRing):
+                ring.close()
+        logging.info("[CaptureProcess] Stopped")
+
+
+# ---------------------------------------------------------------------------
+# Detection process
+# ---------------------------------------------------------------------------
+
+class _RemoteRef:
+    """Stands in for a parent FrameRef inside the detection child.
+
+    DetectionThread releases it when it is done with (or drops) the frame;
+    the parent then releases the real ring slot.
+    """
+
+    __slots__ = ('_out_queue', '_camera_id', '_token', '_released')
+
+    def __init__(self, out_queue, camera_id: str, token: int):
+        self._out_queue = out_queue
+        self._camera_id = camera_id
+        self._token = token
+        self._released = False
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self._out_queue.put(('done', self._camera_id, self._token))
+
+
+def _detection_main(primary_camera_id: str, slots: int, output_lock, in_queue, out_queue, control_queue, stop_event):
+    """Child: PersonDetector + MotionDetector (+ FaceScheduler) behind a regular DetectionThread."""
+    from config import Config
+    from detectors import PersonDetector, MotionDetector, DetectionThread, FaceRecognitionEngine, FaceScheduler
+
+    config = Config()
+    output_rings: Dict[str, SharedFrameRing] = {}
+    input_rings: Dict[str, SharedFrameRing] = {}
+
+    class _PublishingDetectionThread(DetectionThread):
+        """DetectionThread that also publishes results to the parent."""
+
+        def _store_results(self, camera_id, persons, motion, regions, frame, seq, timestamp,
+                           detect_start=0.0, detect_end=0.0, faces=None):
+            super()._store_results(camera_id, persons, motion, regions, frame, seq, timestamp,
+                                   detect_start, detect_end, faces)
+            ring = output_rings.get(camera_id)
+            if ring is None:
+                ring = SharedFrameRing(slots=slots, lock=output_lock,
+                                       on_allocate=lambda spec, cid=camera_id: out_queue.put(('ring', cid, spec)))
+                output_rings[camera_id] = ring
+            # Output ring sequence == capture sequence of the detected frame
+            ring.put(frame, timestamp=timestamp, seq=seq if seq > ring.latest_seq else None)
+            out_queue.put(('result', camera_id, seq, timestamp, persons, faces or {}, motion, regions,
+                           detect_start, detect_end, self.get_stats()))
+
+    person_detector = PersonDetector(config)
+    thread = _PublishingDetectionThread(person_detector, MotionDetector(config), primary_camera_id=primary_camera_id)
+    # Face recognition per tracked person, next to detection as in thread mode
+    performance = getattr(config, 'performance', None)
+    thread.face_scheduler = FaceScheduler(FaceRecognitionEngine(config),
+                                          interval=getattr(performance, 'face_interval', 60))
+    thread.face_scheduler.start()
+    thread.start()
+
+    def apply_control():
+        try:
+            while True:
+                command, value = control_queue.get_nowait()
+                if command == 'confidence':
+                    person_detector.set_confidence(value)
+                elif command == 'model':
+                    person_detector.change_model(value)
+                elif command == 'skeleton':
+                    thread.draw_skeleton = value
+                elif command == 'faces':
+                    thread.recognize_faces = value
+                elif command == 'reload_faces':
+                    thread.face_scheduler.engine.reload_faces()
+        except queue.Empty:
+            pass
+
+    try:
+        while not stop_event.is_set():
+            apply_control()
+            try:
+                camera_id, spec, slot, seq, timestamp, token = in_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            ring = input_rings.get(camera_id)
+            if ring is None or ring.name != spec['name']:
+                if ring is not None:
+                    ring.close()
+                ring = SharedFrameRing.attach(spec)
+                input_rings[camera_id] = ring
+
+            thread.submit(ring.slot_view(slot), seq=seq, timestamp=timestamp,
+                          ref=_RemoteRef(out_queue, camera_id, token), camera_id=camera_id)
+    finally:
+        thread.stop()
+        thread.join(timeout=2.0)
+        for ring in list(input_rings.values()) + list(output_rings.values()):
+            ring.close()
+
+
+class _DetectorControl:
+    """person_detector stand-in: forwards settings to the detection child."""
+
+    def __init__(self, control_queue):
+        self._control_queue = control_queue
+
+    def set_confidence(self, conf: float):
+        self._control_queue.put(('confidence', conf))
+
+    def change_model(self, model_name: str):
+        self._control_queue.put(('model', model_name))
+
+
+class DetectionProcess:
+    """DetectionThread API backed by a detection child process.
+
+    submit() keeps the borrowed FrameRef in the parent and sends only a
+    descriptor; the slot is released when the child reports it is done.
+    Frames that are not in a SharedFrameRing (thread-mode capture) are
+    staged into a per-camera shared ring first (one copy).
+    """
+
+    def __init__(self, primary_camera_id: str = 'main', slots: int = 4):
+        self.primary_camera_id = primary_camera_id
+        self.slots = slots
+        self.output_lock = _ctx.Lock()  # Shared with readers of the output rings (JpegEncoderProcess)
+        self._in_queue = _ctx.Queue(maxsize=2)
+        self._out_queue = _ctx.Queue()
+        self._control_queue = _ctx.Queue()
+        self._stop_event = _ctx.Event()
+        self.process = None
+        self.person_detector = _DetectorControl(self._control_queue)
+        self._draw_skeleton = False
+        self._recognize_faces = False
+
+        self._lock = threading.Lock()
+        self._pending: Dict[int, Optional[FrameRef]] = {}
+        self._next_token = 0
+        self._staging: Dict[str, SharedFrameRing] = {}
+        self._output_rings: Dict[str, SharedFrameRing] = {}
+        self._old_rings = []
+        self._results: Dict[str, dict] = {}
+        self._child_stats = {}
+        self._ring_listeners = []
+        self._receiver = None
+        self._running = False
+
+        # Statistics
+        self.frames_submitted = 0
+        self.frames_dropped = 0  # Input queue full when submitted
+
+    @property
+    def draw_skeleton(self) -> bool:
+        return self._draw_skeleton
+
+    @draw_skeleton.setter
+    def draw_skeleton(self, enabled: bool):
+        self._draw_skeleton = enabled
+        self._control_queue.put(('skeleton', enabled))
+
+    @property
+    def recognize_faces(self) -> bool:
+        return self._recognize_faces
+
+    @recognize_faces.setter
+    def recognize_faces(self, enabled: bool):
+        self._recognize_faces = enabled
+        self._control_queue.put(('faces', enabled))
+
+    def reload_faces(self):
+        """Reload the trusted faces of the child's face engine."""
+        self._control_queue.put(('reload_faces', None))
+
+    def add_ring_listener(self, callback: Callable[[str, dict], None]):
+        """Call callback(camera_id, spec) whenever a camera's output ring is (re)allocated."""
+        self._ring_listeners.append(callback)
+        for camera_id, ring in self._output_rings.items():
+            callback(camera_id, ring.spec)
+
+    def start(self):
+        """Start detection process and result receiver."""
+        self._running = True
+        self.process = _ctx.Process(
+            target=_detection_main,
+            args=(self.primary_camera_id, self.slots, self.output_lock, self._in_queue,
+                  self._out_queue, self._control_queue, self._stop_event),
+            daemon=True
+        )
+        self.process.start()
+        self._receiver = threading.Thread(target=self._receive_loop, daemon=True)
+        self._receiver.start()
+        logging.info(f"[DetectionProcess] Started pid {self.process.pid}")
+
+    def _receive_loop(self):
+        while self._running:
+            try:
+                message = self._out_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+
+            kind, camera_id = message[0], message[1]
+            if kind == 'done':
+                with self._lock:
+                    ref = self._pending.pop(message[2], None)
+                if ref is not None:
+                    ref.release()
+            elif kind == 'result':
+                _, _, seq, timestamp, persons, faces, motion, regions, detect_start, detect_end, stats = message
+                with self._lock:
+                    self._results[camera_id] = {
+                        'persons': persons,
+                        'faces': faces,
+                        'motion': motion,
+                        'motion_regions': regions,
+                        'frame_seq': seq,
+                        'frame_timestamp': timestamp,
+                        'detect_start': detect_start,
+                        'detect_end': detect_end
+                    }
+                    self._child_stats = stats
+            elif kind == 'ring':
+                spec = message[2]
+                with self._lock:
+                    old = self._output_rings.get(camera_id)
+                    if old is not None:
+                        self._old_rings.append(old)
+                    self._output_rings[camera_id] = SharedFrameRing.attach(spec, lock=self.output_lock)
+                for callback in self._ring_listeners:
+                    callback(camera_id, spec)
+
+    def stop(self):
+        """Stop detection process."""
+        self._stop_event.set()
+        if self.process:
+            self.process.join(timeout=5.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        self._running = False
+        if self._receiver:
+            self._receiver.join(timeout=1.0)
+        with self._lock:
+            for ref in self._pending.values():
+                if ref is not None:
+                    ref.release()
+            self._pending.clear()
+        for ring in list(self._staging.values()) + list(self._output_rings.values()) + self._old_rings:
+            ring.close()
+        logging.info("[DetectionProcess] Stopped")
+
+    def is_idle(self) -> bool:
+        """True when no frame is queued or being detected in the child."""
+        with self._lock:
+            return not self._pending
+
+    def submit(self, frame: np.ndarray, seq: int = -1, timestamp: Optional[float] = None, ref=None,
+               camera_id: Optional[str] = None):
+        """Queue a frame descriptor for detection (same arguments as DetectionThread.submit)."""
+        if frame is None:
+            if ref is not None:
+                ref.release()
+            return
+        camera_id = camera_id or self.primary_camera_id
+        timestamp = timestamp if timestamp is not None else time.time()
+
+        # Frames outside shared memory are staged once into a shared ring
+        if ref is None or not isinstance(ref._ring, SharedFrameRing):
+            staging = self._staging.get(camera_id)
+            if staging is None:
+                staging = self._staging[camera_id] = SharedFrameRing(slots=self.slots)
+            staging.put(frame, timestamp)
+            if ref is not None:
+                ref.release()
+            ref = staging.borrow()
+            if ref is None:
+                return
+
+        with self._lock:
+            token = self._next_token
+            self._next_token += 1
+            self._pending[token] = ref
+        try:
+            self._in_queue.put_nowait((camera_id, ref._ring.spec, ref._slot, seq, timestamp, token))
+            self.frames_submitted += 1
+        except queue.Full:
+            with self._lock:
+                self._pending.pop(token, None)
+            ref.release()
+            self.frames_dropped += 1
+
+    def get_result_seq(self, camera_id: Optional[str] = None) -> int:
+        with self._lock:
+            result = self._results.get(camera_id or self.primary_camera_id)
+            return result['frame_seq'] if result else -1
+
+    def get_results(self, camera_id: Optional[str] = None) -> dict:
+        """Latest results; the frame is a private copy from the shared output ring."""
+        camera_id = camera_id or self.primary_camera_id
+        with self._lock:
+            result = self._results.get(camera_id)
+            ring = self._output_rings.get(camera_id)
+        if not result:
+            return {
+                'persons': [],
+                'faces': {},
+                'motion': False,
+                'motion_regions': [],
+                'frame': None,
+                'frame_seq': -1,
+                'frame_timestamp': 0.0,
+                'detect_start': 0.0,
+                'detect_end': 0.0
+            }
+        return {
+            'persons': result['persons'],  # Never modified once stored
+            'faces': dict(result['faces']),
+            'motion': result['motion'],
+            'motion_regions': list(result['motion_regions']) if result['motion_regions'] else [],
+            'frame': ring.get() if ring is not None else None,
+            'frame_seq': result['frame_seq'],
+            'frame_timestamp': result['frame_timestamp'],
+            'detect_start': result['detect_start'],
+            'detect_end': result['detect_end']
+        }
+
+    def get_faces(self, camera_id: Optional[str] = None) -> dict:
+        """Recognized faces of the camera's current persons, by track id (latest result)."""
+        with self._lock:
+            result = self._results.get(camera_id or self.primary_camera_id)
+            return dict(result['faces']) if result else {}
+
+    def get_output_ring(self, camera_id: Optional[str] = None) -> Optional[SharedFrameRing]:
+        with self._lock:
+            return self._output_rings.get(camera_id or self.primary_camera_id)
+
+    def get_stats(self) -> dict:
+        """Child detection counters plus parent-side submission counters."""
+        with self._lock:
+            stats = dict(self._child_stats) if self._child_stats else {
+                'submitted': 0, 'processed': 0, 'dropped': 0,
+                'queue_wait_avg_ms': 0.0, 'queue_wait_last_ms': 0.0,
+            }
+        stats['dropped'] = stats.get('dropped', 0) + self.frames_dropped
+        stats['mode'] = 'process'
+        return stats
+
+
+# ---------------------------------------------------------------------------
+# JPEG encoder process
+# ---------------------------------------------------------------------------
+
+def _encoder_main(lock, control_queue, out_queue, stop_event, quality: int):
+    """Child: JPEG-encode the newest detection frame of every subscribed camera."""
+    import cv2
+
+    rings: Dict[str, SharedFrameRing] = {}
+    subscribed = set()
+    last_seq: Dict[str, int] = {}
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+
+    while not stop_event.is_set():
+        try:
+            while True:
+                command, camera_id, value = control_queue.get_nowait()
+                if command == 'ring':
+                    if camera_id in rings:
+                        rings[camera_id].close()
+                    rings[camera_id] = SharedFrameRing.attach(value, lock=lock)
+                    last_seq[camera_id] = 0
+                elif command == 'cameras':
+                    subscribed = set(value)
+        except queue.Empty:
+            pass
+
+        encoded = 0
+        for camera_id in subscribed:
+            ring = rings.get(camera_id)
+            if ring is None:
+                continue
+            ref = ring.borrow(min_seq=last_seq.get(camera_id, 0) + 1)
+            if ref is None:
+                continue
+            with ref:
+                success, buffer = cv2.imencode('.jpg', ref.frame, params)
+                seq, timestamp = ref.seq, ref.timestamp
+            last_seq[camera_id] = seq
+            if success:
+                try:
+                    out_queue.put_nowait((camera_id, seq, timestamp, buffer.tobytes(), time.time()))
+                    encoded += 1
+                except queue.Full:
+                    pass
+        if not encoded:
+            time.sleep(0.005)
+
+    for ring in rings.values():
+        ring.close()
+
+
+class JpegEncoderProcess:
+    """Encodes detection frames to JPEG in a child process.
+
+    Reads the DetectionProcess output rings directly; the broadcast task
+    fetches ready JPEG bytes with get_jpeg() and only base64s and sends them.
+    """
+
+    def __init__(self, lock, quality: int = 65):
+        self.quality = quality
+        self._lock = lock
+        self._control_queue = _ctx.Queue()
+        self._out_queue = _ctx.Queue(maxsize=8)
+        self._stop_event = _ctx.Event()
+        self.process = None
+        self._latest: Dict[str, Tuple[bytes, int, float, float]] = {}
+        self._cameras = set()
+        self._receiver = None
+        self._running = False
+        self.frames_encoded = 0
+
+    def start(self):
+        """Start encoder process."""
+        self._running = True
+        self.process = _ctx.Process(
+            target=_encoder_main,
+            args=(self._lock, self._control_queue, self._out_queue, self._stop_event, self.quality),
+            daemon=True
+        )
+        self.process.start()
+        self._receiver = threading.Thread(target=self._receive_loop, daemon=True)
+        self._receiver.start()
+        logging.info(f"[Encoder] Process started pid {self.process.pid}")
+
+    def _receive_loop(self):
+        while self._running:
+            try:
+                camera_id, seq, timestamp, data, encoded_at = self._out_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                break
+            self._latest[camera_id] = (data, seq, timestamp, encoded_at)
+            self.frames_encoded += 1
+
+    def add_ring(self, camera_id: str, spec: dict):
+        """Register (or replace) the output ring of a camera."""
+        self._control_queue.put(('ring', camera_id, spec))
+
+    def set_cameras(self, camera_ids):
+        """Only encode cameras that somebody is watching."""
+        camera_ids = set(camera_ids)
+        if camera_ids != self._cameras:
+            self._cameras = camera_ids
+            self._control_queue.put(('cameras', None, sorted(camera_ids)))
+
+    def get_jpeg(self, camera_id: str, after_seq: int = -1) -> Optional[Tuple[bytes, int, float, float]]:
+        """Latest (jpeg bytes, capture seq, capture timestamp, encode time) newer than after_seq."""
+        entry = self._latest.get(camera_id)
+        if entry is None or entry[1] <= after_seq:
+            return None
+        return entry
+
+    def stop(self):
+        """Stop encoder process."""
+        self._stop_event.set()
+        if self.process:
+            self.process.join(timeout=3.0)
+            if self.process.is_alive():
+                self.process.terminate()
+        self._running = False
+        if self._receiver:
+            self._receiver.join(timeout=1.0)
+        logging.info("[Encoder] Process stopped")
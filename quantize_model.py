@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""INT8 quantization of the YOLO person model, calibrated on our own frames.
+
+Takes the images in snapshots/ and alerts/, holds out every Nth one, calibrates
+ONNX Runtime static quantization (QDQ, per-channel INT8 weights) on the rest,
+and writes the model next to the cached FP32 export as
+``model_cache/<model>-<hash>-<imgsz>-int8.onnx``. Select it in the web UI /
+AVAILABLE_MODELS as "yolov8n-int8".
+
+Afterwards both models run on the held-out frames and a report compares
+speed and how well INT8 agrees with FP32 (person boxes matched at IoU 0.5;
+FP32 is the reference since our frames have no labels).
+
+Usage:
+    python3 quantize_model.py --model yolov8n.pt
+    python3 quantize_model.py --model yolov8s.pt --imgsz 640 320 --dirs snapshots alerts recordings/frames
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from typing import List
+
+import cv2
+import numpy as np
+
+from config import Config
+from boxes import box_iou
+from inference_backends import INT8_SUFFIX, OnnxBackend, ONNXRUNTIME_AVAILABLE
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def collect_images(dirs: List[str]) -> List[str]:
+    """All images under the given directories, sorted (stable train/held-out split)."""
+    paths = []
+    for directory in dirs:
+        for root, _, files in os.walk(directory):
+            paths += [os.path.join(root, f) for f in files if f.lower().endswith(IMAGE_EXTENSIONS)]
+    return sorted(paths)
+
+
+def split_holdout(paths: List[str], every: int) -> tuple:
+    """Every Nth image is held out for the report, the rest calibrates."""
+    if every <= 1 or len(paths) < 2:
+        return paths, []
+    holdout = paths[::every]
+    calibration = [p for i, p in enumerate(paths) if i % every]
+    return calibration, holdout
+
+
+def preprocess(image: np.ndarray, imgsz: int) -> np.ndarray:
+    """Same letterbox + blob as OnnxBackend.predict for a single frame."""
+    padded, _, _ = OnnxBackend.letterbox(image, imgsz, rect=True)
+    return cv2.dnn.blobFromImage(padded, scalefactor=1.0 / 255.0, swapRB=True)
+
+
+def head_nodes(model_path: str, include_convs: bool = False) -> List[str]:
+    """Nodes of the last model layer (YOLOv8 Detect head) to keep in FP32.
+
+    The head's decode ops (DFL softmax, anchor math, concat, sigmoid) mix
+    box coordinates (hundreds of pixels) and class scores (0-1) in one
+    tensor, which INT8 cannot represent well. Its convolutions quantize
+    fine and are most of the head's cost, so by default only they stay INT8.
+    """
+    import onnx
+
+    model = onnx.load(model_path, load_external_data=False)
+    layer = re.compile(r'^/model\.(\d+)/')
+    indices = [int(m.group(1)) for m in (layer.match(n.name) for n in model.graph.node) if m]
+    if not indices:
+        return []
+    head = f"/model.{max(indices)}/"
+    return [n.name for n in model.graph.node
+            if n.name.startswith(head) and (include_convs or n.op_type != 'Conv')]
+
+
+def quantize(fp32_path: str, int8_path: str, images: List[str], imgsz: int,
+             method: str = 'minmax', fp32_head: bool = False):
+    from onnxruntime.quantization import (CalibrationDataReader, CalibrationMethod, QuantFormat,
+                                          QuantType, quantize_static)
+
+    class FrameReader(CalibrationDataReader):
+        def __init__(self, input_name: str):
+            self.input_name = input_name
+            self.paths = iter(images)
+
+        def get_next(self):
+            for path in self.paths:
+                image = cv2.imread(path)
+                if image is not None:
+                    return {self.input_name: preprocess(image, imgsz)}
+            return None
+
+    import onnxruntime as ort
+    input_name = ort.InferenceSession(fp32_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+
+    workdir = tempfile.mkdtemp(prefix='quantize_')
+    try:
+        # Shape inference + graph cleanup recommended before static quantization
+        source = os.path.join(workdir, 'prep.onnx')
+        try:
+            from onnxruntime.quantization import quant_pre_process
+            quant_pre_process(fp32_path, source, skip_symbolic_shape=True)
+        except Exception as e:
+            print(f"[Quantize] Pre-processing skipped: {e}")
+            source = fp32_path
+
+        methods = {'minmax': CalibrationMethod.MinMax, 'entropy': CalibrationMethod.Entropy,
+                   'percentile': CalibrationMethod.Percentile}
+        target = os.path.join(workdir, 'int8.onnx')
+        quantize_static(source, target, FrameReader(input_name),
+                        quant_format=QuantFormat.QDQ,
+                        per_channel=True,
+                        activation_type=QuantType.QUInt8,
+                        weight_type=QuantType.QInt8,
+                        nodes_to_exclude=head_nodes(source, include_convs=fp32_head),
+                        calibrate_method=methods[method])
+        shutil.move(target, int8_path)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def compare(fp32: OnnxBackend, int8: OnnxBackend, images: List[str], imgsz: int, conf: float) -> dict:
+    """Run both models on the held-out frames: latency and INT8-vs-FP32 agreement."""
+    times = {'fp32': [], 'int8': []}
+    matched = fp32_total = int8_total = 0
+    ious, conf_deltas = [], []
+
+    # Session creation and first-run allocations stay out of the timings
+    warmup = next((img for img in map(cv2.imread, images[:3]) if img is not None), None)
+    if warmup is not None:
+        for backend in (fp32, int8):
+            for _ in range(3):
+                backend(warmup, conf=conf, classes=[0], imgsz=imgsz)
+
+    for path in images:
+        image = cv2.imread(path)
+        if image is None:
+            continue
+        boxes = {}
+        for name, backend in (('fp32', fp32), ('int8', int8)):
+            t0 = time.perf_counter()
+            boxes[name] = backend(image, conf=conf, classes=[0], imgsz=imgsz)[0].boxes
+            times[name].append(time.perf_counter() - t0)
+
+        ref, test = boxes['fp32'], boxes['int8']
+        fp32_total += len(ref)
+        int8_total += len(test)
+        if len(ref) and len(test):
+            # Greedy one-to-one matching by IoU
+            iou = box_iou(ref.xyxy, test.xyxy)
+            while iou.size and iou.max() >= 0.5:
+                i, j = np.unravel_index(iou.argmax(), iou.shape)
+                matched += 1
+                ious.append(float(iou[i, j]))
+                conf_deltas.append(abs(float(ref.conf[i]) - float(test.conf[j])))
+                iou[i, :] = 0
+                iou[:, j] = 0
+
+    precision = matched / int8_total if int8_total else 1.0
+    recall = matched / fp32_total if fp32_total else 1.0
+    ms = {name: 1000.0 * np.array(values) for name, values in times.items()}
+    return {
+        'frames': len(ms['fp32']),
+        'fp32_ms_mean': float(ms['fp32'].mean()) if len(ms['fp32']) else 0.0,
+        'int8_ms_mean': float(ms['int8'].mean()) if len(ms['int8']) else 0.0,
+        'fp32_ms_p50': float(np.median(ms['fp32'])) if len(ms['fp32']) else 0.0,
+        'int8_ms_p50': float(np.median(ms['int8'])) if len(ms['int8']) else 0.0,
+        'fp32_persons': fp32_total,
+        'int8_persons': int8_total,
+        'precision_vs_fp32': precision,
+        'recall_vs_fp32': recall,
+        'f1_vs_fp32': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        'mean_iou': float(np.mean(ious)) if ious else 0.0,
+        'mean_conf_delta': float(np.mean(conf_deltas)) if conf_deltas else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='INT8 quantization calibrated on snapshots/ and alerts/')
+    parser.add_argument('--model', type=str, default='yolov8n.pt')
+    parser.add_argument('--imgsz', type=int, nargs='+', default=[640, Config.DETECTION_REGION_SIZE],
+                        help='Input sizes to quantize (full frames and motion region crops)')
+    parser.add_argument('--dirs', nargs='+', default=['snapshots', 'alerts'])
+    parser.add_argument('--holdout-every', type=int, default=5, help='Every Nth image is held out for the report')
+    parser.add_argument('--max-calibration', type=int, default=300)
+    parser.add_argument('--method', choices=['minmax', 'entropy', 'percentile'], default='minmax')
+    parser.add_argument('--fp32-head', action='store_true',
+                        help='Keep the whole Detect head in FP32 (slower, closest to FP32 boxes)')
+    parser.add_argument('--conf', type=float, default=Config.YOLO_CONFIDENCE)
+    parser.add_argument('--cache-dir', type=str, default=Config.MODEL_CACHE_DIR)
+    args = parser.parse_args()
+
+    if not ONNXRUNTIME_AVAILABLE:
+        print("onnxruntime is not installed (pip install onnxruntime onnx)")
+        return 1
+
+    images = collect_images(args.dirs)
+    calibration, holdout = split_holdout(images, args.holdout_every)
+    calibration = calibration[:args.max_calibration]
+    print(f"{len(images)} images in {', '.join(args.dirs)}: {len(calibration)} calibration, {len(holdout)} held out")
+    if not calibration:
+        print("No calibration images - save some snapshots / alerts first")
+        return 1
+    if len(calibration) < 20:
+        print("WARNING: fewer than 20 calibration images, INT8 ranges may not cover day/night scenes")
+
+    reports = {}
+    for imgsz in args.imgsz:
+        fp32 = OnnxBackend(args.model, imgsz, cache_dir=args.cache_dir)
+        fp32_path = fp32.export(imgsz)
+        int8_path = fp32.cache_path(imgsz, 'int8')
+
+        print(f"\n[{imgsz}] Calibrating {os.path.basename(int8_path)} ({args.method})...")
+        t0 = time.time()
+        quantize(fp32_path, int8_path, calibration, imgsz, args.method, args.fp32_head)
+        print(f"[{imgsz}] Quantized in {time.time() - t0:.1f}s")
+
+        int8 = OnnxBackend(args.model, imgsz, cache_dir=args.cache_dir, precision='int8')
+        report = compare(fp32, int8, holdout, imgsz, args.conf) if holdout else {}
+        report.update({
+            'model': args.model,
+            'imgsz': imgsz,
+            'calibration_images': len(calibration),
+            'method': args.method,
+            'fp32_mb': os.path.getsize(fp32_path) / 1e6,
+            'int8_mb': os.path.getsize(int8_path) / 1e6,
+        })
+        with open(int8_path[:-len('.onnx')] + '.report.json', 'w') as f:
+            json.dump(report, f, indent=2)
+        reports[imgsz] = report
+
+    print(f"\n{args.model}: INT8 vs FP32 on {len(holdout)} held-out frames (conf {args.conf})\n")
+    print(f"{'imgsz':>6}{'FP32 ms':>9}{'INT8 ms':>9}{'speedup':>9}{'MB':>12}{'persons':>10}"
+          f"{'recall':>8}{'prec.':>7}{'IoU':>6}")
+    for imgsz, r in reports.items():
+        if not r.get('frames'):
+            print(f"{imgsz:>6}  (no held-out frames)")
+            continue
+        speedup = r['fp32_ms_mean'] / r['int8_ms_mean'] if r['int8_ms_mean'] else 0.0
+        print(f"{imgsz:>6}{r['fp32_ms_mean']:>9.1f}{r['int8_ms_mean']:>9.1f}{speedup:>8.2f}x"
+              f"{r['fp32_mb']:>6.1f}/{r['int8_mb']:<5.1f}{r['fp32_persons']:>5}/{r['int8_persons']:<4}"
+              f"{r['recall_vs_fp32']:>8.2f}{r['precision_vs_fp32']:>7.2f}{r['mean_iou']:>6.2f}")
+    print(f"\nSelect it as model '{os.path.splitext(os.path.basename(args.model))[0]}{INT8_SUFFIX}' "
+          f"(AVAILABLE_MODELS / web UI)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Persistent person tracking - stable ids across frames (SORT / ByteTrack style).
+
+Each track is a constant-velocity Kalman filter on the box center, area and
+aspect ratio (SORT), stepped by the frame timestamps so uneven detection
+rates (motion gate, scheduler budgets) are handled. Detections are matched
+to the predicted tracks by IoU in two stages (ByteTrack): confident
+detections first, then the weaker ones against the tracks still unmatched,
+so a person whose score dips for a frame keeps their id. Detections that
+still overlap nothing (fast movers, young tracks without a velocity yet)
+are matched by center distance relative to the box height. Unmatched
+detections start new tracks; a track without a detection for max_age
+seconds is dropped.
+
+Between YOLO runs (DETECTION_INTERVAL > 1) predict() moves the tracks along
+their velocity, so boxes keep following people on frames YOLO skips.
+
+Every track carries a ``cache`` dict for per-person state (pose landmarks,
+face identity, alert bookkeeping) that is dropped together with the track;
+cached objects with a close() method (a person's MediaPipe Pose) are closed.
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from boxes import box_iou
+
+# Constant-velocity model: state (cx, cy, area, ratio, vcx, vcy, varea), velocities per second
+_H = np.eye(4, 7)
+_R = np.diag([1.0, 1.0, 10.0, 10.0])
+_Q = np.diag([1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 0.01])  # Per 0.1 s step (SORT's noise at ~10 FPS)
+
+
+def _xyxy_to_z(bbox) -> np.ndarray:
+    x1, y1, x2, y2 = bbox
+    w, h = max(1.0, x2 - x1), max(1.0, y2 - y1)
+    return np.array([x1 + w / 2.0, y1 + h / 2.0, w * h, w / h])
+
+
+def _x_to_xyxy(x: np.ndarray) -> np.ndarray:
+    area, ratio = max(1.0, x[2]), max(1e-3, x[3])
+    w = np.sqrt(area * ratio)
+    h = area / w
+    return np.array([x[0] - w / 2.0, x[1] - h / 2.0, x[0] + w / 2.0, x[1] + h / 2.0])
+
+
+class Track:
+    """One tracked person: Kalman state, hit counters and a per-person cache."""
+
+    def __init__(self, track_id: int, bbox, confidence: float, now: float):
+        self.track_id = track_id
+        self.confidence = confidence
+        self.hits = 1
+        self.first_seen = now
+        self.last_update = now
+        self.cache: dict = {}
+
+        self.x = np.zeros(7)
+        self.x[:4] = _xyxy_to_z(bbox)
+        self.P = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+        self._time = now
+
+    @property
+    def bbox(self) -> np.ndarray:
+        """Current (filtered or predicted) box, xyxy float."""
+        return _x_to_xyxy(self.x)
+
+    @property
+    def velocity(self) -> np.ndarray:
+        """Center velocity in pixels per second."""
+        return self.x[4:6].copy()
+
+    def predict(self, now: float) -> np.ndarray:
+        """Move the state to ``now`` and return the predicted box."""
+        dt = now - self._time
+        if dt > 0:
+            F = np.eye(7)
+            F[0, 4] = F[1, 5] = F[2, 6] = dt
+            if self.x[2] + self.x[6] * dt <= 0:
+                self.x[6] = 0.0
+            self.x = F @ self.x
+            self.P = F @ self.P @ F.T + _Q * (dt / 0.1)
+            self._time = now
+        return self.bbox
+
+    def update(self, bbox, confidence: float, now: float):
+        """Correct the (already predicted) state with a detection."""
+        self.predict(now)
+        z = _xyxy_to_z(bbox)
+        S = _H @ self.P @ _H.T + _R
+        K = self.P @ _H.T @ np.linalg.inv(S)
+        self.x = self.x + K @ (z - _H @ self.x)
+        self.P = (np.eye(7) - K @ _H) @ self.P
+        self.confidence = confidence
+        self.hits += 1
+        self.last_update = now
+
+    def close(self):
+        """Release cached resources (anything with a close() method)."""
+        for value in self.cache.values():
+            close = getattr(value, 'close', None)
+            if callable(close):
+                try:
+                    close()
+                except Exception:
+                    pass
+        self.cache.clear()
+
+
+def _center_similarity(boxes_a: np.ndarray, boxes_b: np.ndarray, gate: float) -> np.ndarray:
+    """1 at the same center, 0 at gate x box height apart (negative beyond)."""
+    centers_a = (boxes_a[:, None, :2] + boxes_a[:, None, 2:]) / 2.0
+    centers_b = (boxes_b[None, :, :2] + boxes_b[None, :, 2:]) / 2.0
+    distance = np.linalg.norm(centers_a - centers_b, axis=2)
+    height = np.maximum(boxes_b[None, :, 3] - boxes_b[None, :, 1], 1.0)
+    return 1.0 - distance / (gate * height)
+
+
+def _greedy_match(similarity: np.ndarray, threshold: float) -> list:
+    """(row, col) pairs, most similar first, each row/col used once."""
+    pairs = []
+    if similarity.size == 0:
+        return pairs
+    similarity = similarity.copy()
+    while True:
+        i, j = np.unravel_index(similarity.argmax(), similarity.shape)
+        if similarity[i, j] < threshold:
+            return pairs
+        pairs.append((int(i), int(j)))
+        similarity[i, :] = -np.inf
+        similarity[:, j] = -np.inf
+
+
+class PersonTracker:
+    """Assigns stable track ids to person boxes of one camera.
+
+    Matching is greedy by IoU (highest first) rather than Hungarian; with
+    the handful of people a camera sees the two agree and it needs no
+    extra dependency.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_age: float = 1.0, min_hits: int = 2,
+                 high_conf: float = 0.5, distance_gate: float = 0.5):
+        self.iou_threshold = iou_threshold
+        self.distance_gate = distance_gate  # Fallback match: centers within this x box height
+        self.max_age = max_age      # Seconds without a detection before a track is dropped
+        self.min_hits = min_hits    # Detections before a track is predicted on skipped frames
+        self.high_conf = high_conf  # Detections below this only continue existing tracks first
+        self.tracks: List[Track] = []
+        self._next_id = 1
+
+        # Statistics
+        self.updates = 0
+        self.predictions = 0
+        self.tracks_created = 0
+        self.update_time = 0.0
+
+    def _expire(self, now: float):
+        alive = []
+        for track in self.tracks:
+            if now - track.last_update <= self.max_age:
+                alive.append(track)
+            else:
+                track.close()
+        self.tracks = alive
+
+    def update(self, boxes: np.ndarray, scores: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """Match one frame's detections to the tracks.
+
+        Args:
+            boxes: (N,4) xyxy person boxes
+            scores: (N,) confidences
+            now: Frame timestamp (default: time.time())
+
+        Returns:
+            (N,) int track id for every detection, in input order
+        """
+        t0 = time.perf_counter()
+        now = time.time() if now is None else now
+        boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        scores = np.asarray(scores, dtype=np.float64).reshape(-1)
+        ids = np.full(len(boxes), -1, dtype=np.int64)
+
+        self._expire(now)
+        predicted = np.array([t.predict(now) for t in self.tracks]).reshape(-1, 4)
+        free = list(range(len(self.tracks)))
+
+        def assign(stage: np.ndarray, by_distance: bool = False):
+            if not len(stage) or not free:
+                return
+            if by_distance:
+                pairs = _greedy_match(_center_similarity(boxes[stage], predicted[free], self.distance_gate), 1e-6)
+            else:
+                pairs = _greedy_match(box_iou(boxes[stage], predicted[free]), self.iou_threshold)
+            for d, t in pairs:
+                track = self.tracks[free[t]]
+                track.update(boxes[stage[d]], float(scores[stage[d]]), now)
+                ids[stage[d]] = track.track_id
+            for t in sorted((t for _, t in pairs), reverse=True):
+                del free[t]
+
+        # Confident detections first, then the weaker ones against the tracks left
+        # over (IoU), then anything still unmatched by center distance
+        assign(np.flatnonzero(scores >= self.high_conf))
+        assign(np.flatnonzero(scores < self.high_conf))
+        assign(np.flatnonzero(ids < 0), by_distance=True)
+
+        for d in np.flatnonzero(ids < 0):
+            track = Track(self._next_id, boxes[d], float(scores[d]), now)
+            self._next_id += 1
+            self.tracks.append(track)
+            self.tracks_created += 1
+            ids[d] = track.track_id
+
+        self.updates += 1
+        self.update_time += time.perf_counter() - t0
+        return ids
+
+    def predict(self, now: Optional[float] = None) -> List[Track]:
+        """Confirmed tracks moved to ``now`` (for frames without detection)."""
+        now = time.time() if now is None else now
+        self._expire(now)
+        self.predictions += 1
+        confirmed = [t for t in self.tracks if t.hits >= self.min_hits]
+        for track in confirmed:
+            track.predict(now)
+        return confirmed
+
+    def has_tracks(self) -> bool:
+        return any(t.hits >= self.min_hits for t in self.tracks)
+
+    def get(self, track_id: int) -> Optional[Track]:
+        for track in self.tracks:
+            if track.track_id == track_id:
+                return track
+        return None
+
+    def cache(self, track_id: int) -> Optional[dict]:
+        """Per-track cache dict, or None if the track is gone."""
+        track = self.get(track_id)
+        return track.cache if track is not None else None
+
+    def reset(self):
+        for track in self.tracks:
+            track.close()
+        self.tracks = []
+
+    def get_status(self) -> Dict[str, float]:
+        return {
+            'tracks': len(self.tracks),
+            'tracks_created': self.tracks_created,
+            'updates': self.updates,
+            'predictions': self.predictions,
+            'update_ms_avg': 1000.0 * self.update_time / max(1, self.updates),
+        }
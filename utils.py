@@ -279,6 +279,20 @@ class MultiZoneManager:
                 return True
         return False
     
+    def region_in_zones(self, x1: int, y1: int, x2: int, y2: int) -> bool:
+        """Check if a rectangle (e.g. a motion region) overlaps any zone."""
+        cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+        probes = ((cx, cy), (cx, y2), (x1, y1), (x2, y1), (x1, y2), (x2, y2))
+        for zone in self.zones:
+            if not zone.is_complete:
+                continue
+            if any(zone.contains_point(x, y) for x, y in probes):
+                return True
+            # Zone entirely inside the rectangle
+            if any(x1 <= px <= x2 and y1 <= py <= y2 for px, py in zone.points):
+                return True
+        return False
+    
     def get_zone_count(self) -> int:
         """Get number of complete zones."""
         return sum(1 for z in self.zones if z.is_complete)
@@ -20,8 +20,84 @@ import time
 from datetime import datetime
 from typing import Optional, Tuple, List
 
-# YOLO imports
-from ultralytics import YOLO
+# Inference goes through the backends; YOLO_AVAILABLE = ultralytics is installed
+from inference_backends import create_backend, ONNXRUNTIME_AVAILABLE, YOLO_AVAILABLE
+
+
+def _readinto_exact(stream, view: memoryview) -> bool:
+    """Fill view completely from stream (pipe reads may return short counts).
+    
+    Returns:
+        False on EOF before the buffer is full
+    """
+    filled = 0
+    total = len(view)
+    while filled < total:
+        n = stream.readinto(view[filled:])
+        if not n:
+            return False
+        filled += n
+    return True
+
+
+def read_rawvideo_frames(stream, width: int, height: int, pool_size: int = 4):
+    """Yield BGR frames from an ffmpeg ``-f rawvideo -pix_fmt bgr24`` stream.
+    
+    Every frame is read with readinto() straight into one of ``pool_size``
+    preallocated buffers, so there is no per-frame allocation and no JPEG
+    encode/decode. Buffers are reused round-robin: a yielded frame stays
+    valid until ``pool_size`` more frames have been read.
+    
+    Args:
+        stream: Binary file-like object supporting readinto()
+        width: Frame width (must match ffmpeg scale filter)
+        height: Frame height (must match ffmpeg scale filter)
+        pool_size: Number of preallocated frame buffers
+    """
+    pool = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(max(1, pool_size))]
+    views = [memoryview(buf).cast('B') for buf in pool]
+    index = 0
+    
+    while True:
+        if not _readinto_exact(stream, views[index]):
+            return
+        yield pool[index]
+        index = (index + 1) % len(pool)
+
+
+def read_mjpeg_frames(stream, chunk_size: int = 1024):
+    """Yield BGR frames from an ffmpeg ``-f image2pipe -vcodec mjpeg`` stream.
+    
+    Legacy fallback path: scans for the JPEG end marker and decodes each
+    frame with cv2.imdecode.
+    """
+    frame_bytes = b''
+    
+    while True:
+        data = stream.read(chunk_size)
+        
+        if not data:
+            return
+        
+        frame_bytes += data
+        
+        # Check if we have a complete frame (JPEG end marker)
+        # JPEG ends with FF D9
+        if b'\xff\xd9' in frame_bytes:
+            # Extract frame
+            end_marker = frame_bytes.find(b'\xff\xd9') + 2
+            jpeg_data = frame_bytes[:end_marker]
+            frame_bytes = frame_bytes[end_marker:]
+            
+            # Decode JPEG to numpy array
+            frame = cv2.imdecode(
+                np.frombuffer(jpeg_data, dtype=np.uint8),
+                cv2.IMREAD_COLOR
+            )
+            
+            if frame is not None:
+                yield frame
+
 
 class V380FFmpegProcessor:
     """Processor untuk kamera V380 split frame menggunakan FFmpeg pipeline."""
@@ -33,7 +109,12 @@ class V380FFmpegProcessor:
         detect_fps: int = 5,
         device: str = "cpu",
         conf_threshold: float = 0.25,
-        iou_threshold: float = 0.45
+        iou_threshold: float = 0.45,
+        output_format: str = "rawvideo",
+        output_width: int = 640,
+        output_height: int = 360,
+        backend: str = "torch",
+        model_cache_dir: str = "model_cache"
     ):
         """
         Inisialisasi processor.
@@ -45,18 +126,31 @@ class V380FFmpegProcessor:
             device: Device untuk inference (cpu/cuda)
             conf_threshold: Threshold confidence
             iou_threshold: Threshold IoU untuk NMS
+            output_format: "rawvideo" (bgr24, tanpa JPEG) atau "mjpeg" (fallback lama)
+            output_width: Lebar frame output FFmpeg
+            output_height: Tinggi frame output FFmpeg (genap, dibagi 2 untuk split)
+            backend: Backend inference "torch" (ultralytics) atau "onnx" (ONNX Runtime, model di-cache)
+            model_cache_dir: Folder cache model ONNX hasil export
         """
+        if not YOLO_AVAILABLE and not (backend == "onnx" and ONNXRUNTIME_AVAILABLE):
+            raise ImportError("ultralytics (or onnxruntime with backend='onnx') is required for V380FFmpegProcessor")
+        
+        if output_format not in ("rawvideo", "mjpeg"):
+            raise ValueError(f"Unsupported output_format: {output_format}")
+        
         self.rtsp_url = rtsp_url
         self.detect_fps = detect_fps
         self.device = device
         self.conf_threshold = conf_threshold
         self.iou_threshold = iou_threshold
+        self.output_format = output_format
+        self.output_width = output_width
+        self.output_height = output_height
         
-        # Initialize YOLO model
-        print(f"[INFO] Loading YOLO model from {model_path}...")
-        self.model = YOLO(model_path)
-        self.model.to(device)
-        print(f"[INFO] Model loaded on {device}")
+        # Initialize YOLO model (backend dapat diganti, lihat inference_backends.py)
+        print(f"[INFO] Loading YOLO model from {model_path} ({backend})...")
+        self.model = create_backend(backend, model_path, device=device, cache_dir=model_cache_dir)
+        print(f"[INFO] Model loaded on {device} ({self.model.name} backend)")
         
         # Frame dimensions (default 1280x720 untuk V380)
         self.frame_width = 1280
@@ -79,17 +173,25 @@ class V380FFmpegProcessor:
         self.frame_count = 0
         self.detection_count = 0
         
-    def build_ffmpeg_command(self, output_width: int = 640, output_height: int = 360) -> List[str]:
+    def build_ffmpeg_command(
+        self,
+        output_width: int = 640,
+        output_height: int = 360,
+        output_format: Optional[str] = None
+    ) -> List[str]:
         """
         Build FFmpeg command untuk capture RTSP dan crop frame menjadi 2 bagian.
         
         Args:
             output_width: Lebar output per split
             output_height: Tinggi output per split
+            output_format: "rawvideo" atau "mjpeg" (default: self.output_format)
             
         Returns:
             List of FFmpeg command arguments
         """
+        output_format = output_format or self.output_format
+        
         cmd = [
             'ffmpeg',
             # Input settings
@@ -99,15 +201,33 @@ class V380FFmpegProcessor:
             
             # Video filters
             '-vf', f'fps={self.detect_fps},scale={output_width}:{output_height}',
-            
-            # Output settings - MJPEG stream ke stdout
-            '-f', 'image2pipe',
-            '-vcodec', 'mjpeg',
-            '-q:v', '2',  # Quality 2 (good quality)
-            '-'
         ]
+        
+        if output_format == "rawvideo":
+            # Output settings - raw BGR frames ukuran tetap ke stdout
+            cmd += [
+                '-f', 'rawvideo',
+                '-pix_fmt', 'bgr24',
+                '-'
+            ]
+        else:
+            # Output settings - MJPEG stream ke stdout
+            cmd += [
+                '-f', 'image2pipe',
+                '-vcodec', 'mjpeg',
+                '-q:v', '2',  # Quality 2 (good quality)
+                '-'
+            ]
         return cmd
     
+    def _frame_pool_size(self) -> int:
+        """Raw frame buffers needed so queued frames are never overwritten.
+        
+        Frames (and their top/bottom views) can sit in frame_queue, in the
+        detection thread, in detection_queue and with one consumer at once.
+        """
+        return self.frame_queue.maxsize + self.detection_queue.maxsize + 3
+    
     def capture_frames(self):
         """Capture frames dari FFmpeg dan masukkan ke queue."""
         print("[CAPTURE] Starting capture thread...")
@@ -115,8 +235,8 @@ class V380FFmpegProcessor:
         try:
             # Start FFmpeg
             cmd = self.build_ffmpeg_command(
-                output_width=640,  # Width per split (setengah dari 1280 untuk efisiensi)
-                output_height=360  # Height per split (setengah dari 720)
+                output_width=self.output_width,  # Width per split (setengah dari 1280 untuk efisiensi)
+                output_height=self.output_height  # Height per split (setengah dari 720)
             )
             
             print(f"[CAPTURE] FFmpeg command: {' '.join(cmd)}")
@@ -129,59 +249,47 @@ class V380FFmpegProcessor:
                 bufsize=10**8
             )
             
+            if self.output_format == "rawvideo":
+                frames = read_rawvideo_frames(
+                    self.ffmpeg_process.stdout,
+                    self.output_width,
+                    self.output_height,
+                    pool_size=self._frame_pool_size()
+                )
+            else:
+                frames = read_mjpeg_frames(self.ffmpeg_process.stdout)
+            
             fps_counter = 0
             fps_time = time.time()
             
-            # Read frame bytes from FFmpeg
-            frame_bytes = b''
-            frame_size = 0
-            
             while self.running:
                 try:
-                    # Read data from FFmpeg
-                    data = self.ffmpeg_process.stdout.read(1024)
+                    frame = next(frames, None)
                     
-                    if not data:
+                    if frame is None:
                         print("[CAPTURE] No more data from FFmpeg")
                         break
-                        
-                    frame_bytes += data
                     
-                    # Check if we have a complete frame (JPEG end marker)
-                    # JPEG ends with FF D9
-                    if b'\xff\xd9' in frame_bytes:
-                        # Extract frame
-                        end_marker = frame_bytes.find(b'\xff\xd9') + 2
-                        jpeg_data = frame_bytes[:end_marker]
-                        frame_bytes = frame_bytes[end_marker:]
+                    # Split frame into top and bottom
+                    frame_height = frame.shape[0]
+                    split_point = frame_height // 2
+                    
+                    top_frame = frame[:split_point, :, :]
+                    bottom_frame = frame[split_point:, :, :]
+                    
+                    # Put into queue
+                    try:
+                        self.frame_queue.put({
+                            'timestamp': time.time(),
+                            'top': top_frame,
+                            'bottom': bottom_frame
+                        }, block=False)
                         
-                        # Decode JPEG to numpy array
-                        frame = cv2.imdecode(
-                            np.frombuffer(jpeg_data, dtype=np.uint8),
-                            cv2.IMREAD_COLOR
-                        )
+                        fps_counter += 1
                         
-                        if frame is not None:
-                            # Split frame into top and bottom
-                            frame_height = frame.shape[0]
-                            split_point = frame_height // 2
-                            
-                            top_frame = frame[:split_point, :, :]
-                            bottom_frame = frame[split_point:, :, :]
-                            
-                            # Put into queue
-                            try:
-                                self.frame_queue.put({
-                                    'timestamp': time.time(),
-                                    'top': top_frame,
-                                    'bottom': bottom_frame
-                                }, block=False)
-                                
-                                fps_counter += 1
-                                
-                            except queue.Full:
-                                # Skip frame if queue is full
-                                pass
+                    except queue.Full:
+                        # Skip frame if queue is full
+                        pass
                     
                     # Calculate FPS
                     if time.time() - fps_time >= 1.0:
@@ -222,17 +330,10 @@ class V380FFmpegProcessor:
                 top_frame = frame_data['top']
                 bottom_frame = frame_data['bottom']
                 
-                # Process top frame (kamera fixed)
-                top_results = self.model(
-                    top_frame,
-                    conf=self.conf_threshold,
-                    iou=self.iou_threshold,
-                    verbose=False
-                )
-                
-                # Process bottom frame (kamera PTZ)
-                bottom_results = self.model(
-                    bottom_frame,
+                # Top (kamera fixed) dan bottom (kamera PTZ) dalam satu batch:
+                # satu forward pass untuk kedua lensa
+                top_results, bottom_results = self.model(
+                    [top_frame, bottom_frame],
                     conf=self.conf_threshold,
                     iou=self.iou_threshold,
                     verbose=False
@@ -241,8 +342,8 @@ class V380FFmpegProcessor:
                 # Put results into queue
                 result_data = {
                     'timestamp': timestamp,
-                    'top_detections': top_results[0],
-                    'bottom_detections': bottom_results[0],
+                    'top_detections': top_results,
+                    'bottom_detections': bottom_results,
                     'top_frame': top_frame,
                     'bottom_frame': bottom_frame
                 }
@@ -330,7 +431,7 @@ class V380FFmpegProcessor:
         
         Args:
             frame: OpenCV image
-            results: YOLO results
+            results: Detections dari inference backend
             camera_name: Name of camera for label
             
         Returns:
@@ -352,11 +453,9 @@ class V380FFmpegProcessor:
         if results is None or len(results.boxes) == 0:
             return frame_copy
         
-        for box in results.boxes:
-            # Get coordinates
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-            conf = box.conf[0].cpu().numpy()
-            cls = int(box.cls[0].cpu().numpy())
+        boxes = results.boxes
+        for (x1, y1, x2, y2), conf, cls in zip(boxes.xyxy, boxes.conf, boxes.cls):
+            cls = int(cls)
             
             # Draw box
             cv2.rectangle(
@@ -368,7 +467,7 @@ class V380FFmpegProcessor:
             )
             
             # Draw label
-            label = f"{self.model.names[cls]} {conf:.2f}"
+            label = f"{self.model.names.get(cls, cls)} {conf:.2f}"
             cv2.putText(
                 frame_copy,
                 label,
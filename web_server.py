@@ -14,7 +14,6 @@ import sys
 import queue
 import requests
 from typing import Set, Dict, Optional, Tuple
-from collections import deque
 
 # Setup logging
 logging.basicConfig(
@@ -26,7 +25,7 @@ logging.basicConfig(
 # Import modules with error handling
 try:
     from config import Config, AlertType
-    from detectors import PersonDetector, FaceRecognitionEngine, MotionDetector, DetectionThread
+    from detectors import PersonDetector, FaceRecognitionEngine, MotionDetector, DetectionThread, FaceScheduler
     from database import DatabaseManager
     from utils import MultiZoneManager
     MODULES_AVAILABLE = True
@@ -62,132 +61,193 @@ except ImportError:
 
 # Import V380 FFmpeg Pipeline
 try:
-    from v380_ffmpeg_pipeline import V380FFmpegProcessor
-    V380_AVAILABLE = True
+    from v380_ffmpeg_pipeline import V380FFmpegProcessor, YOLO_AVAILABLE as V380_AVAILABLE
+    if not V380_AVAILABLE:
+        logging.warning("[Import] V380 FFmpeg Pipeline not available: ultralytics not installed")
 except ImportError as e:
     logging.warning(f"[Import] V380 FFmpeg Pipeline not available: {e}")
     V380_AVAILABLE = False
 
+from capture import CaptureThread
+from process_pipeline import CaptureProcess, DetectionProcess, JpegEncoderProcess
+from metrics import latency_tracker, start_metrics_server
 
-class FrameBuffer:
-    """Thread-safe frame buffer pool."""
+
+class CameraManager:
+    """One CaptureThread per configured camera."""
     
-    def __init__(self, max_size: int = 3):
-        self.buffer = deque(maxlen=max_size)
-        self.lock = threading.Lock()
-        self.max_size = max_size
+    def __init__(self, camera_definitions: list, buffer_size: int = 4, capture_factory=None):
+        capture_factory = capture_factory or CaptureThread
+        self.definitions = {cam['id']: cam for cam in camera_definitions}
+        self.captures: Dict[str, CaptureThread] = {
+            cam['id']: capture_factory(cam['source'], buffer_size=buffer_size)
+            for cam in camera_definitions
+        }
+        self.primary_id = camera_definitions[0]['id'] if camera_definitions else None
     
-    def put(self, frame: np.ndarray):
-        """Add frame to buffer (non-blocking)."""
-        with self.lock:
-            if len(self.buffer) >= self.max_size:
-                # Remove oldest frame
-                self.buffer.popleft()
-            self.buffer.append(frame.copy())
+    @property
+    def camera_ids(self) -> list:
+        return list(self.captures.keys())
     
-    def get(self) -> Optional[np.ndarray]:
-        """Get latest frame (non-blocking)."""
-        with self.lock:
-            if self.buffer:
-                return self.buffer[-1].copy()
-        return None
+    @property
+    def primary(self) -> Optional[CaptureThread]:
+        return self.captures.get(self.primary_id)
     
-    def get_all(self) -> list:
-        """Get all frames from buffer."""
-        with self.lock:
-            return [frame.copy() for frame in self.buffer]
+    def get(self, camera_id: Optional[str] = None) -> Optional[CaptureThread]:
+        return self.captures.get(camera_id or self.primary_id)
     
-    def clear(self):
-        """Clear buffer."""
-        with self.lock:
-            self.buffer.clear()
+    def start(self):
+        """Start all capture threads."""
+        for camera_id, capture in self.captures.items():
+            capture.start()
+            logging.info(f"[Cameras] Started {camera_id}: {self.definitions[camera_id]['name']}")
+    
+    def get_status(self) -> list:
+        """Per-camera status for the status broadcast."""
+        return [{
+            'id': camera_id,
+            'name': self.definitions[camera_id]['name'],
+            'available': capture.frame_ring.latest_seq > 0,
+            'capture_fps': round(capture.fps, 1),
+            'detect_fps': self.definitions[camera_id]['detect_fps'],
+        } for camera_id, capture in self.captures.items()]
+    
+    def stop(self):
+        """Stop all capture threads."""
+        for capture in self.captures.values():
+            capture.stop()
 
 
-class CaptureThread:
-    """Separate thread for frame capture from camera."""
+class InferenceScheduler:
+    """Feeds frames from every camera into one shared DetectionThread.
+    
+    Each camera has its own detection FPS budget. Whenever the detection
+    thread is idle, the camera with the earliest due time that has a new
+    frame is served (earliest-deadline-first), so an overloaded box degrades
+    evenly across cameras instead of starving one of them. Frames are
+    borrowed from the capture rings (no copy) and tagged with their capture
+    sequence number and timestamp.
+    """
     
-    def __init__(self, camera_source, buffer_size: int = 3):
-        self.camera_source = camera_source
-        self.frame_buffer = FrameBuffer(max_size=buffer_size)
+    def __init__(self, camera_manager: CameraManager, detection_thread):
+        self.camera_manager = camera_manager
+        self.detection_thread = detection_thread
         self.running = False
-        self.cap = None
         self.thread = None
-        self.fps = 0
-        self.frame_count = 0
-        self.last_time = time.time()
+        
+        now = time.time()
+        self._budgets = {cid: cam['detect_fps'] for cid, cam in camera_manager.definitions.items()}
+        self._next_due = {cid: now for cid in camera_manager.camera_ids}
+        self.last_seq = {cid: 0 for cid in camera_manager.camera_ids}
+        
+        # Statistics
+        self.frames_pumped = {cid: 0 for cid in camera_manager.camera_ids}
+        self.frames_skipped = {cid: 0 for cid in camera_manager.camera_ids}  # Not sent because of the FPS budget
+        self._rate_count = {cid: 0 for cid in camera_manager.camera_ids}
+        self._rate_time = now
+        self.achieved_fps = {cid: 0.0 for cid in camera_manager.camera_ids}
     
     def start(self):
-        """Start capture thread."""
+        """Start scheduler thread."""
         self.running = True
-        self.thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.thread = threading.Thread(target=self._schedule_loop, daemon=True)
         self.thread.start()
-        logging.info(f"[Capture] Thread started")
+        logging.info(f"[Scheduler] Thread started for {len(self._next_due)} camera(s): {self._budgets}")
     
-    def _capture_loop(self):
-        """Capture loop - runs continuously."""
-        try:
-            self.cap = cv2.VideoCapture(self.camera_source)
-            
-            if not self.cap.isOpened():
-                logging.error(f"[Capture] Failed to open camera: {self.camera_source}")
-                return
-            
-            # Optimize RTSP settings
-            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 3)  # Buffer size
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
-            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-            
-            logging.info(f"[Capture] Connected to camera: {self.camera_source}")
-            
-            while self.running:
-                try:
-                    ret, frame = self.cap.read()
-                    
-                    if ret and frame is not None and isinstance(frame, np.ndarray):
-                        # Force BGR conversion
-                        if len(frame.shape) == 2 or frame.shape[2] == 1:
-                            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-                        
-                        # Validate frame
-                        if frame.shape[0] > 0 and frame.shape[1] > 0:
-                            self.frame_buffer.put(frame)
-                            
-                            # Calculate FPS
-                            self.frame_count += 1
-                            elapsed = time.time() - self.last_time
-                            if elapsed >= 2.0:
-                                self.fps = self.frame_count / elapsed
-                                self.frame_count = 0
-                                self.last_time = time.time()
-                                logging.info(f"[Capture] FPS: {self.fps:.1f}, Buffer: {len(self.frame_buffer.buffer)}")
-                    else:
-                        logging.warning(f"[Capture] Failed to read frame")
-                        time.sleep(0.01)
+    def set_detect_fps(self, camera_id: str, fps: float):
+        """Change a camera's detection FPS budget."""
+        if camera_id in self._budgets:
+            self._budgets[camera_id] = fps
+    
+    def _pick_camera(self, now: float) -> Tuple[Optional[str], float]:
+        """Camera to serve next, or the time to wait until one is due."""
+        best_id = None
+        best_due = None
+        for camera_id, capture in self.camera_manager.captures.items():
+            if self._budgets.get(camera_id, 0) <= 0:
+                continue
+            if capture.frame_ring.latest_seq <= self.last_seq[camera_id]:
+                continue
+            due = self._next_due[camera_id]
+            if best_due is None or due < best_due:
+                best_id, best_due = camera_id, due
+        if best_id is None:
+            return None, 0.005
+        if best_due > now:
+            return None, min(best_due - now, 0.05)
+        return best_id, 0.0
+    
+    def _schedule_loop(self):
+        """Scheduler loop - one submission whenever detection is idle."""
+        while self.running:
+            try:
+                if not self.detection_thread.is_idle():
+                    time.sleep(0.002)
+                    continue
                 
-                except Exception as e:
-                    logging.error(f"[Capture] Error: {e}")
-                    time.sleep(0.01)
-        
-        except Exception as e:
-            logging.error(f"[Capture] Fatal error: {e}")
-        finally:
-            if self.cap:
-                self.cap.release()
+                now = time.time()
+                camera_id, wait = self._pick_camera(now)
+                if camera_id is None:
+                    time.sleep(wait)
+                    continue
+                
+                capture = self.camera_manager.captures[camera_id]
+                ref = capture.frame_ring.borrow(min_seq=self.last_seq[camera_id] + 1)
+                if ref is None:
+                    continue
+                
+                last = self.last_seq[camera_id]
+                if last > 0 and ref.seq > last + 1:
+                    self.frames_skipped[camera_id] += ref.seq - last - 1
+                self.last_seq[camera_id] = ref.seq
+                
+                self.detection_thread.submit(ref.frame, seq=ref.seq, timestamp=ref.timestamp,
+                                             ref=ref, camera_id=camera_id)
+                self.frames_pumped[camera_id] += 1
+                self._rate_count[camera_id] += 1
+                
+                # Hold the camera's detection FPS budget
+                interval = 1.0 / self._budgets[camera_id]
+                self._next_due[camera_id] = max(self._next_due[camera_id] + interval, now)
+                
+                elapsed = now - self._rate_time
+                if elapsed >= 2.0:
+                    for cid in self._rate_count:
+                        self.achieved_fps[cid] = self._rate_count[cid] / elapsed
+                        self._rate_count[cid] = 0
+                    self._rate_time = now
+            
+            except Exception as e:
+                logging.error(f"[Scheduler] Error: {e}")
+                time.sleep(0.01)
     
-    def get_frame(self) -> Optional[np.ndarray]:
-        """Get latest frame (non-blocking)."""
-        return self.frame_buffer.get()
+    def get_stats(self, camera_id: Optional[str] = None) -> dict:
+        """Scheduler and detection queue statistics (one camera or totals)."""
+        if camera_id is not None:
+            capture = self.camera_manager.get(camera_id)
+            return {
+                'camera_id': camera_id,
+                'detect_fps': self._budgets.get(camera_id, 0),
+                'achieved_fps': round(self.achieved_fps.get(camera_id, 0.0), 2),
+                'capture_seq': capture.frame_ring.latest_seq if capture else 0,
+                'pumped': self.frames_pumped.get(camera_id, 0),
+                'skipped': self.frames_skipped.get(camera_id, 0),
+            }
+        
+        stats = {
+            'cameras': [self.get_stats(cid) for cid in self.camera_manager.camera_ids],
+            'pumped': sum(self.frames_pumped.values()),
+            'skipped': sum(self.frames_skipped.values()),
+        }
+        stats.update(self.detection_thread.get_stats())
+        return stats
     
     def stop(self):
-        """Stop capture thread."""
+        """Stop scheduler thread."""
         self.running = False
         if self.thread:
             self.thread.join(timeout=2.0)
-        if self.cap:
-            self.cap.release()
-        logging.info("[Capture] Thread stopped")
+        logging.info("[Scheduler] Thread stopped")
 
 
 class ProcessingThread:
@@ -197,10 +257,17 @@ class ProcessingThread:
         self.system = system
         self.running = False
         self.thread = None
-        self.processed_frame = None
+        # Per camera: (frame, capture sequence number, capture timestamp)
+        self.processed: Dict[str, Tuple[np.ndarray, int, float]] = {}
         self.lock = threading.Lock()
         self.frame_skip = 0  # Skip frames to reduce load
     
+    @property
+    def processed_frame(self) -> Optional[np.ndarray]:
+        """Processed frame of the primary camera."""
+        entry = self.processed.get(self.system.primary_camera_id)
+        return entry[0] if entry else None
+    
     def start(self):
         """Start processing thread."""
         self.running = True
@@ -208,6 +275,45 @@ class ProcessingThread:
         self.thread.start()
         logging.info("[Processing] Thread started")
     
+    def _forward_detection_frame(self, camera_id: str) -> bool:
+        """Store the latest detection frame of one camera if it is new."""
+        detection_thread = self.system.detection_thread
+        current = self.processed.get(camera_id)
+        current_seq = current[1] if current else -1
+        
+        # Only fetch (and copy) results when detection finished a new frame
+        if detection_thread.get_result_seq(camera_id) == current_seq:
+            return False
+        
+        results = detection_thread.get_results(camera_id)
+        frame = results.get('frame') if results else None
+        
+        # Validate frame is valid
+        if frame is None or frame.size == 0 or len(frame.shape) != 3:
+            return False
+        
+        # Just forward the detection frame AS-IS
+        # It already has YOLO bounding boxes, skeleton, etc.
+        # (get_results() already returns a private copy)
+        with self.lock:
+            self.processed[camera_id] = (frame, results.get('frame_seq', -1), results.get('frame_timestamp', 0.0))
+        
+        latency_tracker.mark(camera_id, results.get('frame_seq', -1), 'overlay',
+                             decode=results.get('frame_timestamp', 0.0),
+                             detect_start=results.get('detect_start', 0.0),
+                             detect_end=results.get('detect_end', 0.0))
+        
+        # Log occasionally
+        if hasattr(self, '_frame_count'):
+            self._frame_count += 1
+        else:
+            self._frame_count = 1
+        if self._frame_count % 30 == 0:
+            persons = results.get('persons', [])
+            logging.info(f"[Processing] Forwarding {camera_id} detection frame #{results.get('frame_seq')} "
+                         f"with {len(persons)} persons (frame #{self._frame_count})")
+        return True
+    
     def _process_loop(self):
         """Processing loop - ULTRA-SIMPLIFIED: Just forward detection frames."""
         while self.running:
@@ -215,35 +321,21 @@ class ProcessingThread:
                 # Simply check if detection thread has a frame, and use it
                 # No complex fallback logic that could cause issues
                 if self.system.detection_thread:
-                    results = self.system.detection_thread.get_results()
-                    if results and results.get('frame') is not None:
-                        frame = results.get('frame')
-                        
-                        # Validate frame is valid
-                        if frame is not None and frame.size > 0 and len(frame.shape) == 3:
-                            # Just forward the detection frame AS-IS
-                            # It already has YOLO bounding boxes, skeleton, etc.
-                            with self.lock:
-                                self.processed_frame = frame.copy()
-                            
-                            # Log occasionally
-                            if hasattr(self, '_frame_count'):
-                                self._frame_count += 1
-                            else:
-                                self._frame_count = 1
-                            if self._frame_count % 30 == 0:
-                                persons = results.get('persons', [])
-                                logging.info(f"[Processing] Forwarding detection frame with {len(persons)} persons (frame #{self._frame_count})")
+                    for camera_id in self.system.camera_ids:
+                        self._forward_detection_frame(camera_id)
                 
                 # Only if NO detection frame, try to get one from raw capture
                 # But DON'T process it here - just store it as-is
                 else:
-                    raw_frame = self.system.capture_thread.get_frame()
-                    if raw_frame is not None and raw_frame.size > 0:
-                        # Just store the raw frame, don't do any processing
-                        # _process_frame_internal will handle everything
-                        with self.lock:
-                            self.processed_frame = raw_frame.copy()
+                    for camera_id in self.system.camera_ids:
+                        capture = self.system.camera_manager.get(camera_id)
+                        raw_frame = capture.get_frame() if capture else None
+                        if raw_frame is not None and raw_frame.size > 0:
+                            # Just store the raw frame, don't do any processing
+                            # _process_frame_internal will handle everything
+                            # (get_frame() already returns a private copy)
+                            with self.lock:
+                                self.processed[camera_id] = (raw_frame, capture.frame_ring.latest_seq, time.time())
                 
                 # Small sleep to prevent CPU overload
                 time.sleep(0.01)
@@ -252,12 +344,18 @@ class ProcessingThread:
                 logging.error(f"[Processing] Error: {e}")
                 time.sleep(0.01)
     
-    def get_processed_frame(self) -> Optional[np.ndarray]:
+    def get_processed_frame(self, camera_id: Optional[str] = None) -> Optional[np.ndarray]:
         """Get processed frame (non-blocking)."""
+        frame, _, _ = self.get_processed_frame_info(camera_id)
+        return frame
+    
+    def get_processed_frame_info(self, camera_id: Optional[str] = None) -> Tuple[Optional[np.ndarray], int, float]:
+        """Get processed frame with its capture sequence number and timestamp."""
         with self.lock:
-            if self.processed_frame is not None:
-                return self.processed_frame.copy()
-        return None
+            entry = self.processed.get(camera_id or self.system.primary_camera_id)
+            if entry is not None:
+                return entry[0].copy(), entry[1], entry[2]
+        return None, -1, 0.0
     
     def stop(self):
         """Stop processing thread."""
@@ -282,8 +380,12 @@ class SecurityWebSystem:
         self.detection_thread = None
         
         # Multi-threading components
-        self.capture_thread = None
+        self.camera_manager = None
+        self.capture_thread = None  # Primary camera (kept for single-camera callers)
+        self.inference_scheduler = None
         self.processing_thread = None
+        self.jpeg_encoder = None  # Process mode only
+        self.pipeline_mode = 'thread'
         
         # V380 FFmpeg Pipeline (Frigate-style)
         self.v380_processor = None
@@ -330,6 +432,7 @@ class SecurityWebSystem:
         if not self.demo_mode:
             try:
                 self.config = Config()
+                self.pipeline_mode = Config.PIPELINE_MODE
                 self.db = DatabaseManager(self.config)
                 self.zone_manager = MultiZoneManager()
                 
@@ -376,7 +479,10 @@ class SecurityWebSystem:
                     detect_fps=5,
                     device="cpu",
                     conf_threshold=self.confidence,
-                    iou_threshold=0.45
+                    iou_threshold=0.45,
+                    output_format=getattr(self.config, 'V380_PIPE_FORMAT', 'rawvideo'),
+                    backend=getattr(Config, 'INFERENCE_BACKEND', 'torch'),
+                    model_cache_dir=getattr(Config, 'MODEL_CACHE_DIR', 'model_cache')
                 )
                 self.v380_processor.start()
                 
@@ -400,19 +506,27 @@ class SecurityWebSystem:
                 self.camera_available = False
                 self.capture_thread = None
         else:
-            # Use original OpenCV capture
-            camera_source = Config.CAMERA_SOURCE if self.config else 0
+            # Use original OpenCV capture, one capture thread per camera
+            if self.config:
+                cameras = Config.get_camera_definitions()
+            else:
+                cameras = [{'id': 'main', 'source': 0, 'name': 'Main', 'detect_fps': 5.0}]
             
-            # Start capture thread
-            self.capture_thread = CaptureThread(camera_source, buffer_size=3)
-            self.capture_thread.start()
+            # Start capture threads (or capture processes writing to shared memory)
+            # 4 slots: latest + being decoded + one held by detection + one spare reader
+            capture_factory = CaptureProcess if self.pipeline_mode == 'process' else CaptureThread
+            self.camera_manager = CameraManager(cameras, buffer_size=4, capture_factory=capture_factory)
+            logging.info(f"[Camera] Pipeline mode: {self.pipeline_mode}")
+            self.camera_manager.start()
+            self.capture_thread = self.camera_manager.primary
             
             # Wait for first frame
             time.sleep(1.0)
             
-            if self.capture_thread.get_frame() is not None:
+            connected = [cam['id'] for cam in self.camera_manager.get_status() if cam['available']]
+            if connected:
                 self.camera_available = True
-                logging.info("[Camera] Connected successfully (OpenCV)")
+                logging.info(f"[Camera] Connected successfully (OpenCV): {', '.join(connected)}")
             else:
                 logging.warning("[Camera] No frame detected, using demo mode")
                 self.camera_available = False
@@ -426,22 +540,57 @@ class SecurityWebSystem:
         logging.info("[Detection] Loading modules...")
         
         try:
-            self.person_detector = PersonDetector(self.config)
-            self.person_detector.set_confidence(self.confidence)
-            
             self.face_engine = FaceRecognitionEngine(self.config)
             self.motion_detector = MotionDetector(self.config)
             
-            self.detection_thread = DetectionThread(self.person_detector, self.motion_detector)
+            if self.pipeline_mode == 'process':
+                # Armed zones live in this process; the detection child's gate cannot see them
+                if getattr(self.config, 'DETECTION_GATE', 'motion') == 'zone':
+                    logging.warning("[Detection] DETECTION_GATE = 'zone' is not supported with "
+                                    "PIPELINE_MODE = 'process'; the gate opens on any motion")
+                # Models load in the detection process; person_detector forwards settings to it
+                self.detection_thread = DetectionProcess(primary_camera_id=self.primary_camera_id)
+                self.person_detector = self.detection_thread.person_detector
+                self.jpeg_encoder = JpegEncoderProcess(self.detection_thread.output_lock)
+                self.detection_thread.add_ring_listener(self.jpeg_encoder.add_ring)
+                self.jpeg_encoder.start()
+                self.detection_thread.recognize_faces = self.enable_face  # FaceScheduler runs in the child
+            else:
+                # One detection thread (one loaded model set) shared by all cameras
+                self.person_detector = PersonDetector(self.config)
+                self.detection_thread = DetectionThread(self.person_detector, self.motion_detector,
+                                                        primary_camera_id=self.primary_camera_id)
+                self.detection_thread.gate.zone_check = self._gate_zone_check
+                
+                # Face recognition per tracked person, every face_interval frames
+                performance = getattr(self.config, 'performance', None)
+                self.detection_thread.face_scheduler = FaceScheduler(
+                    self.face_engine, interval=getattr(performance, 'face_interval', 60))
+                self.detection_thread.face_scheduler.start()
+                self.detection_thread.recognize_faces = self.enable_face
+            self.person_detector.set_confidence(self.confidence)
             self.detection_thread.draw_skeleton = self.enable_skeleton
             self.detection_thread.start()
             
+            # Feed capture frames into detection within each camera's FPS budget
+            if self.camera_manager:
+                self.inference_scheduler = InferenceScheduler(self.camera_manager, self.detection_thread)
+                self.inference_scheduler.start()
+            
             logging.info("[Detection] Modules loaded")
             return True
         except Exception as e:
             logging.error(f"[Detection] Error: {e}")
             return True  # Continue without detection
     
+    def _gate_zone_check(self, camera_id: str, regions: list) -> Optional[bool]:
+        """Detection gate 'zone' mode: is any motion region inside an armed zone?"""
+        if not self.is_armed or not self.zone_manager or self.zone_manager.get_zone_count() == 0:
+            return None
+        if camera_id != self.primary_camera_id:
+            return None  # Zones are drawn on the primary camera only
+        return any(self.zone_manager.region_in_zones(*region) for region in regions)
+    
     def start_processing(self):
         """Start processing thread."""
         # Only start processing thread if not using V380 mode
@@ -860,7 +1009,20 @@ class SecurityWebSystem:
         self.is_muted = muted
         logging.info(f"[Audio] Muted: {muted}")
     
-    def take_snapshot(self) -> str:
+    @property
+    def camera_ids(self) -> list:
+        """Configured camera ids (V380 / demo mode: just the primary)."""
+        if self.camera_manager:
+            return self.camera_manager.camera_ids
+        return ['main']
+    
+    @property
+    def primary_camera_id(self) -> str:
+        if self.camera_manager and self.camera_manager.primary_id:
+            return self.camera_manager.primary_id
+        return 'main'
+    
+    def take_snapshot(self, camera_id: Optional[str] = None) -> str:
         """Take snapshot - works in both normal and V380 mode."""
         try:
             logging.info("[Snapshot] Starting snapshot capture...")
@@ -886,7 +1048,7 @@ class SecurityWebSystem:
                 # 1. Try processing thread (most likely to have processed frame)
                 logging.info("[Snapshot] Trying processing thread...")
                 if self.processing_thread:
-                    frame = self.processing_thread.get_processed_frame()
+                    frame = self.processing_thread.get_processed_frame(camera_id)
                     if frame is not None and frame.size > 0:
                         logging.info(f"[Snapshot] Got processed frame: {frame.shape}")
                     else:
@@ -898,7 +1060,7 @@ class SecurityWebSystem:
                 # 2. Try detection thread's processed frame (alternative source)
                 if frame is None and self.detection_thread:
                     logging.info("[Snapshot] Trying detection thread's processed frame...")
-                    results = self.detection_thread.get_results()
+                    results = self.detection_thread.get_results(camera_id)
                     if results and results.get('frame') is not None:
                         det_frame = results.get('frame')
                         if det_frame.size > 0:
@@ -908,9 +1070,10 @@ class SecurityWebSystem:
                         logging.warning("[Snapshot] No frame from detection thread")
                 
                 # 3. Try raw frame from capture thread (last resort before demo)
-                if frame is None and self.capture_thread:
+                capture = self.camera_manager.get(camera_id) if self.camera_manager else self.capture_thread
+                if frame is None and capture:
                     logging.info("[Snapshot] Trying raw frame from capture thread...")
-                    raw_frame = self.capture_thread.get_frame()
+                    raw_frame = capture.get_frame()
                     if raw_frame is not None and raw_frame.size > 0:
                         logging.info(f"[Snapshot] Got raw frame: {raw_frame.shape}")
                         # Add timestamp overlay to raw frame
@@ -968,9 +1131,16 @@ class SecurityWebSystem:
         if self.detection_thread:
             self.detection_thread.draw_skeleton = enabled
     
+    def toggle_face(self, enabled: bool):
+        self.enable_face = enabled
+        if self.detection_thread:
+            self.detection_thread.recognize_faces = enabled
+    
     def reload_faces(self):
         if self.face_engine:
             self.face_engine.reload_faces()
+        if self.pipeline_mode == 'process' and self.detection_thread:
+            self.detection_thread.reload_faces()  # The detection process has its own face engine
     
     def _start_telegram_polling(self):
         """Start simple Telegram polling for receiving messages."""
@@ -1177,8 +1347,14 @@ Welcome! I'm your security assistant.
         if self.v380_processor:
             self.v380_processor.stop()
         
-        # Stop capture thread if exists
-        if self.capture_thread:
+        # Stop inference scheduler if exists
+        if self.inference_scheduler:
+            self.inference_scheduler.stop()
+        
+        # Stop capture threads if exist
+        if self.camera_manager:
+            self.camera_manager.stop()
+        elif self.capture_thread:
             self.capture_thread.stop()
         
         # Stop processing thread if exists
@@ -1189,6 +1365,10 @@ Welcome! I'm your security assistant.
         if self.detection_thread:
             self.detection_thread.stop()
         
+        # Stop JPEG encoder process if exists
+        if self.jpeg_encoder:
+            self.jpeg_encoder.stop()
+        
         # Stop video writer if exists
         if self.video_writer:
             self.video_writer.release()
@@ -1200,6 +1380,9 @@ class SecurityWebServer:
     def __init__(self, use_v380_ffmpeg: bool = False):
         self.system = SecurityWebSystem(use_v380_ffmpeg=use_v380_ffmpeg)
         self.clients: Set = set()
+        self.client_cameras: Dict = {}  # websocket -> camera id it is watching
+        self.sent_seq: Dict[str, int] = {}  # camera id -> last frame seq sent
+        self.metrics_server = None
         self.running = False
         self.broadcast_queue = queue.Queue(maxsize=10)
         self.broadcast_status_lock = asyncio.Lock()
@@ -1222,6 +1405,7 @@ class SecurityWebServer:
             logging.error(f"[WebSocket] Error: {e}")
         finally:
             self.clients.discard(websocket)
+            self.client_cameras.pop(websocket, None)
             logging.info(f"[WebSocket] Client disconnected: {client_addr}")
     
     async def get_status(self) -> dict:
@@ -1246,7 +1430,10 @@ class SecurityWebServer:
             'faces': len(self.system.face_engine.known_names) if self.system.face_engine else 0,
             'clients': len(self.clients),
             'demo_mode': self.system.demo_mode,
-            'camera_available': self.system.camera_available
+            'camera_available': self.system.camera_available,
+            'cameras': self.system.camera_manager.get_status() if self.system.camera_manager else [],
+            'pipeline_mode': self.system.pipeline_mode,
+            'pipeline': self.system.inference_scheduler.get_stats() if self.system.inference_scheduler else None
         }
     
     async def broadcast_status(self):
@@ -1288,11 +1475,13 @@ class SecurityWebServer:
         elif cmd_type == 'snapshot':
             logging.info("[WebSocket] Snapshot request received")
             try:
-                snapshot = self.system.take_snapshot()
+                camera_id = data.get('camera_id', self.client_cameras.get(websocket, self.system.primary_camera_id))
+                snapshot = self.system.take_snapshot(camera_id)
                 if snapshot and len(snapshot) > 0:
                     logging.info(f"[WebSocket] Snapshot generated successfully, size: {len(snapshot)} bytes")
                     await websocket.send(json.dumps({
                         'type': 'snapshot',
+                        'camera_id': camera_id,
                         'data': snapshot
                     }))
                     logging.info("[WebSocket] Snapshot sent to client")
@@ -1324,7 +1513,7 @@ class SecurityWebServer:
             await self.broadcast_status()
         
         elif cmd_type == 'toggle_face':
-            self.system.enable_face = data.get('value', True)
+            self.system.toggle_face(data.get('value', True))
             await self.broadcast_status()
         
         elif cmd_type == 'toggle_motion':
@@ -1355,6 +1544,24 @@ class SecurityWebServer:
             self.system.reload_faces()
             await self.broadcast_status()
         
+        elif cmd_type == 'get_metrics':
+            await websocket.send(json.dumps({
+                'type': 'metrics',
+                'latency': latency_tracker.snapshot(),
+                'pipeline': self.system.inference_scheduler.get_stats() if self.system.inference_scheduler else None
+            }))
+        
+        elif cmd_type == 'select_camera':
+            camera_id = data.get('camera_id')
+            if camera_id in self.system.camera_ids:
+                self.client_cameras[websocket] = camera_id
+                logging.info(f"[WebSocket] Client {websocket.remote_address} watching camera {camera_id}")
+            else:
+                await websocket.send(json.dumps({
+                    'type': 'error',
+                    'message': f'Unknown camera: {camera_id}'
+                }))
+        
         elif cmd_type == 'get_zones':
             zones_data = []
             if self.system.zone_manager:
@@ -1370,6 +1577,159 @@ class SecurityWebServer:
                 'zones': zones_data
             }))
     
+    def _subscribed_cameras(self) -> Dict[str, list]:
+        """Map camera id -> clients watching it (default: primary camera)."""
+        primary = self.system.primary_camera_id
+        subscriptions: Dict[str, list] = {}
+        for client in self.clients:
+            camera_id = self.client_cameras.get(client, primary)
+            subscriptions.setdefault(camera_id, []).append(client)
+        # Recording always follows the primary camera
+        if self.system.is_recording:
+            subscriptions.setdefault(primary, [])
+        return subscriptions
+    
+    def _get_broadcast_frame(self, camera_id: str) -> Tuple[Optional[np.ndarray], int, float]:
+        """Latest frame to broadcast for one camera, with capture sequence and timestamp."""
+        # Get processed frame from processing thread or V380 processor
+        if self.system.use_v380_ffmpeg:
+            # Get frame directly from V380 processor
+            v380_frame = self.system._get_v380_frame()
+            if v380_frame is not None and v380_frame.size > 0:
+                logging.debug(f"[Broadcast] Got V380 frame: {v380_frame.shape}")
+                return v380_frame, -1, 0.0
+            logging.warning("[Broadcast] No V380 frame available, retrying...")
+            return None, -1, 0.0
+        
+        # Get frame from processing thread
+        if self.system.processing_thread is None:
+            return None, -1, 0.0
+        
+        # Get latest frame from processing thread (with its capture sequence)
+        frame, frame_seq, capture_ts = self.system.processing_thread.get_processed_frame_info(camera_id)
+        
+        # Log if we got a frame
+        if frame is not None and frame.size > 0:
+            # Log every 30 frames to avoid spam
+            if hasattr(self, '_broadcast_frame_count'):
+                self._broadcast_frame_count += 1
+            else:
+                self._broadcast_frame_count = 1
+            
+            if self._broadcast_frame_count % 30 == 0:
+                persons = self.system.person_count if hasattr(self.system, 'person_count') else 0
+                logging.info(f"[Broadcast] Frame #{self._broadcast_frame_count} ({camera_id}): {frame.shape}, persons={persons}")
+            return frame, frame_seq, capture_ts
+        
+        logging.warning(f"[Broadcast] No frame from processing thread for {camera_id}, retrying...")
+        return None, -1, 0.0
+    
+    async def _send_frame_message(self, camera_id: str, clients: list, jpeg: bytes, frame_seq: int, capture_ts: float):
+        """Send one JPEG frame to a camera's clients."""
+        message = json.dumps({
+            'type': 'frame',
+            'camera_id': camera_id,
+            'timestamp': time.time(),
+            'frame_seq': frame_seq,
+            'capture_timestamp': capture_ts,
+            'data': base64.b64encode(jpeg).decode('utf-8')
+        })
+        
+        # Non-blocking broadcast
+        try:
+            await asyncio.gather(
+                *[client.send(message) for client in clients],
+                return_exceptions=True
+            )
+            logging.debug(f"[Broadcast] Sent {camera_id} frame to {len(clients)} clients")
+        except Exception as e:
+            logging.warning(f"[Broadcast] Send error: {e}")
+    
+    async def _broadcast_encoded_frame(self, camera_id: str, clients: list) -> bool:
+        """Send the newest JPEG produced by the encoder process (process mode)."""
+        # Recording still needs the decoded frame of the primary camera
+        if (camera_id == self.system.primary_camera_id and self.system.is_recording
+                and self.system.video_writer is not None and self.system.processing_thread):
+            frame = self.system.processing_thread.get_processed_frame(camera_id)
+            if frame is not None:
+                try:
+                    self.system.video_writer.write(frame)
+                except Exception as e:
+                    logging.error(f"[Record] Error writing frame: {e}")
+        
+        encoded = self.system.jpeg_encoder.get_jpeg(camera_id, after_seq=self.sent_seq.get(camera_id, -1))
+        if encoded is None:
+            return False
+        jpeg, frame_seq, capture_ts, encoded_at = encoded
+        self.sent_seq[camera_id] = frame_seq
+        latency_tracker.mark(camera_id, frame_seq, 'encode', encoded_at, decode=capture_ts)
+        
+        if clients:
+            await self._send_frame_message(camera_id, clients, jpeg, frame_seq, capture_ts)
+            latency_tracker.mark(camera_id, frame_seq, 'send')
+        return True
+    
+    async def _broadcast_camera_frame(self, camera_id: str, clients: list) -> bool:
+        """Encode and send one camera's latest frame to its clients."""
+        if self.system.jpeg_encoder is not None:
+            return await self._broadcast_encoded_frame(camera_id, clients)
+        
+        frame, frame_seq, capture_ts = self._get_broadcast_frame(camera_id)
+        
+        if frame is None or frame.size == 0:
+            return False
+        
+        # Validate frame before encoding
+        if frame.shape[0] == 0 or frame.shape[1] == 0:
+            logging.warning(f"[Broadcast] Invalid frame shape: {frame.shape}, skipping")
+            return False
+        
+        # Ensure BGR format
+        if len(frame.shape) == 2 or frame.shape[2] == 1:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+        
+        # Write frame to video if recording
+        if (camera_id == self.system.primary_camera_id and self.system.is_recording
+                and self.system.video_writer is not None):
+            try:
+                self.system.video_writer.write(frame)
+            except Exception as e:
+                logging.error(f"[Record] Error writing frame: {e}")
+        
+        if not clients:
+            logging.debug("[Broadcast] No connected clients, skipping send")
+            return True
+        
+        # Optimized encoding with error handling
+        try:
+            encode_params = [
+                cv2.IMWRITE_JPEG_QUALITY, 65,
+                cv2.IMWRITE_JPEG_OPTIMIZE, 0,
+                cv2.IMWRITE_JPEG_PROGRESSIVE, 0
+            ]
+            
+            success, buffer = cv2.imencode('.jpg', frame, encode_params)
+            if not success:
+                logging.warning("[Broadcast] Encoding failed, skipping frame")
+                return False
+            
+            # Frames are re-sent until a newer one arrives; only trace the first send
+            new_frame = frame_seq != self.sent_seq.get(camera_id)
+            self.sent_seq[camera_id] = frame_seq
+            if new_frame:
+                latency_tracker.mark(camera_id, frame_seq, 'encode')
+            
+            await self._send_frame_message(camera_id, clients, buffer, frame_seq, capture_ts)
+            if new_frame:
+                latency_tracker.mark(camera_id, frame_seq, 'send')
+            return True
+        
+        except Exception as e:
+            logging.error(f"[Broadcast] Encoding error: {e}")
+            import traceback
+            traceback.print_exc()
+            return False
+    
     async def broadcast_task(self):
         """Non-blocking broadcast task - Fix frame stacking with validation."""
         frame_count = 0
@@ -1384,110 +1744,32 @@ class SecurityWebServer:
             try:
                 start_time = time.time()
                 
-                # Get processed frame from processing thread or V380 processor
-                if self.system.use_v380_ffmpeg:
-                    # Get frame directly from V380 processor
-                    v380_frame = self.system._get_v380_frame()
-                    if v380_frame is not None and v380_frame.size > 0:
-                        frame = v380_frame
-                        logging.debug(f"[Broadcast] Got V380 frame: {frame.shape}")
-                    else:
-                        logging.warning("[Broadcast] No V380 frame available, retrying...")
-                        await asyncio.sleep(0.1)
-                        continue
-                else:
-                    # Get frame from processing thread
-                    if self.system.processing_thread is None:
-                        await asyncio.sleep(frame_interval)
-                        continue
-                    
-                    # Get latest frame from processing thread
-                    frame = self.system.processing_thread.get_processed_frame()
-                    
-                    # Log if we got a frame
-                    if frame is not None and frame.size > 0:
-                        # Log every 30 frames to avoid spam
-                        if hasattr(self, '_broadcast_frame_count'):
-                            self._broadcast_frame_count += 1
-                        else:
-                            self._broadcast_frame_count = 1
-                        
-                        if self._broadcast_frame_count % 30 == 0:
-                            persons = self.system.person_count if hasattr(self.system, 'person_count') else 0
-                            logging.info(f"[Broadcast] Frame #{self._broadcast_frame_count}: {frame.shape}, persons={persons}")
-                    else:
-                        logging.warning("[Broadcast] No frame from processing thread, retrying...")
-                        await asyncio.sleep(0.05)
-                        continue
+                # Encode each camera once per tick, only for cameras someone is watching
+                subscriptions = self._subscribed_cameras()
+                if self.system.jpeg_encoder is not None:
+                    self.system.jpeg_encoder.set_cameras(subscriptions.keys())
+                if not subscriptions:
+                    await asyncio.sleep(frame_interval)
+                    continue
                 
-                if frame is not None and frame.size > 0:
-                    # Validate frame before encoding
-                    if frame.shape[0] == 0 or frame.shape[1] == 0:
-                        logging.warning(f"[Broadcast] Invalid frame shape: {frame.shape}, skipping")
-                        await asyncio.sleep(frame_interval)
-                        continue
-                    
-                    # Ensure BGR format
-                    if len(frame.shape) == 2 or frame.shape[2] == 1:
-                        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-                    
-                    # Write frame to video if recording
-                    if self.system.is_recording and self.system.video_writer is not None:
-                        try:
-                            self.system.video_writer.write(frame)
-                        except Exception as e:
-                            logging.error(f"[Record] Error writing frame: {e}")
-                    
-                    # Optimized encoding with error handling
-                    try:
-                        encode_params = [
-                            cv2.IMWRITE_JPEG_QUALITY, 65,
-                            cv2.IMWRITE_JPEG_OPTIMIZE, 0,
-                            cv2.IMWRITE_JPEG_PROGRESSIVE, 0
-                        ]
-                        
-                        success, buffer = cv2.imencode('.jpg', frame, encode_params)
-                        if not success:
-                            logging.warning("[Broadcast] Encoding failed, skipping frame")
-                            await asyncio.sleep(frame_interval)
-                            continue
-                        
-                        frame_b64 = base64.b64encode(buffer).decode('utf-8')
-                        
-                        message = json.dumps({
-                            'type': 'frame',
-                            'timestamp': time.time(),
-                            'data': frame_b64
-                        })
-                        
-                        # Non-blocking broadcast
-                        if self.clients:
-                            try:
-                                await asyncio.gather(
-                                    *[client.send(message) for client in self.clients],
-                                    return_exceptions=True
-                                )
-                                logging.debug(f"[Broadcast] Sent frame to {len(self.clients)} clients")
-                            except Exception as e:
-                                logging.warning(f"[Broadcast] Send error: {e}")
-                        else:
-                            logging.debug("[Broadcast] No connected clients, skipping send")
-                        
-                        frame_count += 1
-                        last_frame_time = time.time()
-                    
-                    except Exception as e:
-                        logging.error(f"[Broadcast] Encoding error: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        await asyncio.sleep(frame_interval)
-                        continue
+                sent = 0
+                for camera_id, clients in subscriptions.items():
+                    if await self._broadcast_camera_frame(camera_id, clients):
+                        sent += 1
+                
+                if sent == 0:
+                    await asyncio.sleep(0.05)
+                    continue
+                
+                frame_count += 1
+                last_frame_time = time.time()
                 
                 # Log FPS every 2 seconds
                 if time.time() - last_log_time >= 2.0:
                     actual_fps = frame_count / (time.time() - last_log_time)
                     time_since_last_frame = time.time() - last_frame_time
-                    logging.info(f"[Broadcast] FPS: {actual_fps:.1f}, Clients: {len(self.clients)}, Last frame: {time_since_last_frame:.1f}s ago")
+                    logging.info(f"[Broadcast] FPS: {actual_fps:.1f}, Clients: {len(self.clients)}, "
+                                 f"Cameras: {len(subscriptions)}, Last frame: {time_since_last_frame:.1f}s ago")
                     frame_count = 0
                     last_log_time = time.time()
                 
@@ -1518,6 +1800,9 @@ class SecurityWebServer:
             
             self.system.running = True
             
+            # Start Prometheus metrics endpoint
+            self.metrics_server = start_metrics_server(Config.METRICS_PORT if self.system.config else 0)
+            
             # Start broadcast task
             asyncio.create_task(self.broadcast_task())
             
@@ -1556,6 +1841,8 @@ class SecurityWebServer:
     
     def stop(self):
         """Stop server."""
+        if self.metrics_server:
+            self.metrics_server.shutdown()
         self.system.stop()
 
 